@@ -5,14 +5,26 @@ from dataclasses import dataclass
 class Config:
     blackjack_min_bet: int
     slots_min_line_bet: int
+    slots_jackpot_path: str  # empty to play without the progressive jackpot
     poker_min_raise: int
     blackjack_shoe_size: int
+    blackjack_watch_bots: bool
+    poker_bot_think_ms: int
+    poker_bot_buckets: bool
+    poker_history_path: str  # empty to keep no hand history
+    roulette_history_path: str  # empty to keep no spin log
 
     @classmethod
     def default(cls) -> "Config":
         return cls(
             blackjack_min_bet=10,
             slots_min_line_bet=2,
+            slots_jackpot_path="slots_jackpot.db",
             poker_min_raise=10,
             blackjack_shoe_size=6,
+            blackjack_watch_bots=False,
+            poker_bot_think_ms=50,
+            poker_bot_buckets=True,
+            poker_history_path="poker_hands.bin",
+            roulette_history_path="roulette_spins.bin",
         )
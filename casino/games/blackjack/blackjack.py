@@ -11,15 +11,19 @@ from casino.accounts import Account
 from casino.utils import clear_screen, cprint, cinput, display_topbar, print_cards
 from .constants import *
 from .hand import Hand
+from . import dealer, rules, strategy
+from .rules import BlackjackRules, Outcome
 
 
 class Player:
     """
     Defines a player in a blackjack game.
     """
+    is_bot = False
 
     def __init__(self, account: Account) -> None:
         self.hands: list[Hand] = [] #player has multiple hands
+        self.num_spots = 1 #betting spots played each round
 
         # Define Player object's attributes in terms of the Account object's attributes
         self.account = account
@@ -38,6 +42,40 @@ class Player:
             self.account.deposit(difference)
 
 
+class BotPlayer(Player):
+    """
+    A seat played by the computer using the precomputed basic strategy tables.
+
+    Counting bots also size their bets from the Hi-Lo true count.
+    """
+    is_bot = True
+
+    def __init__(self, account: Account, counts_cards: bool = False) -> None:
+        super().__init__(account)
+        self.counts_cards = counts_cards
+
+    def choose_bet(self, min_bet: int, true_count: float) -> int:
+        bet = strategy.ramp_bet(min_bet, true_count) if self.counts_cards else min_bet
+        return min(bet, self.balance)
+
+    def choose_action(self, hand: Hand, dealer_up: Card, can_double: bool, can_split: bool) -> str:
+        pair_value = rules.card_value(hand.cards[0].rank) if can_split else 0
+        action = strategy.decide(
+            hand.total,
+            hand.is_soft,
+            pair_value,
+            rules.card_value(dealer_up.rank),
+            can_double,
+            can_split,
+        )
+        return {
+            strategy.HIT: "H",
+            strategy.STAND: "S",
+            strategy.DOUBLE: "D",
+            strategy.SPLIT: "P",
+        }[action]
+
+
 class Blackjack(ABC):
     """
     Abstract base class that sets up Blackjack.
@@ -46,14 +84,21 @@ class Blackjack(ABC):
     All inherited classes must only play one round of that variant of Blackjack
     """
     
-    def __init__(self, ctx: GameContext) -> None:
+    def __init__(self, ctx: GameContext, table_rules: BlackjackRules = BlackjackRules.us()) -> None:
         self.context = ctx
         self.configurations = ctx.config
+        self.rules = table_rules
         #added a shoe_size constant in config (6 pairs is used)
         shoe_size = self.configurations.blackjack_shoe_size
         self.deck: StandardDeck = StandardDeck(shoe_size)
+        self.counter = strategy.RunningCount()
+        # Bot turns are only paced and redrawn when someone wants to watch them
+        self.watch_bots = self.configurations.blackjack_watch_bots
         #initialize multiple players
         self.players: list[Player] = self._init_players()
+        # Every hand at the table in dealing order, as (owner, hand) slots.
+        # Dealing, decisions and settlement each make one pass over this list.
+        self.slots: list[tuple[Player, Hand]] = []
         self.dealer_hand: Hand = Hand()
         self.MINIMUM_BET = self.configurations.blackjack_min_bet
 
@@ -73,14 +118,57 @@ class Blackjack(ABC):
         players.append(Player(self.context.account))
         if num_players > 1:
             for i in range(2, num_players + 1):
-                name = cinput(f"Enter name for Player {i}: ").strip()
-                if not name:
-                    name = f"Guest {i}"
+                seat_type = self._prompt_seat_type(i)
                 start_bal = self.context.account.balance
-                guest_account = Account.generate(name=name, balance=start_bal)
-                players.append(Player(guest_account))
+                if seat_type == "H":
+                    name = cinput(f"Enter name for Player {i}: ").strip()
+                    if not name:
+                        name = f"Guest {i}"
+                    guest_account = Account.generate(name=name, balance=start_bal)
+                    players.append(Player(guest_account))
+                else:
+                    bot_account = Account.generate(name=f"Bot {i}", balance=start_bal)
+                    players.append(BotPlayer(bot_account, counts_cards=(seat_type == "C")))
         return players
 
+    def _prompt_seat_type(self, seat: int) -> str:
+        """Ask who sits in an extra seat. Returns "H", "B" or "C"."""
+        while True:
+            cprint(f"Who is sitting in seat {seat}?")
+            seat_type = cinput(SEAT_TYPE_PROMPT).strip().upper()
+            if seat_type in {"H", "B", "C"}:
+                return seat_type
+            cprint(INVALID_CHOICE_MSG)
+
+    def is_watched(self, player: Player) -> bool:
+        """Whether a player's turn should be drawn and paced for a human."""
+        return not player.is_bot or self.watch_bots
+
+    def check_shoe(self) -> None:
+        """Reshuffle the shoe once the cut card has been reached."""
+        shoe_size = self.configurations.blackjack_shoe_size
+        if len(self.deck.cards) >= shoe_size * 52 * CUT_CARD_FRACTION:
+            return
+        self.deck.generate_deck(shoe_size)
+        self.counter.reset()
+        cprint(SHUFFLE_MSG)
+
+    def count_table(self) -> None:
+        """Add every card on the table to the running count."""
+        for card in self.dealer_hand.cards:
+            self.counter.observe(card.rank)
+        for _, hand in self.slots:
+            for card in hand.cards:
+                self.counter.observe(card.rank)
+
+    def build_slots(self) -> None:
+        """Lay every player's spots out as one flat list of hand slots."""
+        self.slots = [(player, hand) for player in self.players for hand in player.hands]
+
+    def spot_hand_count(self, player: Player, spot: int) -> int:
+        """Number of hands a spot has grown to through splitting."""
+        return sum(1 for hand in player.hands if hand.spot == spot)
+
     #top bar do not print bet size
     #player could have two hands with different bet size
     def display_blackjack_topbar(self) -> None:
@@ -101,21 +189,29 @@ class Blackjack(ABC):
         print("\n" * margin, end="")
 
     #a method to render table
-    def render_table(self, current_player:Player = None, active_hand_idx: int = 0)->None:
+    def render_table(self, active_hand: Optional[Hand] = None)->None:
         clear_screen()
         self.display_blackjack_topbar()
         self.dealer_hand.print_hand(label = "Dealer's Hand")
         cprint("="*40)
         # Print all players' hands
         for player in self.players:
+            # Multi-spot players get one line per hand so the table fits on screen
+            if player.num_spots > 1:
+                for hand in player.hands:
+                    split_tag = " (split)" if hand.is_split_hand else ""
+                    hand_label = f"{player.name} - Spot {hand.spot + 1}{split_tag}"
+                    hand.print_compact(label=hand_label, is_active=hand is active_hand)
+                print()
+                continue
+
             num_hands = len(player.hands)
             for idx, hand in enumerate(player.hands):
-                is_active = (player == current_player and idx == active_hand_idx)
                 if num_hands > 1:
                     hand_label = f"{player.name} - Hand {idx + 1}"
                 else:
                     hand_label = f"{player.name}"
-                hand.print_hand(label=hand_label, is_active=is_active)
+                hand.print_hand(label=hand_label, is_active=hand is active_hand)
                 print()
 
     def play_again(self) -> str:
@@ -127,6 +223,8 @@ class Blackjack(ABC):
 
         # Done: Refactor so that this function works for multiple players
         for player in self.players:
+            if player.is_bot:
+                continue
 
             # Kick from casino if player has 0 chips
             if player.balance == 0:
@@ -187,6 +285,7 @@ class Blackjack(ABC):
             self.context = context
             self.configurations = context.config
         self.dealer_hand = None
+        self.slots = []
         for player in self.players:
             player.hands = []
 
@@ -208,8 +307,18 @@ class StandardBlackjack(Blackjack):
         Asks all users to submit a bet.
         """
         error_msg = ""
+        self.check_shoe()
+        true_count = self.counter.true_count(len(self.deck.cards))
 
         for player in self.players:
+            if player.is_bot:
+                if player.balance >= self.MINIMUM_BET:
+                    bet = player.choose_bet(self.MINIMUM_BET, true_count)
+                    player.balance -= bet
+                    player.hands = [Hand(bet=bet)]
+                    player.update_account()
+                continue
+
             if player.balance < self.MINIMUM_BET:
                 clear_screen()
                 self.display_blackjack_topbar()
@@ -217,6 +326,11 @@ class StandardBlackjack(Blackjack):
                 cinput("Press [Enter] to continue.")
                 continue
 
+            clear_screen()
+            self.display_blackjack_topbar()
+            spots = self._prompt_spots(player)
+            player.num_spots = spots
+
             # Determine player's bet
             while True:
                 clear_screen()
@@ -226,7 +340,8 @@ class StandardBlackjack(Blackjack):
                     cprint(error_msg)
 
                 # Ask user how much to bet
-                prompt = f"🤵 : {player.name}, how much would you like to bet? "
+                per_spot = " per spot" if spots > 1 else ""
+                prompt = f"🤵 : {player.name}, how much would you like to bet{per_spot}? "
                 bet_str = cinput(prompt).strip()
 
                 # Check that input is a number
@@ -242,11 +357,11 @@ class StandardBlackjack(Blackjack):
                 # Check that user has enough money in account to bet
                 try:
                     player.bet = bet
-                    if player.bet > player.balance:
+                    if player.bet * spots > player.balance:
                         raise ValueError("Player betting more than their balance")
 
-                    player.balance -= bet
-                    player.hands = [Hand(bet=bet)] #initialize player hand
+                    player.balance -= bet * spots
+                    player.hands = [Hand(bet=bet, spot=spot) for spot in range(spots)]
                     player.update_account()
                     error_msg = ""#clear error message
 
@@ -255,41 +370,57 @@ class StandardBlackjack(Blackjack):
                     continue
                 break
 
+        self.build_slots()
+
+    def _prompt_spots(self, player: Player) -> int:
+        """
+        Ask how many spots a player wants to play this round.
+
+        Pressing Enter keeps the player's spots from the last round.
+        """
+        max_spots = min(MAX_SPOTS, player.balance // self.MINIMUM_BET)
+        if max_spots <= 1:
+            return 1
+        while True:
+            spots_str = cinput(SPOTS_PROMPT.format(max_spots=max_spots)).strip()
+            if spots_str == "":
+                return min(player.num_spots, max_spots)
+            if spots_str.isdigit() and 1 <= int(spots_str) <= max_spots:
+                return int(spots_str)
+            cprint(INVALID_CHOICE_MSG)
+
     #step 2 of 8
     def deal_cards(self):
         """
         Deals cards out to all players and dealer.
+
+        Like at a real table, every spot gets one card and then the dealer,
+        twice around. The dealer's second card is dealt face down. When the
+        dealer does not peek there is no hole card; the dealer's second card
+        comes in `dealer_draw`.
         """
-        for player in self.players:
-            for hand in player.hands:
-                self.deal_card(hand)
-                self.deal_card(hand)
         self.dealer_hand = Hand()
-        self.deal_card(self.dealer_hand)
-        self.deal_card(self.dealer_hand, hidden=True)
+        for hidden in (False, True):
+            for _, hand in self.slots:
+                self.deal_card(hand)
+            if not hidden or self.rules.dealer_peeks:
+                self.deal_card(self.dealer_hand, hidden=hidden)
 
     #step 3 of 8
     def blackjack_check(self) -> bool:
-        dealer_bj = self.dealer_hand.is_blackjack
-        all_players_done = True
-        for player in self.players:
-            for hand in player.hands:
-                if hand.is_blackjack:
-                    if dealer_bj:
-                        self.update_hand_results(hand, "blackjack_tie")
-                    else:
-                        self.update_hand_results(hand, "player_blackjack")
-                else:
-                    if dealer_bj:
-                        self.update_hand_results(hand, "dealer_blackjack")
-                    else:
-                        all_players_done = False
-        if dealer_bj:
+        """
+        Whether the round is over before any player acts.
+
+        A dealer who peeks ends the round on a blackjack. Otherwise the round
+        is only over when every hand is a blackjack. Hands are settled later
+        in `check_win` either way.
+        """
+        if self.rules.dealer_peeks and self.dealer_hand.is_blackjack:
             self.dealer_hand.reveal_all()
             cprint("Dealer has a BLACKJACK! Checking hands...")
             sleep(1.0)
             return True  # Player can not continue if dealer BJ
-        return all_players_done
+        return all(hand.is_blackjack for _, hand in self.slots)
 
     #step 4 of 8
     def player_decision(self) -> None | str:
@@ -297,106 +428,117 @@ class StandardBlackjack(Blackjack):
         Phase where players make decisions. 
         Handles Hit, Stand, Double Down, and Double for Less.
         """
-        for i, player in enumerate(self.players):
-            stubborn = 0
-            hand_idx = 0
-            # DO NOT USE FOR LOOP DUE TO POSSIBLE SPLITTING
-            while hand_idx < len(player.hands):
-                hand = player.hands[hand_idx]
-                if hand.is_blackjack:
-                    hand_idx += 1
-                    continue
-
-                # local method for deciding card value so "Q""J" pair can be split
-                def card_val(card):
-                    if card.rank in {"J", "Q", "K"}: return 10
-                    if card.rank == "A": return 11
-                    return int(card.rank)
-
-                while not hand.is_bust and hand.total < 21:
-                    self.render_table(current_player=player, active_hand_idx=hand_idx)
-                    #build an option string
-                    allowed_actions = {"S", "STAND", "H", "HIT"}
-                    options_str = "[S]tand   [H]it"
-                    can_double = len(hand.cards) == 2 and player.balance >= hand.bet
-                    if can_double:
-                        allowed_actions.update({"D", "DOUBLE"})
-                        options_str += "   [D]ouble"
-                    can_split = (len(hand.cards) == 2 and
-                                 card_val(hand.cards[0]) == card_val(hand.cards[1]) and
-                                 player.balance >= hand.bet)
-                    if can_split:
-                        allowed_actions.update({"P", "SPLIT"})
-                        options_str += "   s[P]lit"
+        dealer_up = self.dealer_hand.cards[0]
+        current_player = None
+        slot_idx = 0
+        # DO NOT USE FOR LOOP DUE TO POSSIBLE SPLITTING
+        while slot_idx < len(self.slots):
+            player, hand = self.slots[slot_idx]
+            if player is not current_player:
+                current_player = player
+                stubborn = 0
+                watched = self.is_watched(player)
+            if hand.is_blackjack:
+                slot_idx += 1
+                continue
 
+            while not hand.is_bust and hand.total < 21:
+                if watched:
+                    self.render_table(active_hand=hand)
+                #build an option string
+                allowed_actions = {"S", "STAND", "H", "HIT"}
+                options_str = "[S]tand   [H]it"
+                values = hand.values
+                can_double = (rules.can_double(values, self.rules, hand.is_split_hand) and
+                              player.balance >= hand.bet)
+                if can_double:
+                    allowed_actions.update({"D", "DOUBLE"})
+                    options_str += "   [D]ouble"
+                num_spot_hands = self.spot_hand_count(player, hand.spot)
+                can_split = (rules.can_split(values, num_spot_hands, self.rules) and
+                             player.balance >= hand.bet)
+                if can_split:
+                    allowed_actions.update({"P", "SPLIT"})
+                    options_str += "   s[P]lit"
+
+                if player.is_bot:
+                    action = player.choose_action(hand, dealer_up, can_double, can_split)
+                else:
                     action = cinput(options_str).strip().upper()
-                    if action not in allowed_actions:
-                        stubborn += 1
-                        if stubborn >= 13:
-                            return "kicked"
-                        cprint(INVALID_CHOICE_MSG)
-                        continue
+                if action not in allowed_actions:
+                    stubborn += 1
+                    if stubborn >= 13:
+                        return "kicked"
+                    cprint(INVALID_CHOICE_MSG)
+                    continue
 
-                    # Player action stage
-                    if action in {"S", "STAND"}:
+                # Player action stage
+                if action in {"S", "STAND"}:
+                    break
+                elif action in {"H", "HIT"}:
+                    self.deal_card(hand)
+                    if not watched:
+                        continue
+                    cprint("Player drawing...")
+                    sleep(0.8)
+                    if hand.total == 21:
+                        self.render_table(active_hand=hand)
+                        cprint("Player hand reached 21!")
+                        sleep(1.0)
                         break
-                    elif action in {"H", "HIT"}:
-                        self.deal_card(hand)
-                        cprint("Player drawing...")
-                        sleep(0.8)
-                        if hand.total == 21:
-                            self.render_table(current_player=player, active_hand_idx=hand_idx)
-                            cprint("Player hand reached 21!")
-                            sleep(1.0)
-                            break
-                    elif action in {"D", "DOUBLE"}:
-                        player.balance -= hand.bet
-                        hand.bet *= 2
-                        self.deal_card(hand) 
-                        player.update_account()
+                elif action in {"D", "DOUBLE"}:
+                    player.balance -= hand.bet
+                    hand.bet *= 2
+                    self.deal_card(hand) 
+                    player.update_account()
+                    if watched:
                         cprint(f"💰 Doubling down! New bet: {hand.bet}")
                         cprint("Dealing your final card...")
                         sleep(1.0)
-                        break
-                    elif action in {"P", "SPLIT"}:
-                        player.balance -= hand.bet
-                        hand.is_split_hand = True
-                        new_hand = Hand(bet=hand.bet, is_split_hand=True)
-                        new_hand.cards.append(hand.cards.pop())
+                    break
+                elif action in {"P", "SPLIT"}:
+                    player.balance -= hand.bet
+                    hand.is_split_hand = True
+                    new_hand = Hand(bet=hand.bet, is_split_hand=True, spot=hand.spot)
+                    new_hand.cards.append(hand.cards.pop())
+                    if watched:
                         cprint("✂️ Splitting the pair...")
                         sleep(0.8)
-                        self.deal_card(hand)
-                        self.deal_card(new_hand)
-                        player.hands.insert(hand_idx + 1, new_hand)
-                        player.update_account()
+                    self.deal_card(hand)
+                    self.deal_card(new_hand)
+                    player.hands.insert(player.hands.index(hand) + 1, new_hand)
+                    self.slots.insert(slot_idx + 1, (player, new_hand))
+                    player.update_account()
+                    if watched:
                         cprint("Dealing new cards to split hands...")
                         sleep(0.8)
-                    # end of not_busted loop
-                hand_idx += 1
+                # end of not_busted loop
+            slot_idx += 1
 
     #step 5 of 8
     def dealer_draw(self) -> None:
         """
         Phase of blackjack where dealer draws cards.
 
-        Note that this function uses "soft 17" as a rule due to the
-        implementation of calc_hand_total().
-        
+        Whether the dealer hits a soft 17 comes from the table rules.
+
         "Soft 17" refers to a situation where the dealer has an
         Ace and a 6.
         In that situation, Ace = 11, which means Ace + 6 = 17. 
-        Since the dealer must stand on 17, they will stand in this
-        specific situation.
+        Under the standard rules the dealer must stand on 17, so they
+        will stand in this specific situation.
         """
         self.dealer_hand.reveal_all()
+        # Without a hole card the dealer takes the second card now
+        if len(self.dealer_hand.cards) < 2:
+            self.deal_card(self.dealer_hand)
         #dealer draw cards when at least one player hand not bust or not black jack
         dealer_draw_or_not = any(
-            not h.is_bust and not h.is_blackjack
-            for p in self.players
-            for h in p.hands
+            not hand.is_bust and not hand.is_blackjack
+            for _, hand in self.slots
         )
         if dealer_draw_or_not:
-            while self.dealer_hand.total < 17:
+            while dealer.should_hit(self.dealer_hand.values, self.rules):
                 self.render_table()
                 cprint("Dealer drawing...")
                 sleep(0.8)
@@ -408,48 +550,37 @@ class StandardBlackjack(Blackjack):
         """
         Phase of blackjack where game checks who won and pays out to users.
         """
-        dealer_total = self.dealer_hand.total
-        dealer_bj = self.dealer_hand.is_blackjack
-        dealer_bust = self.dealer_hand.is_bust
+        hands = [hand for _, hand in self.slots]
+        results = rules.resolve_round(
+            [hand.values for hand in hands],
+            [hand.bet for hand in hands],
+            self.dealer_hand.values,
+            self.rules,
+            [hand.is_split_hand for hand in hands],
+        )
 
         primary_player = self.players[0]
-        for player in self.players:
-            for hand in player.hands:
-                if hand.is_blackjack and dealer_bj:
-                    result = "blackjack_tie"
-                elif dealer_bj:
-                    result = "dealer_blackjack"
-                elif hand.is_blackjack:
-                    result = "player_blackjack"
-                elif hand.is_bust:
-                    result = "player_bust"
-                elif dealer_bust:
-                    result = "dealer_bust"
-                elif dealer_total == hand.total:
-                    result = "tie"
-                elif hand.total < dealer_total:
-                    result = "dealer_wins"
-                else:  # dealer_total < hand_total:
-                    result = "player_wins"
-                self.update_hand_results(hand, result)
-                if player == primary_player:
-                    self.stats.rounds_played += 1
-                    if result in {"player_blackjack", "player_wins", "dealer_bust"}:
-                        self.stats.wins += 1
-                    elif result in {"tie", "blackjack_tie"}:
-                        self.stats.pushes += 1
-                    else:
-                        self.stats.losses += 1
+        for (player, hand), (result, payout_amount) in zip(self.slots, results):
+            self.update_hand_results(hand, result, payout_amount)
+            if player == primary_player:
+                self.stats.rounds_played += 1
+                if result in rules.WINNING_OUTCOMES:
+                    self.stats.wins += 1
+                elif result in rules.PUSH_OUTCOMES:
+                    self.stats.pushes += 1
+                else:
+                    self.stats.losses += 1
 
     #step 7 of 8
     def payout(self):
         """
         Phase of blackjack where winners get paid.
         """
+        for player, hand in self.slots:
+            player.balance += hand.payout_amount
         for player in self.players:
-            for hand in player.hands:
-                player.balance += hand.payout_amount
             player.update_account()
+        self.count_table()
 
     #step 8 of 8
     def display_results(self) -> None:
@@ -475,8 +606,10 @@ class StandardBlackjack(Blackjack):
             kicked: str = self.player_decision()  # Step 4
             if kicked == "kicked":
                 return "kicked"
+        # Without a peek the dealer still needs a second card to settle naturals
+        if not is_over or not self.rules.dealer_peeks:
             self.dealer_draw()  # Step 5
-            self.check_win()  # Step 6
+        self.check_win()  # Step 6
         self.payout()  # Step 7
         self.display_results()  # Step 8
 
@@ -484,36 +617,26 @@ class StandardBlackjack(Blackjack):
         return status if status else "EXIT"
 
     #method to update result recorded by each hand object
-    def update_hand_results(self, hand: Hand, result_key: str) -> None:
+    def update_hand_results(self, hand: Hand, result_key: Outcome, payout_amount: int) -> None:
         templates = {
-            "player_blackjack": (
+            Outcome.PLAYER_BLACKJACK: (
                 "Player has a BLACKJACK.", "Player win: +{bj_bonus} chips."),
-            "player_wins": ("Player wins.", "Player win: +{bet} chips."),
-            "dealer_bust": ("Dealer BUSTED.", "Player win: +{bet} chips."),
-            "tie": ("Push.", "Tie: 0 chips."),
-            "blackjack_tie": ("Push.", "Tie: 0 chips."),
-            "player_bust": ("Player BUSTED.", "Player lose: -{bet} chips."),
-            "dealer_blackjack": (
+            Outcome.PLAYER_WIN: ("Player wins.", "Player win: +{bet} chips."),
+            Outcome.DEALER_BUST: ("Dealer BUSTED.", "Player win: +{bet} chips."),
+            Outcome.PUSH: ("Push.", "Tie: 0 chips."),
+            Outcome.BLACKJACK_PUSH: ("Push.", "Tie: 0 chips."),
+            Outcome.PLAYER_BUST: ("Player BUSTED.", "Player lose: -{bet} chips."),
+            Outcome.DEALER_BLACKJACK: (
                 "Dealer has a BLACKJACK.", "Player lose: -{bet} chips."),
-            "dealer_wins": ("Dealer wins.", "Player lose: -{bet} chips."),
+            Outcome.DEALER_WIN: ("Dealer wins.", "Player lose: -{bet} chips."),
         }
         msg, bet_res = templates.get(result_key,
                                      ("Unknown outcome.", "Outcome: Unknown."))
         bet_result_str = bet_res.format(
             bet=hand.bet,
-            bj_bonus=int(hand.bet * BLACKJACK_MULTIPLIER)
+            bj_bonus=int(hand.bet * self.rules.blackjack_payout)
         )
 
-        if result_key == "player_blackjack":
-            pay_ratio = 1 + BLACKJACK_MULTIPLIER
-        elif result_key in {"player_wins", "dealer_bust"}:
-            pay_ratio = 2.0
-        elif result_key in {"tie", "blackjack_tie"}:
-            pay_ratio = 1.0
-        else:
-            pay_ratio = 0.0
-        payout_amount = int(hand.bet * pay_ratio)
-
         hand.set_hand_results(result_key, msg, bet_result_str, payout_amount)
 
 def play_blackjack(context: GameContext):
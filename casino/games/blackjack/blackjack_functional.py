@@ -7,6 +7,7 @@ from casino.types import GameContext
 from casino.utils import clear_screen, cprint, cinput, display_topbar
 
 from CONSTANTS import *
+from . import rules
 
 FULL_DECK: StandardDeck = StandardDeck()
 
@@ -17,26 +18,10 @@ def deal_card(turn: list[Card], deck: StandardDeck) -> None:
 
 def hand_total(turn: list[StandardCard]) -> int:
     """Calculate the total of each hand."""
-    total = 0
-    aces = 0
     for card in turn:
         if not isinstance(card, StandardCard):
             raise ValueError(f"Expected StandardCard, got {type(card)}")
-        if card.rank in {"J", "Q", "K"}:
-            # Face card
-            total += 10
-        elif card.rank == "A":
-            # Ace special case
-            total += 11
-            aces += 1
-        else:
-            # Numeric card (2-10)
-            total += int(card.rank)
-    # Ace adjustment
-    while aces > 0 and total > 21:
-        total -= 10
-        aces -= 1
-    return total
+    return rules.hand_total(rules.card_values(turn))
 
 def print_dealer_cards(dealer_hand: list[Card]) -> None:
     """Print the dealer's cards side by side."""
@@ -25,9 +25,20 @@ INVALID_CHOICE_MSG     = "🤵: That's not a choice in this game."
 BET_PROMPT             = "🤵: How much would you like to bet?"
 INVALID_BET_MSG        = "🤵: That's not a valid bet."
 NO_FUNDS_MSG           = "🤵: You don't have enough chips to play. Goodbye."
+SEAT_TYPE_PROMPT       = "[H]uman   [B]ot   [C]ounting Bot"
+SHUFFLE_MSG            = "🤵: Reshuffling the shoe..."
+SPOTS_PROMPT           = "🤵: How many spots would you like to play? [1-{max_spots}] "
+
+# Most betting spots a single player can play at once
+MAX_SPOTS = 5
+
+SUIT_SYMBOLS = {"clubs": "♣", "diamonds": "♦", "hearts": "♥", "spades": "♠"}
 
 # Pay n times the amount of original player bet
 BLACKJACK_MULTIPLIER = 1.5
+
+# Reshuffle once less than this fraction of the shoe is left (the cut card)
+CUT_CARD_FRACTION = 0.25
 BLACKJACK_HEADER = """
 ┌───────────────────────────────┐
 │     ♠ B L A C K J A C K ♠     │
@@ -87,6 +98,7 @@ PROMPT_YES_NO = "[Y]es   [N]o"
 MSG_PLAYER_BUST = "🤵: You busted. Dealer wins."
 MSG_DEALER_BUST = "🤵: Dealer busted. You win!"
 MSG_PLAYER_BJ = "🤵: Blackjack! You win!"
+MSG_DEALER_BJ = "🤵: Dealer has Blackjack."
 MSG_DEALER_WIN = "🤵: Dealer wins."
 MSG_PLAYER_WIN = "🤵: You win!"
 MSG_PUSH = "🤵: Push."
@@ -1,14 +1,20 @@
 from casino.cards import StandardDeck, Card
+from . import dealer, rules
+from .rules import BlackjackRules
 
 class BlackjackCore:
     """
     Generic Blackjack mechanics. 
-    Responsible for Deck management, Hand state, and Value calculation.
+    Responsible for Deck management and Hand state. Value calculation is
+    delegated to the shared rules kernel.
     """
-    def __init__(self, num_decks: int = 1):
+    def __init__(self, num_decks: int = 1, table_rules: BlackjackRules = BlackjackRules.us()):
         self.deck = StandardDeck(num_decks)
+        self.rules = table_rules
         self.player_hand: list[Card] = []
         self.dealer_hand: list[Card] = []
+        # face down and off the table until revealed
+        self.hole_card: Card | None = None
 
     def deal_card_to_player(self):
         self.player_hand.append(self.deck.draw())
@@ -16,26 +22,30 @@ class BlackjackCore:
     def deal_card_to_dealer(self):
         self.dealer_hand.append(self.deck.draw())
 
+    def deal_hole_card(self):
+        self.hole_card = self.deck.draw()
+
+    def reveal_hole_card(self):
+        """Turn the hole card over. Without one, the dealer draws a second card now."""
+        if self.hole_card is None:
+            self.deal_card_to_dealer()
+        else:
+            self.dealer_hand.append(self.hole_card)
+            self.hole_card = None
+
+    def dealer_peeks_blackjack(self) -> bool:
+        """Whether the upcard and the hole card make a blackjack."""
+        if self.hole_card is None:
+            return False
+        return self.is_blackjack(self.dealer_hand + [self.hole_card])
+
     def reset_hands(self):
         self.player_hand = []
         self.dealer_hand = []
+        self.hole_card = None
 
     def get_hand_total(self, hand: list[Card]) -> int:
-        total = 0
-        aces = 0
-        for card in hand:
-            if card.rank in {"J", "Q", "K"}:
-                total += 10
-            elif card.rank == "A":
-                total += 11
-                aces += 1
-            else:
-                total += int(card.rank)
-        
-        while aces > 0 and total > 21:
-            total -= 10
-            aces -= 1
-        return total
+        return rules.hand_total(rules.card_values(hand))
 
     @property
     def player_total(self) -> int:
@@ -46,13 +56,16 @@ class BlackjackCore:
         return self.get_hand_total(self.dealer_hand)
 
     def is_blackjack(self, hand: list[Card]) -> bool:
-        return self.get_hand_total(hand) == 21 and len(hand) == 2
+        return rules.is_blackjack(rules.card_values(hand))
 
     def is_busted(self, hand: list[Card]) -> bool:
-        return self.get_hand_total(hand) > 21
-    
-    def dealer_should_hit(self, stand_on_soft_17=True) -> bool:
-        """
-        (Future-proofing: stand_on_soft_17 param could be used here for american rules)
-        """
-        return self.dealer_total < 17
\ No newline at end of file
+        return rules.is_bust(rules.card_values(hand))
+
+    def can_double(self) -> bool:
+        return rules.can_double(rules.card_values(self.player_hand), self.rules)
+
+    def dealer_should_hit(self) -> bool:
+        return dealer.should_hit(rules.card_values(self.dealer_hand), self.rules)
+
+    def settle(self) -> rules.Outcome:
+        return rules.settle(rules.card_values(self.player_hand), rules.card_values(self.dealer_hand))
@@ -0,0 +1,118 @@
+"""
+Precomputed dealer play for blackjack.
+
+The dealer has no choices to make, so their whole strategy fits in a small
+table indexed by the hard sum of their cards (aces counted as 1) and whether
+they hold an ace. The table is derived from the rules kernel once per rule
+set and then used both for scalar play-out and for playing out large batches
+of dealer hands with NumPy.
+"""
+
+from functools import lru_cache
+from typing import Callable, Sequence
+
+import numpy as np
+
+from . import rules
+from .rules import BlackjackRules
+
+# Largest hard sum a dealer can reach: hitting a hard 16 with a ten
+MAX_HARD_SUM = 26
+
+
+@lru_cache(maxsize=None)
+def dealer_table(table_rules: BlackjackRules) -> np.ndarray:
+    """
+    Dealer hit/stand table for a rule set.
+
+    `table[hard_sum, has_ace]` is True when the dealer hits.
+    """
+    table = np.zeros((MAX_HARD_SUM + 1, 2), dtype=bool)
+    for hard_sum in range(MAX_HARD_SUM + 1):
+        table[hard_sum, 0] = rules.dealer_should_hit([hard_sum], table_rules)
+        if hard_sum >= rules.ACE:
+            ace_hand = [rules.ACE, hard_sum - rules.ACE]
+            table[hard_sum, 1] = rules.dealer_should_hit(ace_hand, table_rules)
+    return table
+
+
+@lru_cache(maxsize=None)
+def _dealer_rows(table_rules: BlackjackRules) -> list[list[bool]]:
+    """`dealer_table` as nested lists, which are faster to index one at a time."""
+    return dealer_table(table_rules).tolist()
+
+
+def should_hit(cards: Sequence[int], table_rules: BlackjackRules) -> bool:
+    """Table lookup equivalent of `rules.dealer_should_hit`."""
+    hard_sum = sum(cards)
+    if hard_sum > MAX_HARD_SUM:
+        return False
+    return _dealer_rows(table_rules)[hard_sum][rules.ACE in cards]
+
+
+def play_out(
+    cards: Sequence[int],
+    draw: Callable[[], int],
+    table_rules: BlackjackRules,
+) -> list[int]:
+    """
+    Play out a dealer hand.
+
+    Arguments:
+        - cards: the dealer's starting cards
+        - draw: returns the next card value from the shoe
+        - table_rules: rules the dealer plays by
+
+    Returns the dealer's final cards. The input is not modified.
+    """
+    table = _dealer_rows(table_rules)
+    cards = list(cards)
+    hard_sum = sum(cards)
+    has_ace = rules.ACE in cards
+    while hard_sum <= MAX_HARD_SUM and table[hard_sum][has_ace]:
+        card = draw()
+        cards.append(card)
+        hard_sum += card
+        has_ace = has_ace or card == rules.ACE
+    return cards
+
+
+def play_out_batch(
+    starting: np.ndarray,
+    shoe: np.ndarray,
+    table_rules: BlackjackRules,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Play out many dealer hands at once.
+
+    Arguments:
+        - starting: `(n, k)` integer array of each dealer's starting cards
+        - shoe: `(n, m)` integer array. Row `i` is the stream of cards dealer
+            `i` draws from, in order
+        - table_rules: rules the dealers play by
+
+    Returns `(totals, drawn)`: the final best total of each hand (over 21
+    means bust) and the number of cards each dealer drew from their row.
+    """
+    table = dealer_table(table_rules)
+    n = starting.shape[0]
+    rows = np.arange(n)
+
+    hard_sum = starting.sum(axis=1).astype(np.int64)
+    has_ace = (starting == rules.ACE).any(axis=1)
+    drawn = np.zeros(n, dtype=np.int64)
+
+    active = table[np.minimum(hard_sum, MAX_HARD_SUM), has_ace.astype(np.intp)]
+    while active.any():
+        idx = rows[active]
+        if drawn[idx].max() >= shoe.shape[1]:
+            raise ValueError("Shoe rows are too short to finish every dealer hand")
+        card = shoe[idx, drawn[idx]]
+        hard_sum[idx] += card
+        has_ace[idx] |= card == rules.ACE
+        drawn[idx] += 1
+        active[idx] = table[np.minimum(hard_sum[idx], MAX_HARD_SUM), has_ace[idx].astype(np.intp)]
+
+    soft = has_ace & (hard_sum <= 11)
+    totals = hard_sum + 10 * soft
+    return totals, drawn
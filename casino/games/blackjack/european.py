@@ -1,39 +1,13 @@
-from enum import Enum, auto
 from casino.stats import GameStats, display_stats
 from casino.types import GameContext
 from .constants import *
 from .core import BlackjackCore
+from .rules import BlackjackRules, Outcome, PUSH_OUTCOMES, WINNING_OUTCOMES, payout_ratio
 from .ui import BlackjackUI
 
-# --- ENUMS & RULES STRATEGY ---
-
-class RoundResult(Enum):
-    PLAYER_BUST = auto()
-    DEALER_BUST = auto()
-    PLAYER_BJ = auto()
-    DEALER_BJ = auto()
-    PUSH = auto()
-    PLAYER_WIN = auto()
-    DEALER_WIN = auto()
-
-class EuropeanRules:
-    """
-    Encapsulates logic specific to European Blackjack (ENHC).
-    """
-    @staticmethod
-    def can_double(hand_total: int) -> bool:
-        """Rule: Double down only allowed on hard totals of 9, 10, or 11."""
-        return hand_total in {9, 10, 11}
-
-    @staticmethod
-    def get_payout(result: RoundResult) -> float:
-        if result == RoundResult.PLAYER_BJ:
-            return 2.5  # 3:2 Payout
-        elif result in {RoundResult.PLAYER_WIN, RoundResult.DEALER_BUST}:
-            return 2.0  # 1:1 Payout
-        elif result == RoundResult.PUSH:
-            return 1.0  # Push
-        return 0.0
+# European Blackjack (ENHC): the dealer takes no hole card, doubling is only
+# allowed on hard 9, 10 or 11 and there is no splitting.
+EUROPEAN_RULES = BlackjackRules.european()
 
 # --- GAME CONTROLLER ---
 
@@ -52,7 +26,7 @@ class EuropeanBlackjackGame:
         if not self._check_funds(): return
 
         num_decks = self.ui.prompt_deck_count()
-        self.core = BlackjackCore(num_decks)
+        self.core = BlackjackCore(num_decks, EUROPEAN_RULES)
         
         while True:
             self.play_round()
@@ -79,30 +53,34 @@ class EuropeanBlackjackGame:
         self.core.reset_hands()
         self.core.deal_card_to_player()
         self.core.deal_card_to_player()
-        self.core.deal_card_to_dealer() # Dealer gets 1 card in EU ruleset
+        self.core.deal_card_to_dealer()
+        # Dealer only takes a hole card when the rules let them peek at it;
+        # the EU ruleset has no hole card
+        if self.core.rules.dealer_peeks:
+            self.core.deal_hole_card()
+            if self.core.dealer_peeks_blackjack():
+                self.core.reveal_hole_card()
+                self.refresh_table(message="Dealer checks for blackjack...")
+                self._handle_resolution(self.core.settle())
+                return
 
         # Check Natural Blackjack
         if self.core.is_blackjack(self.core.player_hand):
-            self.core.deal_card_to_dealer() # Draw 2nd card to check tie
+            self.core.reveal_hole_card() # 2nd card to check tie
             self.refresh_table(message="Checking dealer hand...")
-            
-            if self.core.is_blackjack(self.core.dealer_hand):
-                self._handle_resolution(RoundResult.PUSH)
-            else:
-                self._handle_resolution(RoundResult.PLAYER_BJ)
+            self._handle_resolution(self.core.settle())
             return
 
         # Player Turn
         if not self.player_turn_loop():
-            self._handle_resolution(RoundResult.PLAYER_BUST)
+            self._handle_resolution(Outcome.PLAYER_BUST)
             return
 
         # Dealer Turn
         self.dealer_turn_loop()
         
         # Determine Winner
-        result = self._determine_winner()
-        self._handle_resolution(result)
+        self._handle_resolution(self.core.settle())
 
     def player_turn_loop(self) -> bool:
         first_turn = True
@@ -113,9 +91,7 @@ class EuropeanBlackjackGame:
             msg = None
 
             can_afford = self.ctx.account.balance >= self.bet
-            can_double = (first_turn 
-                          and can_afford 
-                          and EuropeanRules.can_double(self.core.player_total))
+            can_double = can_afford and self.core.can_double()
 
             options = "[S]tay   [H]it" + ("   [D]ouble" if can_double else "")
             action = self.ui.get_input(options).lower().strip()
@@ -136,7 +112,7 @@ class EuropeanBlackjackGame:
                     self.core.deal_card_to_player()
                     return not self.core.is_busted(self.core.player_hand)
                 else:
-                    if first_turn and can_afford and not EuropeanRules.can_double(self.core.player_total):
+                    if first_turn and can_afford and not self.core.can_double():
                         msg = MSG_EUROPEAN_DOUBLE
                     else:
                         msg = MSG_INVALID_CHOICE
@@ -146,47 +122,36 @@ class EuropeanBlackjackGame:
                 self._check_stubbornness()
 
     def dealer_turn_loop(self):
+        self.core.reveal_hole_card()
         while self.core.dealer_should_hit():
              self.ui.print_simple_message("Dealer draws...")
              self.core.deal_card_to_dealer()
 
-    def _determine_winner(self) -> RoundResult:
-        if self.core.is_busted(self.core.dealer_hand):
-            return RoundResult.DEALER_BUST
-        
-        p_tot = self.core.player_total
-        d_tot = self.core.dealer_total
-        
-        if p_tot > d_tot:
-            return RoundResult.PLAYER_WIN
-        elif p_tot < d_tot:
-            return RoundResult.DEALER_WIN
-        else:
-            return RoundResult.PUSH
-
-    def _handle_resolution(self, result: RoundResult):
+    def _handle_resolution(self, result: Outcome):
         self.stats.rounds_played += 1
-        if result in {RoundResult.PLAYER_WIN, RoundResult.PLAYER_BJ, RoundResult.DEALER_BUST}:
+        if result in WINNING_OUTCOMES:
             self.stats.wins += 1
-        elif result in {RoundResult.DEALER_WIN, RoundResult.PLAYER_BUST}:
-            self.stats.losses += 1
-        else:
+        elif result in PUSH_OUTCOMES:
             self.stats.pushes += 1
+        else:
+            self.stats.losses += 1
 
         msg = ""
-        payout_mult = EuropeanRules.get_payout(result)
+        payout_mult = payout_ratio(result, self.core.rules)
 
-        if result == RoundResult.PLAYER_BUST:
+        if result == Outcome.PLAYER_BUST:
             msg = MSG_PLAYER_BUST
-        elif result == RoundResult.DEALER_BUST:
+        elif result == Outcome.DEALER_BUST:
             msg = MSG_DEALER_BUST
-        elif result == RoundResult.PLAYER_BJ:
+        elif result == Outcome.PLAYER_BLACKJACK:
             msg = MSG_PLAYER_BJ
-        elif result == RoundResult.DEALER_WIN:
+        elif result == Outcome.DEALER_BLACKJACK:
+            msg = MSG_DEALER_BJ
+        elif result == Outcome.DEALER_WIN:
             msg = MSG_DEALER_WIN + f" {self.core.dealer_total} vs {self.core.player_total}"
-        elif result == RoundResult.PLAYER_WIN:
+        elif result == Outcome.PLAYER_WIN:
             msg = MSG_PLAYER_WIN + f" {self.core.player_total} vs {self.core.dealer_total}"
-        elif result == RoundResult.PUSH:
+        elif result in PUSH_OUTCOMES:
             msg = MSG_PUSH
 
         # Payout Execution
@@ -1,66 +1,60 @@
 from casino.cards import Card
 from casino.utils import cprint, print_cards
+from . import rules
+from .constants import SUIT_SYMBOLS
 
 class Hand:
-    def __init__(self, bet: int = 0, is_split_hand: bool = False):
+    def __init__(self, bet: int = 0, is_split_hand: bool = False, spot: int = 0):
         self.cards: list[Card] = []
         self.bet = bet
         self.is_split_hand = is_split_hand
+        # betting spot this hand was dealt to; split hands share their spot
+        self.spot = spot
         # below status data is to be updated by game engine according to rule
         self.result_key = None
         self.payout_amount = 0
         self.outcome_msg = ""
         self.bet_result_str = ""
 
-    #The original calc_hand_total method
-    #Whatever the rule, how to calculate total don't change (right?)
     @property
-    def total(self) -> int: #NEW
-        total = 0
-        aces = 0
-        for card in self.cards: #NEW
-            if card.rank in {"J", "Q", "K"}:
-                total += 10
-            elif card.rank == "A":
-                total += 11
-                aces += 1
-            else:
-                total += int(card.rank)
-        while aces > 0 and total > 21:
-            total -= 10
-            aces -= 1
-        return total
+    def values(self) -> list[int]:
+        """Integer card values used by the rules kernel."""
+        return rules.card_values(self.cards)
+
+    @property
+    def total(self) -> int:
+        return rules.hand_total(self.values)
+
+    @property
+    def is_soft(self) -> bool:
+        """True when an ace in the hand is still being counted as 11."""
+        return rules.hand_value(self.values)[1]
 
     #NEW: method to evaluate if BLACKJACK
     @property
     def is_blackjack(self) -> bool:
-        if self.is_split_hand:
-            return False # split hand not allowed BJ
-        return len(self.cards) == 2 and self.total == 21
+        return rules.is_blackjack(self.values, self.is_split_hand)
 
     #NEW: method to evaluate if busted
     @property
     def is_bust(self) -> bool:
-        return self.total > 21
+        return rules.is_bust(self.values)
 
     def reveal_all(self) -> None:
         for card in self.cards:
             card.hidden = False
 
-    #NEW: method to print hand cards
-    def print_hand(self, label:str = "Hand", is_active: bool = False) -> None:
-        prefix = " >>> " if is_active else "     "
+    def _status(self) -> str:
+        """`Bet | TOTAL` part of the hand header shared by both layouts."""
         #display total if no cards hidden
         has_hidden = any(card.hidden for card in self.cards)
         display_total = "?" if has_hidden else self.total
         #status postfix
         bj_tag = " [BLACKJACK!]" if self.is_blackjack else ""
         bust_tag = " [BUSTED!]" if self.is_bust else ""
+        return f"Bet: {self.bet} | TOTAL: {display_total}{bj_tag}{bust_tag}"
 
-        header = f"{prefix}{label} | Bet: {self.bet} | TOTAL: {display_total}{bj_tag}{bust_tag}"
-        cprint(header)
-
-        print_cards(self.cards)
+    def _print_outcome(self, prefix: str) -> None:
         # if outcome_msg is set, print it
         if self.outcome_msg:
             footer = f"{prefix}OUTCOME: {self.outcome_msg}"
@@ -68,6 +62,23 @@ class Hand:
                 footer += f" ({self.bet_result_str})"
             cprint(footer)
 
+    #NEW: method to print hand cards
+    def print_hand(self, label:str = "Hand", is_active: bool = False) -> None:
+        prefix = " >>> " if is_active else "     "
+        cprint(f"{prefix}{label} | {self._status()}")
+        print_cards(self.cards)
+        self._print_outcome(prefix)
+
+    def print_compact(self, label: str = "Hand", is_active: bool = False) -> None:
+        """Print the hand on one line, e.g. `Spot 2 | A♠ K♥ | Bet: 10 | TOTAL: 21`."""
+        prefix = " >>> " if is_active else "     "
+        cards = " ".join(
+            "??" if card.hidden else f"{card.rank}{SUIT_SYMBOLS[card.suit]}"
+            for card in self.cards
+        )
+        cprint(f"{prefix}{label} | {cards} | {self._status()}")
+        self._print_outcome(prefix)
+
     def set_hand_results(self, result_key: str, msg: str, bet_res: str, payout: int):
         self.result_key = result_key
         self.outcome_msg = msg
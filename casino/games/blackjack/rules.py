@@ -0,0 +1,194 @@
+"""
+UI-free blackjack rules kernel.
+
+Every blackjack variant shares the same hand math and settlement; they only
+differ in a handful of table rules. This module holds that shared logic as
+pure functions over integer cards so the interactive games, bots and
+simulators all agree on the result of a hand.
+
+Cards are represented by their blackjack value: aces are 1, face cards are
+10 and everything else is its pip value.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional, Sequence
+
+from .constants import BLACKJACK_MULTIPLIER
+
+ACE = 1
+
+RANK_VALUES = {
+    "A": 1, "2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7,
+    "8": 8, "9": 9, "10": 10, "J": 10, "Q": 10, "K": 10,
+}
+
+
+class Outcome(str, Enum):
+    """Result of a single player hand against the dealer."""
+    PLAYER_BLACKJACK = "player_blackjack"
+    PLAYER_WIN = "player_wins"
+    DEALER_BUST = "dealer_bust"
+    PUSH = "tie"
+    BLACKJACK_PUSH = "blackjack_tie"
+    PLAYER_BUST = "player_bust"
+    DEALER_BLACKJACK = "dealer_blackjack"
+    DEALER_WIN = "dealer_wins"
+
+
+WINNING_OUTCOMES = {Outcome.PLAYER_BLACKJACK, Outcome.PLAYER_WIN, Outcome.DEALER_BUST}
+PUSH_OUTCOMES = {Outcome.PUSH, Outcome.BLACKJACK_PUSH}
+
+
+@dataclass(frozen=True)
+class BlackjackRules:
+    """
+    Table rules that vary between blackjack variants.
+
+    Attributes:
+        dealer_peeks: dealer checks the hole card for blackjack before
+            players act. When False the dealer takes no hole card (ENHC).
+        double_totals: hard totals a player may double on. None means any
+            two cards.
+        double_after_split: whether split hands may be doubled.
+        max_split_hands: most hands a player can hold after splitting.
+            1 disables splitting entirely.
+        dealer_hits_soft_17: H17 when True, S17 when False.
+        blackjack_payout: winnings per chip bet on a natural (1.5 = 3:2).
+    """
+    dealer_peeks: bool = True
+    double_totals: Optional[frozenset[int]] = None
+    double_after_split: bool = True
+    max_split_hands: int = 4
+    dealer_hits_soft_17: bool = False
+    blackjack_payout: float = BLACKJACK_MULTIPLIER
+
+    @classmethod
+    def us(cls) -> "BlackjackRules":
+        return cls()
+
+    @classmethod
+    def european(cls) -> "BlackjackRules":
+        return cls(
+            dealer_peeks=False,
+            double_totals=frozenset({9, 10, 11}),
+            double_after_split=False,
+            max_split_hands=1,
+        )
+
+
+def card_value(rank: str) -> int:
+    """Integer value of a card rank."""
+    return RANK_VALUES[rank]
+
+
+def card_values(cards) -> list[int]:
+    """Integer values of a list of `StandardCard` objects."""
+    return [RANK_VALUES[card.rank] for card in cards]
+
+
+def hand_value(cards: Sequence[int]) -> tuple[int, bool]:
+    """
+    Best total of a hand and whether it is soft.
+
+    At most one ace can ever count as 11, so the hand is soft exactly when
+    it holds an ace and counting one of them as 11 does not bust.
+    """
+    total = sum(cards)
+    if ACE in cards and total <= 11:
+        return total + 10, True
+    return total, False
+
+
+def hand_total(cards: Sequence[int]) -> int:
+    return hand_value(cards)[0]
+
+
+def is_blackjack(cards: Sequence[int], is_split: bool = False) -> bool:
+    """A two card 21 that did not come from a split."""
+    return not is_split and len(cards) == 2 and hand_total(cards) == 21
+
+
+def is_bust(cards: Sequence[int]) -> bool:
+    return sum(cards) > 21
+
+
+def can_double(cards: Sequence[int], rules: BlackjackRules, is_split: bool = False) -> bool:
+    if len(cards) != 2:
+        return False
+    if is_split and not rules.double_after_split:
+        return False
+    if rules.double_totals is None:
+        return True
+    total, soft = hand_value(cards)
+    return not soft and total in rules.double_totals
+
+
+def can_split(cards: Sequence[int], num_hands: int, rules: BlackjackRules) -> bool:
+    return len(cards) == 2 and cards[0] == cards[1] and num_hands < rules.max_split_hands
+
+
+def dealer_should_hit(cards: Sequence[int], rules: BlackjackRules) -> bool:
+    total, soft = hand_value(cards)
+    return total < 17 or (total == 17 and soft and rules.dealer_hits_soft_17)
+
+
+def settle(
+    cards: Sequence[int],
+    dealer: Sequence[int],
+    is_split: bool = False,
+) -> Outcome:
+    """Outcome of one finished player hand against the finished dealer hand."""
+    player_bj = is_blackjack(cards, is_split)
+    dealer_bj = is_blackjack(dealer)
+    if player_bj and dealer_bj:
+        return Outcome.BLACKJACK_PUSH
+    if dealer_bj:
+        return Outcome.DEALER_BLACKJACK
+    if player_bj:
+        return Outcome.PLAYER_BLACKJACK
+    if is_bust(cards):
+        return Outcome.PLAYER_BUST
+    if is_bust(dealer):
+        return Outcome.DEALER_BUST
+
+    player_total = hand_total(cards)
+    dealer_total = hand_total(dealer)
+    if player_total == dealer_total:
+        return Outcome.PUSH
+    if player_total < dealer_total:
+        return Outcome.DEALER_WIN
+    return Outcome.PLAYER_WIN
+
+
+def payout_ratio(outcome: Outcome, rules: BlackjackRules) -> float:
+    """Amount returned per chip bet, including the original stake."""
+    if outcome == Outcome.PLAYER_BLACKJACK:
+        return 1 + rules.blackjack_payout
+    if outcome in {Outcome.PLAYER_WIN, Outcome.DEALER_BUST}:
+        return 2.0
+    if outcome in PUSH_OUTCOMES:
+        return 1.0
+    return 0.0
+
+
+def resolve_round(
+    hands: Sequence[Sequence[int]],
+    bets: Sequence[int],
+    dealer: Sequence[int],
+    rules: BlackjackRules,
+    split_flags: Optional[Sequence[bool]] = None,
+) -> list[tuple[Outcome, int]]:
+    """
+    Settle every player hand at the table.
+
+    Returns an `(outcome, payout)` pair per hand, where payout is the number
+    of chips handed back to the player (0 for a loss).
+    """
+    if split_flags is None:
+        split_flags = [False] * len(hands)
+    results = []
+    for cards, bet, is_split in zip(hands, bets, split_flags):
+        outcome = settle(cards, dealer, is_split)
+        results.append((outcome, int(bet * payout_ratio(outcome, rules))))
+    return results
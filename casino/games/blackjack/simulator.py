@@ -0,0 +1,341 @@
+"""
+Blackjack simulators for measuring rule variants.
+
+Two engines play the same hands with basic strategy:
+
+- `play_hand` plays one hand at a time with the scalar rules kernel. It is
+  the reference implementation.
+- `play_batch` plays a whole batch of hands at once with NumPy. Totals use
+  vectorized soft-ace logic, decisions come from the strategy charts by
+  fancy indexing, and doubles and splits are applied through masks.
+
+Both engines read cards from the same pre-shuffled integer shoes, so given
+the same shoes they produce exactly the same results.
+
+Card order for every hand: player, dealer upcard, player, dealer hole card,
+then player draws in the order hands are played, then dealer draws. Split
+hands are played left to right. A new split hand receives its second card
+when its turn comes.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from . import dealer, rules, strategy
+from .rules import BlackjackRules
+
+# Card values in a single deck, ace = 1
+DECK_VALUES = np.array([min(rank, 10) for rank in range(1, 14)] * 4, dtype=np.int8)
+
+# Each hand starts this many cards after the previous one in the same shoe.
+# Hands that need more cards simply keep reading into the next hand's cards,
+# which keeps every hand a uniformly random deal from the shoe. Hands in the
+# same shoe are not independent though, so `sweep` measures its error from
+# whole shoes, which are.
+HAND_STRIDE = 8
+
+# Cards left unused at the end of every shoe so no hand runs off the end
+SHOE_RESERVE = 80
+
+# Strategy chart codes used by the batch engine
+_CODES = {strategy.STAND: 0, strategy.HIT: 1, strategy.DOUBLE: 2, strategy.DOUBLE_OR_STAND: 3}
+CODE_STAND, CODE_HIT, CODE_DOUBLE, CODE_DOUBLE_OR_STAND = 0, 1, 2, 3
+
+
+def _chart_array(table: list[list[str]]) -> np.ndarray:
+    array = np.zeros((22, 11), dtype=np.int8)
+    for total in range(22):
+        for upcard in strategy.DEALER_UPCARDS:
+            array[total, upcard] = _CODES[table[total][upcard]]
+    return array
+
+
+HARD_CODES = _chart_array(strategy.HARD_TABLE)
+SOFT_CODES = _chart_array(strategy.SOFT_TABLE)
+PAIR_SPLITS = np.array(
+    [[bool(row) and row[up] == strategy.SPLIT for up in range(11)] for row in strategy.PAIR_TABLE]
+)
+
+
+@dataclass
+class Shoes:
+    """
+    A batch of pre-shuffled shoes and where each hand starts in them.
+
+    Attributes:
+        cards: every shoe laid end to end as one flat int8 array
+        starts: flat index of the first card of each hand
+        shoe_length: number of cards in each shoe
+    """
+    cards: np.ndarray
+    starts: np.ndarray
+    shoe_length: int
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def shoe_index(self) -> np.ndarray:
+        """Which shoe each hand is dealt from."""
+        return self.starts // self.shoe_length
+
+    def stream(self, hand: int) -> list[int]:
+        """Cards available to one hand, from its first card to the shoe end."""
+        start = int(self.starts[hand])
+        end = (start // self.shoe_length + 1) * self.shoe_length
+        return self.cards[start:end].tolist()
+
+
+def make_shoes(num_hands: int, num_decks: int, rng: np.random.Generator) -> Shoes:
+    """Shuffle enough `num_decks` shoes to deal `num_hands` hands."""
+    shoe_length = 52 * num_decks
+    hands_per_shoe = max((shoe_length - SHOE_RESERVE) // HAND_STRIDE, 1)
+    num_shoes = -(-num_hands // hands_per_shoe)
+
+    shoes = rng.permuted(np.tile(np.tile(DECK_VALUES, num_decks), (num_shoes, 1)), axis=1)
+    offsets = np.arange(hands_per_shoe) * HAND_STRIDE
+    starts = (np.arange(num_shoes)[:, None] * shoe_length + offsets).ravel()[:num_hands]
+
+    return Shoes(shoes.ravel(), starts, shoe_length)
+
+
+def play_hand(stream: Sequence[int], table_rules: BlackjackRules) -> float:
+    """
+    Play one hand of basic strategy with the scalar rules kernel.
+
+    Returns the net result in units of the initial bet.
+    """
+    cards = iter(stream)
+    draw = cards.__next__
+    first, up, second, hole = draw(), draw(), draw(), draw()
+    dealer_cards = [up, hole]
+    hands = [[first, second]]
+    bets = [1]
+
+    player_bj = rules.is_blackjack(hands[0])
+    dealer_bj = rules.is_blackjack(dealer_cards)
+    if not (player_bj or (table_rules.dealer_peeks and dealer_bj)):
+        index = 0
+        while index < len(hands):
+            hand = hands[index]
+            if len(hand) == 1:
+                hand.append(draw())
+            while True:
+                total, soft = rules.hand_value(hand)
+                can_split = rules.can_split(hand, len(hands), table_rules)
+                can_double = rules.can_double(hand, table_rules, len(hands) > 1)
+                pair_value = hand[0] if can_split else 0
+                action = strategy.decide(total, soft, pair_value, up, can_double, can_split)
+                if action == strategy.SPLIT:
+                    hands.append([hand.pop()])
+                    bets.append(bets[index])
+                    hand.append(draw())
+                elif action == strategy.DOUBLE:
+                    bets[index] *= 2
+                    hand.append(draw())
+                    break
+                elif action == strategy.HIT:
+                    hand.append(draw())
+                else:
+                    break
+            index += 1
+
+        if any(not rules.is_bust(hand) for hand in hands):
+            dealer_cards = dealer.play_out(dealer_cards, draw, table_rules)
+
+    is_split = len(hands) > 1
+    return sum(
+        bet * rules.payout_ratio(rules.settle(hand, dealer_cards, is_split), table_rules) - bet
+        for hand, bet in zip(hands, bets)
+    )
+
+
+def _best_totals(hard: np.ndarray, has_ace: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    soft = has_ace & (hard <= 11)
+    return hard + 10 * soft, soft
+
+
+def play_batch(shoes: Shoes, table_rules: BlackjackRules) -> np.ndarray:
+    """
+    Play every hand in `shoes` with basic strategy using array operations.
+
+    Returns the net result of each hand in units of the initial bet.
+    """
+    flat = shoes.cards
+    n = len(shoes)
+    slots = table_rules.max_split_hands
+    rows = np.arange(n)
+
+    pos = shoes.starts.astype(np.int64)
+    first, up = flat[pos].astype(np.int64), flat[pos + 1].astype(np.int64)
+    second, hole = flat[pos + 2].astype(np.int64), flat[pos + 3].astype(np.int64)
+    pos += 4
+
+    # One column per possible hand after splitting
+    hard = np.zeros((n, slots), dtype=np.int64)
+    has_ace = np.zeros((n, slots), dtype=bool)
+    num_cards = np.zeros((n, slots), dtype=np.int64)
+    first_card = np.zeros((n, slots), dtype=np.int64)
+    bets = np.zeros((n, slots), dtype=np.float64)
+    num_hands = np.ones(n, dtype=np.int64)
+
+    hard[:, 0] = first + second
+    has_ace[:, 0] = (first == rules.ACE) | (second == rules.ACE)
+    num_cards[:, 0] = 2
+    first_card[:, 0] = first
+    bets[:, 0] = 1.0
+
+    dealer_hard = up + hole
+    dealer_ace = (up == rules.ACE) | (hole == rules.ACE)
+    dealer_bj = (dealer_hard == 11) & dealer_ace
+    player_bj = (hard[:, 0] == 11) & has_ace[:, 0]
+    skip = player_bj | (dealer_bj if table_rules.dealer_peeks else False)
+
+    # Which totals may be doubled on; soft hands only when any total is allowed
+    double_totals = np.ones(32, dtype=bool)
+    if table_rules.double_totals is not None:
+        double_totals[:] = False
+        double_totals[list(table_rules.double_totals)] = True
+    double_soft = table_rules.double_totals is None
+
+    def draw(idx: np.ndarray, slot: int) -> None:
+        card = flat[pos[idx]].astype(np.int64)
+        pos[idx] += 1
+        hard[idx, slot] += card
+        has_ace[idx, slot] |= card == rules.ACE
+        num_cards[idx, slot] += 1
+
+    for slot in range(slots):
+        live = ~skip & (slot < num_hands)
+        draw(rows[live & (num_cards[:, slot] == 1)], slot)
+
+        active = live
+        while active.any():
+            idx = rows[active]
+            hand_hard = hard[idx, slot]
+            total, soft = _best_totals(hand_hard, has_ace[idx, slot])
+            dealer_up = up[idx]
+            two_cards = num_cards[idx, slot] == 2
+            is_split = num_hands[idx] > 1
+
+            pair = first_card[idx, slot]
+            can_split = two_cards & (hand_hard == 2 * pair) & (num_hands[idx] < slots)
+            can_double = (two_cards
+                          & (~is_split | table_rules.double_after_split)
+                          & double_totals[total]
+                          & (~soft | double_soft))
+
+            chart_total = np.minimum(total, 21)
+            code = np.where(soft, SOFT_CODES[chart_total, dealer_up], HARD_CODES[chart_total, dealer_up])
+
+            split = can_split & PAIR_SPLITS[pair, dealer_up]
+            finished = ~split & (total >= 21)
+            double = ~split & ~finished & can_double & ((code == CODE_DOUBLE) | (code == CODE_DOUBLE_OR_STAND))
+            stand = ~split & ~finished & ~double & ((code == CODE_STAND) | (code == CODE_DOUBLE_OR_STAND))
+            hit = ~split & ~finished & ~double & ~stand
+
+            if split.any():
+                split_rows = idx[split]
+                new_slot = num_hands[split_rows]
+                card = first_card[split_rows, slot]
+                hard[split_rows, new_slot] = card
+                has_ace[split_rows, new_slot] = card == rules.ACE
+                num_cards[split_rows, new_slot] = 1
+                first_card[split_rows, new_slot] = card
+                bets[split_rows, new_slot] = bets[split_rows, slot]
+                num_hands[split_rows] += 1
+
+                hard[split_rows, slot] = card
+                has_ace[split_rows, slot] = card == rules.ACE
+                num_cards[split_rows, slot] = 1
+                draw(split_rows, slot)
+
+            if double.any():
+                bets[idx[double], slot] *= 2
+                draw(idx[double], slot)
+            if hit.any():
+                draw(idx[hit], slot)
+
+            active = np.zeros(n, dtype=bool)
+            active[idx[split | hit]] = True
+
+    in_play = np.arange(slots) < num_hands[:, None]
+    player_bust = hard > 21
+    needs_dealer = ~skip & (in_play & ~player_bust).any(axis=1)
+
+    dealer_total, _ = _best_totals(dealer_hard, dealer_ace)
+    if needs_dealer.any():
+        idx = rows[needs_dealer]
+        starting = np.stack([up[idx], hole[idx]], axis=1)
+        stream = flat[pos[idx, None] + np.arange(12)]
+        dealer_total[idx], _ = dealer.play_out_batch(starting, stream, table_rules)
+
+    total, _ = _best_totals(hard, has_ace)
+    hand_bj = (num_hands == 1)[:, None] & (num_cards == 2) & (total == 21)
+    dealer_bj = dealer_bj[:, None]
+    dealer_total = dealer_total[:, None]
+
+    ratio = np.select(
+        [
+            hand_bj & dealer_bj,
+            dealer_bj,
+            hand_bj,
+            player_bust,
+            dealer_total > 21,
+            total > dealer_total,
+            total == dealer_total,
+        ],
+        [1.0, 0.0, 1.0 + table_rules.blackjack_payout, 0.0, 2.0, 2.0, 1.0],
+        default=0.0,
+    )
+    return np.where(in_play, bets * ratio - bets, 0.0).sum(axis=1)
+
+
+def sweep(
+    variants: dict[str, BlackjackRules],
+    num_decks: Sequence[int],
+    num_hands: int,
+    seed: Optional[int] = None,
+    batch_size: int = 200_000,
+) -> dict[tuple[str, int], tuple[float, float]]:
+    """
+    Estimate the player's expected value for every rule variant and deck count.
+
+    Every variant is played on the same shoes for a given deck count, so the
+    differences between variants are measured with much less noise than
+    their absolute values.
+
+    Hands dealt from the same shoe can share cards, so the standard error
+    is taken over shoe totals rather than single hands.
+
+    Returns `{(variant, decks): (mean, standard_error)}` per initial bet.
+    """
+    results = {}
+    for decks in num_decks:
+        # Per variant: sums over shoes of T, T*n and T^2, where T is a shoe's
+        # net result and n its number of hands
+        totals = {name: np.zeros(3) for name in variants}
+        # Number of shoes, and sum over shoes of n^2
+        num_shoes, hand_squares = 0, 0.0
+        rng = np.random.default_rng(seed)
+        remaining = num_hands
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            shoes = make_shoes(size, decks, rng)
+            shoe_index = shoes.shoe_index
+            hands = np.bincount(shoe_index).astype(np.float64)
+            num_shoes += len(hands)
+            hand_squares += np.square(hands).sum()
+            for name, table_rules in variants.items():
+                shoe_net = np.bincount(shoe_index, weights=play_batch(shoes, table_rules))
+                totals[name] += (shoe_net.sum(), (shoe_net * hands).sum(), np.square(shoe_net).sum())
+            remaining -= size
+        for name, (total, cross, squares) in totals.items():
+            mean = total / num_hands
+            # sum over shoes of (T - n * mean)^2
+            spread = max(squares - 2 * mean * cross + mean ** 2 * hand_squares, 0.0)
+            variance = spread * num_shoes / max(num_shoes - 1, 1) / num_hands ** 2
+            results[(name, decks)] = (mean, variance ** 0.5)
+    return results
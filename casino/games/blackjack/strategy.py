@@ -0,0 +1,159 @@
+"""
+Precomputed basic strategy and card counting for blackjack bots.
+
+The charts below are the standard multi-deck basic strategy (dealer stands on
+soft 17, double after split allowed). They are expanded once at import time
+into flat lookup tables so a bot decision is a single list index. Cards and
+upcards use the integer values of the rules kernel (ace = 1).
+"""
+
+from .rules import card_value
+
+HIT    = "H"
+STAND  = "S"
+DOUBLE = "D"  # double if allowed, otherwise hit
+DOUBLE_OR_STAND = "d"  # double if allowed, otherwise stand
+SPLIT  = "P"
+
+# Dealer upcards in chart column order
+DEALER_UPCARDS = [2, 3, 4, 5, 6, 7, 8, 9, 10, 1]
+
+#                 2 3 4 5 6 7 8 9 T A
+HARD_CHART = {
+    8:  "H H H H H H H H H H",
+    9:  "H D D D D H H H H H",
+    10: "D D D D D D D D H H",
+    11: "D D D D D D D D D H",
+    12: "H H S S S H H H H H",
+    13: "S S S S S H H H H H",
+    14: "S S S S S H H H H H",
+    15: "S S S S S H H H H H",
+    16: "S S S S S H H H H H",
+    17: "S S S S S S S S S S",
+}
+
+# Keyed by soft total (A+A = 12 ... A+9 = 20). Soft 12 is a pair of aces
+# that can no longer be split.
+SOFT_CHART = {
+    12: "H H H H H H H H H H",
+    13: "H H H D D H H H H H",
+    14: "H H H D D H H H H H",
+    15: "H H D D D H H H H H",
+    16: "H H D D D H H H H H",
+    17: "H D D D D H H H H H",
+    18: "S d d d d S S H H H",
+    19: "S S S S S S S S S S",
+}
+
+# Keyed by the value of one card of the pair
+PAIR_CHART = {
+    1:  "P P P P P P P P P P",
+    2:  "P P P P P P H H H H",
+    3:  "P P P P P P H H H H",
+    4:  "H H H P P H H H H H",
+    6:  "P P P P P H H H H H",
+    7:  "P P P P P P H H H H",
+    8:  "P P P P P P P P P P",
+    9:  "P P P P P S P P S S",
+}
+
+
+def _row(actions: str) -> list[str]:
+    """Turn a chart row into a list indexed directly by upcard value."""
+    by_upcard = [""] * 11
+    for upcard, action in zip(DEALER_UPCARDS, actions.split()):
+        by_upcard[upcard] = action
+    return by_upcard
+
+
+def _expand(chart: dict[int, str], size: int) -> list[list[str]]:
+    """
+    Expand a chart into a `[total][upcard]` table.
+
+    Totals below the chart's first row use the first row and totals above its
+    last row use the last row.
+    """
+    first, last = min(chart), max(chart)
+    return [_row(chart[min(max(total, first), last)]) for total in range(size)]
+
+
+HARD_TABLE = _expand(HARD_CHART, 22)
+SOFT_TABLE = _expand(SOFT_CHART, 22)
+PAIR_TABLE = [_row(PAIR_CHART[value]) if value in PAIR_CHART else [] for value in range(11)]
+
+
+def decide(
+    total: int,
+    soft: bool,
+    pair_value: int,
+    dealer_up: int,
+    can_double: bool,
+    can_split: bool,
+) -> str:
+    """
+    Look up the basic strategy action for a hand.
+
+    Arguments:
+        - total: best total of the hand
+        - soft: whether an ace in the hand is currently counted as 11
+        - pair_value: value of the paired card if the hand is a splittable
+            pair, otherwise 0
+        - dealer_up: value of the dealer's upcard
+        - can_double / can_split: whether the table allows those moves now
+
+    Returns one of HIT, STAND, DOUBLE or SPLIT.
+    """
+    if can_split and PAIR_TABLE[pair_value]:
+        action = PAIR_TABLE[pair_value][dealer_up]
+        if action == SPLIT:
+            return SPLIT
+    if total >= 21:
+        return STAND
+    if soft:
+        action = SOFT_TABLE[total][dealer_up]
+    else:
+        action = HARD_TABLE[total][dealer_up]
+
+    if action == DOUBLE:
+        return DOUBLE if can_double else HIT
+    if action == DOUBLE_OR_STAND:
+        return DOUBLE if can_double else STAND
+    return action
+
+
+# Hi-Lo count tag for each card value
+HI_LO_TAGS = [0, -1, 1, 1, 1, 1, 1, 0, 0, 0, -1]
+
+# Bet units by true count, starting at true count 1. Anything at or below 1
+# is a single unit; anything past the end of the ramp uses the last entry.
+BET_RAMP = [1, 2, 4, 6, 8]
+
+
+class RunningCount:
+    """
+    Hi-Lo running count of the cards seen since the last shuffle.
+    """
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.seen = 0
+
+    def reset(self) -> None:
+        self.running = 0
+        self.seen = 0
+
+    def observe(self, rank: str) -> None:
+        self.running += HI_LO_TAGS[card_value(rank)]
+        self.seen += 1
+
+    def true_count(self, cards_remaining: int) -> float:
+        decks_remaining = max(cards_remaining / 52, 0.5)
+        return self.running / decks_remaining
+
+
+def ramp_bet(min_bet: int, true_count: float) -> int:
+    """Bet size for a counting bot at the given true count."""
+    index = int(true_count) - 1
+    if index < 0:
+        return min_bet
+    return min_bet * BET_RAMP[min(index, len(BET_RAMP) - 1)]
@@ -0,0 +1,172 @@
+"""
+Computer poker opponent.
+
+Preflop the bot plays from fixed opening ranges: the strongest starting
+hand classes by precomputed equity against a random hand. Postflop it
+estimates its equity with an anytime Monte Carlo that stops when its time
+budget runs out, or takes it from its hand-strength bucket, then compares
+that equity with the pot odds it is being offered.
+"""
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+
+from . import buckets as strength_buckets
+from . import equity, preflop
+from .table import CALL, CHECK, FOLD, RAISE
+
+# Share of all starting hands (by combos) the bot raises and plays preflop
+RAISE_RANGE = 0.15
+PLAY_RANGE = 0.45
+
+# Postflop equity needed to raise for value
+RAISE_EQUITY = 0.70
+
+# Extra equity over the pot odds the bot wants before calling
+CALL_MARGIN = 0.02
+
+DEFAULT_THINK_MS = 50
+
+
+@dataclass(frozen=True)
+class Decision:
+    """
+    An action and, for raises, the number of chips raised by.
+    """
+    action: str
+    amount: int = 0
+
+
+@lru_cache(maxsize=None)
+def opening_ranges() -> tuple[np.ndarray, np.ndarray]:
+    """
+    `(raise_range, play_range)` as boolean arrays over the 169 hand classes.
+
+    Classes are ranked by equity against a random hand and taken from the
+    top until the range holds the target share of all 1326 combos.
+    """
+    vs_random = preflop.vs_random_equities()
+    combos = np.array([len(preflop.class_combos(hand)) for hand in range(preflop.NUM_CLASSES)])
+    order = np.argsort(-vs_random, kind="stable")
+    covered = np.cumsum(combos[order]) / combos.sum()
+
+    ranges = []
+    for share in (RAISE_RANGE, PLAY_RANGE):
+        in_range = np.zeros(preflop.NUM_CLASSES, dtype=bool)
+        in_range[order[covered <= share]] = True
+        ranges.append(in_range)
+    return ranges[0], ranges[1]
+
+
+def pot_odds(to_call: int, pot: int) -> float:
+    """Share of the final pot the bot has to put in to call."""
+    if to_call <= 0:
+        return 0.0
+    return to_call / (pot + to_call)
+
+
+class PokerBot:
+    """
+    Picks fold, check, call or raise for one seat.
+
+    Arguments:
+        - think_ms: time budget for a postflop equity estimate
+        - rng: source of sampling seeds; seed it for reproducible play
+        - samples: if set, estimate postflop equity from this many runouts
+            instead of sampling against the clock. Together with a seeded
+            `rng` this makes every decision reproducible, which simulations
+            need.
+        - buckets: if True, use the E[HS] of the hand's strength bucket as
+            its postflop equity: one lookup on the flop and an exact
+            calculation of at most 10 ms on the turn and river
+
+    The opening ranges and evaluator tables are built when the bot is
+    created, so no decision pays for them.
+    """
+
+    def __init__(
+        self,
+        think_ms: float = DEFAULT_THINK_MS,
+        rng: Optional[random.Random] = None,
+        samples: Optional[int] = None,
+        buckets: bool = False,
+    ) -> None:
+        self.think_ms = think_ms
+        self.rng = rng or random.Random()
+        self.samples = samples
+        self.buckets = buckets
+        opening_ranges()
+        equity._warm_up()
+        if buckets:
+            strength_buckets.flop_table()
+            strength_buckets.centroids()
+
+    def hand_equity(self, hole: Sequence[int], board: Sequence[int], num_opponents: int = 1) -> float:
+        """
+        Estimated share of the pot won at showdown.
+
+        Equity against several opponents is approximated by the equity
+        against one random hand raised to the number of opponents.
+        """
+        if not board:
+            heads_up = preflop.preflop_equity(hole)
+        elif self.buckets:
+            heads_up = strength_buckets.bucket_strength(hole, board)
+        elif self.samples:
+            seed = np.random.SeedSequence(self.rng.getrandbits(64))
+            wins, ties, total = equity.sample_batch(hole, board, None, self.samples, seed)
+            heads_up = (wins + ties / 2) / total
+        else:
+            seed = self.rng.getrandbits(64)
+            heads_up = equity.anytime_equity(hole, board, budget_ms=self.think_ms, seed=seed).equity
+        return heads_up ** num_opponents
+
+    def decide(
+        self,
+        hole: Sequence[int],
+        board: Sequence[int],
+        to_call: int,
+        pot: int,
+        min_raise: int,
+        stack: int,
+        num_opponents: int = 1,
+    ) -> Decision:
+        """
+        Choose an action.
+
+        Arguments:
+            - hole / board: the bot's hole cards and the community cards
+            - to_call: chips needed to stay in the hand (0 if checked to)
+            - pot: chips already in the pot
+            - min_raise: smallest legal raise
+            - stack: chips the bot has behind
+            - num_opponents: players still in the hand besides the bot
+        """
+        if not board:
+            return self._decide_preflop(hole, to_call, pot, min_raise, stack, num_opponents)
+
+        hand_equity = self.hand_equity(hole, board, num_opponents)
+        can_raise = stack > to_call + min_raise
+        if hand_equity >= RAISE_EQUITY and can_raise:
+            return Decision(RAISE, min(max(min_raise, pot // 2), stack - to_call))
+        return self._call_or_fold(hand_equity, to_call, pot, stack)
+
+    def _decide_preflop(self, hole, to_call, pot, min_raise, stack, num_opponents) -> Decision:
+        raise_range, play_range = opening_ranges()
+        hand = preflop.hand_class(*hole)
+        if raise_range[hand] and stack > to_call + min_raise:
+            return Decision(RAISE, min(3 * min_raise, stack - to_call))
+        if play_range[hand]:
+            return Decision(CALL if to_call else CHECK)
+        return self._call_or_fold(self.hand_equity(hole, (), num_opponents), to_call, pot, stack)
+
+    def _call_or_fold(self, hand_equity: float, to_call: int, pot: int, stack: int) -> Decision:
+        if to_call <= 0:
+            return Decision(CHECK)
+        if hand_equity >= pot_odds(to_call, pot) + CALL_MARGIN and stack > 0:
+            return Decision(CALL)
+        return Decision(FOLD)
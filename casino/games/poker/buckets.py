@@ -0,0 +1,397 @@
+"""
+Hand-strength buckets for postflop decisions.
+
+A hand's strength (HS) on a complete board is the share of opposing hole
+cards it beats, counting ties as half. Before the river the strength is
+still to come, so a situation is described by the expected strength over
+every runout, E[HS], and its expected square, E[HS^2], which is higher for
+drawing hands whose strength swings with the runout. Situations with
+similar (E[HS], E[HS^2]) are grouped into NUM_BUCKETS buckets per street
+with k-means, numbered from weakest to strongest.
+
+Flops are the expensive street, so their buckets are precomputed with
+`python -m casino.games.poker.buckets`. Hole and flop cards are reduced to a
+canonical suit-isomorphic form: one of the 1755 distinct flops and one of
+the 1176 pairs of the 49 other cards. The bucket of every such situation
+is stored as one byte (about 2 MB), so a flop bucket is a single lookup.
+On the turn and river E[HS] and E[HS^2] are worked out exactly (about
+10 ms and 1 ms) and matched to the nearest precomputed bucket centroid.
+
+Cards are evaluator card ids (0-51).
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations, permutations
+from math import comb
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from . import evaluator
+
+NUM_BUCKETS = 50
+
+FLOP_BUCKETS_PATH = "./casino/assets/poker/flop_buckets.u8"
+CENTROIDS_PATH = "./casino/assets/poker/bucket_centroids.f32"
+
+# Rows of the centroid table
+FLOP, TURN, RIVER = 0, 1, 2
+
+NUM_FLOPS = 1755
+HOLES_PER_FLOP = comb(49, 2)
+
+# Opponent hands left once the board and both hole cards are known
+OPPONENTS = comb(45, 2)
+
+# Turn and river situations sampled per flop for their k-means
+GENERATOR_SAMPLES = 200
+KMEANS_ITERATIONS = 50
+
+# Boards evaluated at once when generating a flop
+BOARD_CHUNK = 48
+
+SUIT_PERMUTATIONS = np.array(list(permutations(range(evaluator.NUM_SUITS))), dtype=np.int64)
+
+# Sorts above every real strength, so masked hands are never beaten or tied
+MASKED = np.int32(1 << 20)
+
+
+def _pair_index(low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """Index of the pair of positions `low < high` among all such pairs."""
+    return high * (high - 1) // 2 + low
+
+
+def _flop_index(cards: np.ndarray) -> np.ndarray:
+    """Colex index (0-22099) of each row of three sorted card ids."""
+    return cards[..., 0] + cards[..., 1] * (cards[..., 1] - 1) // 2 + \
+        cards[..., 2] * (cards[..., 2] - 1) * (cards[..., 2] - 2) // 6
+
+
+@lru_cache(maxsize=None)
+def _flop_classes() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Canonical form of every flop.
+
+    Of the 24 ways to relabel the suits, the canonical form of a flop is the
+    one whose sorted card ids come first. Returns, indexed by the colex
+    index of a flop, its canonical class and which of the suit permutations
+    map it there; then the cards of each class and how many flops it
+    stands for.
+    """
+    flops = np.array(list(combinations(range(52), 3)), dtype=np.int64)
+    flops = flops[np.argsort(_flop_index(flops))]
+    ranks, suits = flops >> 2, flops & 3
+
+    relabelled = np.sort(ranks[None] * 4 + SUIT_PERMUTATIONS[:, suits], axis=2)
+    keys = (relabelled[..., 0] * 52 + relabelled[..., 1]) * 52 + relabelled[..., 2]
+    lowest = keys.min(axis=0)
+    canonical_keys, classes, counts = np.unique(lowest, return_inverse=True, return_counts=True)
+    canonical = np.stack([canonical_keys // 2704, canonical_keys // 52 % 52, canonical_keys % 52], axis=1)
+    return classes, (keys == lowest).T, canonical, counts
+
+
+def situation_index(hole: Sequence[int], flop: Sequence[int]) -> int:
+    """
+    Index of a flop situation in the flop bucket table.
+
+    Situations that differ only by a relabelling of the suits, or by the
+    order of the cards, share an index. When several relabellings give the
+    canonical flop, the one giving the lowest hole index is used.
+    """
+    classes, canonical_permutations, canonical, _ = _flop_classes()
+    colex = int(_flop_index(np.sort(np.array(flop, dtype=np.int64))))
+    flop_class = int(classes[colex])
+    board = canonical[flop_class].tolist()
+
+    hole_indices = []
+    for permutation in SUIT_PERMUTATIONS[canonical_permutations[colex]].tolist():
+        # Position of each relabelled hole card among the 49 cards off the flop
+        relabelled = sorted((card >> 2) * 4 + permutation[card & 3] for card in hole)
+        low, high = (card - sum(dealt < card for dealt in board) for card in relabelled)
+        hole_indices.append(high * (high - 1) // 2 + low)
+    return flop_class * HOLES_PER_FLOP + min(hole_indices)
+
+
+@lru_cache(maxsize=None)
+def _all_holes() -> np.ndarray:
+    """All 1326 pairs of cards."""
+    return np.array(list(combinations(range(52), 2)), dtype=np.int64)
+
+
+def hand_strength(hole: Sequence[int], board: Sequence[int]) -> tuple[float, float]:
+    """
+    `(E[HS], E[HS^2])` of hole cards on a flop, turn or river, exactly.
+
+    E[HS] is also the equity against a random hand. Each runout evaluates
+    every opposing hand at once: about 1 ms on the river, 10 ms on the
+    turn and 80 ms on the flop.
+    """
+    dead = set(hole) | set(board)
+    live = [card for card in range(52) if card not in dead]
+    missing = 5 - len(board)
+    runouts = list(combinations(live, missing))
+    runouts = np.array(runouts, dtype=np.int64).reshape(len(runouts), missing)
+    boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (len(runouts), len(board))), runouts])
+
+    holes = _all_holes()
+    strengths = evaluator.evaluate_boards(boards, holes)
+    hero = evaluator.evaluate_boards(boards, np.array([hole], dtype=np.int64))
+
+    # Opponents can't hold the hero's cards or any card on the board
+    board_masks = np.left_shift(np.int64(1), boards).sum(axis=1)
+    hole_masks = np.left_shift(np.int64(1), holes).sum(axis=1)
+    hero_mask = sum(1 << card for card in hole)
+    live_opponents = ((board_masks[:, None] | hero_mask) & hole_masks[None, :]) == 0
+
+    beaten = ((strengths < hero) & live_opponents).sum(axis=1)
+    tied = ((strengths == hero) & live_opponents).sum(axis=1)
+    strength = (beaten + tied / 2) / OPPONENTS
+    return float(strength.mean()), float((strength ** 2).mean())
+
+
+def _beaten(groups: np.ndarray, strengths: np.ndarray, group: np.ndarray) -> np.ndarray:
+    """
+    Hands beaten plus half the hands tied by each hand, within a group.
+
+    Arguments:
+        - groups: `(boards, groups, size)` strengths of the hands in each group
+        - strengths: `(boards, hands)` strengths of the hands to score
+        - group: the group each hand is scored against
+
+    Every group on every board is shifted past the one before it, so one
+    sort and two binary searches score all hands on all boards.
+    """
+    boards, num_groups, size = groups.shape
+    shift = 2 * np.int64(MASKED)
+    offsets = np.arange(boards * num_groups, dtype=np.int64).reshape(boards, num_groups) * shift
+    ordered = np.sort((groups + offsets[..., None]).ravel())
+    keys = strengths + offsets[:, group]
+    below = np.searchsorted(ordered, keys, "left")
+    at_or_below = np.searchsorted(ordered, keys, "right")
+    first = offsets[:, group] // shift * size
+    return (below + at_or_below - 2 * first) / 2
+
+
+def _flop_strengths(flop_class: int, samples: int, seed: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    E[HS] and E[HS^2] of every hole pair on one canonical flop.
+
+    Every turn and river pair is evaluated against all 1176 hole pairs at
+    once. A hand's strength counts the hands it beats among all of them,
+    then takes back the ones that share a card with it; hole pairs that
+    overlap the turn or river are masked out.
+
+    Returns the flop E[HS] and E[HS^2] by hole pair index, and `samples`
+    random turn and river situations as `(E[HS], E[HS^2])` rows.
+    """
+    _, _, canonical, _ = _flop_classes()
+    flop = canonical[flop_class]
+    live = np.array([card for card in range(52) if card not in flop], dtype=np.int64)
+    pairs = np.array(list(combinations(range(len(live)), 2)), dtype=np.int64)
+    pairs = pairs[np.argsort(_pair_index(pairs[:, 0], pairs[:, 1]))]
+    holes = live[pairs]
+    pair_masks = np.left_shift(np.int64(1), pairs).sum(axis=1)
+
+    # The pairs holding each position, for taking back shared-card hands
+    holding = np.array([np.nonzero(pairs == position)[0] for position in range(len(live))])
+
+    # Every turn and river is one of the same pairs of live cards
+    boards = np.hstack([np.broadcast_to(flop, (len(pairs), 3)), holes])
+    total = np.zeros(len(pairs))
+    total_squares = np.zeros(len(pairs))
+    turn_total = np.zeros((len(live), len(pairs)))
+    turn_squares = np.zeros((len(live), len(pairs)))
+    river_points = []
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, len(pairs), BOARD_CHUNK):
+        chunk = slice(start, start + BOARD_CHUNK)
+        count = len(boards[chunk])
+        strengths = evaluator.evaluate_boards(boards[chunk], holes)
+        masked = (pair_masks[chunk, None] & pair_masks[None, :]) != 0
+        strengths = np.where(masked, MASKED, strengths)
+
+        # Beaten plus half of tied hands among all pairs, less the same
+        # among the pairs sharing each of the hand's cards
+        score = _beaten(strengths[:, None, :], strengths, np.zeros(len(pairs), dtype=np.int64))
+        grouped = strengths[:, holding]
+        for position in (pairs[:, 0], pairs[:, 1]):
+            score -= _beaten(grouped, strengths, position)
+        strength = np.where(masked, 0.0, (score + 0.5) / OPPONENTS)
+
+        total += strength.sum(axis=0)
+        total_squares += (strength ** 2).sum(axis=0)
+        # Either card of the board pair can be the turn
+        turns = np.zeros((count, len(live)))
+        turns[np.arange(count), pairs[chunk, 0]] = 1
+        turns[np.arange(count), pairs[chunk, 1]] = 1
+        turn_total += turns.T @ strength
+        turn_squares += turns.T @ strength ** 2
+
+        live_board, live_hole = np.nonzero(~masked)
+        picks = rng.integers(len(live_board), size=max(1, samples * count // len(pairs)))
+        river_points.append(strength[live_board[picks], live_hole[picks]])
+
+    runouts = comb(len(live) - 2, 2)
+    rivers = len(live) - 3
+    turn_masked = ((np.left_shift(np.int64(1), np.arange(len(live)))[:, None] & pair_masks[None, :]) != 0)
+    turn_cards, turn_holes = np.nonzero(~turn_masked)
+    picks = rng.integers(len(turn_cards), size=samples)
+    turn_points = np.stack([
+        turn_total[turn_cards[picks], turn_holes[picks]] / rivers,
+        turn_squares[turn_cards[picks], turn_holes[picks]] / rivers,
+    ], axis=1)
+    river = np.concatenate(river_points)
+    river_points = np.stack([river, river ** 2], axis=1)
+    return total / runouts, total_squares / runouts, turn_points, river_points
+
+
+def kmeans(points: np.ndarray, weights: np.ndarray, k: int = NUM_BUCKETS, iterations: int = KMEANS_ITERATIONS) -> np.ndarray:
+    """
+    Weighted k-means centroids of 2-D points, sorted by their first column.
+
+    Centroids start at evenly spaced weighted quantiles of the first
+    column, so the result does not depend on a seed.
+    """
+    order = np.argsort(points[:, 0], kind="stable")
+    cumulative = np.cumsum(weights[order]) / weights.sum()
+    starts = np.searchsorted(cumulative, (np.arange(k) + 0.5) / k)
+    centroids = points[order[np.minimum(starts, len(order) - 1)]].astype(np.float64)
+
+    for _ in range(iterations):
+        nearest = assign(points, centroids)
+        mass = np.bincount(nearest, weights=weights, minlength=k)
+        for column in range(points.shape[1]):
+            sums = np.bincount(nearest, weights=weights * points[:, column], minlength=k)
+            filled = mass > 0
+            centroids[filled, column] = sums[filled] / mass[filled]
+    return centroids[np.argsort(centroids[:, 0], kind="stable")]
+
+
+def assign(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest centroid of each point."""
+    nearest = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), 100_000):
+        block = points[start:start + 100_000]
+        distances = ((block[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        nearest[start:start + 100_000] = distances.argmin(axis=1)
+    return nearest
+
+
+def _warm_up() -> None:
+    _flop_classes()
+    evaluator.evaluate_batch(np.arange(7)[None, :])
+
+
+def build_tables(
+    samples: int = GENERATOR_SAMPLES,
+    seed: int = 0,
+    workers: int = 1,
+    progress: bool = False,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute every flop situation and cluster all three streets.
+
+    Returns the flop bucket of every situation index and a
+    `(3, NUM_BUCKETS, 2)` array of (E[HS], E[HS^2]) centroids for the flop,
+    turn and river.
+    """
+    _, _, _, counts = _flop_classes()
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(NUM_FLOPS)]
+    args = (range(NUM_FLOPS), [samples] * NUM_FLOPS, seeds)
+
+    flop_points = np.zeros((NUM_FLOPS, HOLES_PER_FLOP, 2))
+    turn_points, river_points = [], []
+    pool = ProcessPoolExecutor(workers, initializer=_warm_up) if workers > 1 else None
+    results = pool.map(_flop_strengths, *args) if pool else map(_flop_strengths, *args)
+    start = time.perf_counter()
+    for flop_class, (mean, squares, turns, rivers) in enumerate(results):
+        flop_points[flop_class, :, 0] = mean
+        flop_points[flop_class, :, 1] = squares
+        turn_points.append(turns)
+        river_points.append(rivers)
+        if progress and (flop_class + 1) % 25 == 0:
+            elapsed = time.perf_counter() - start
+            print(f"{flop_class + 1}/{NUM_FLOPS} flops done ({elapsed:.0f}s)")
+    if pool:
+        pool.shutdown()
+
+    # Each canonical flop stands for `counts` flops; turn and river samples
+    # are spread evenly over the flops they were drawn from
+    flop_points = flop_points.reshape(-1, 2)
+    flop_weights = np.repeat(counts.astype(np.float64), HOLES_PER_FLOP)
+    centroids = np.zeros((3, NUM_BUCKETS, 2))
+    centroids[FLOP] = kmeans(flop_points, flop_weights)
+    for street, points in ((TURN, turn_points), (RIVER, river_points)):
+        weights = np.concatenate([np.full(len(p), count / len(p)) for p, count in zip(points, counts)])
+        centroids[street] = kmeans(np.concatenate(points), weights)
+    return assign(flop_points, centroids[FLOP]).astype(np.uint8), centroids
+
+
+def write_tables(
+    flop_buckets: np.ndarray,
+    centroids: np.ndarray,
+    buckets_path: str = FLOP_BUCKETS_PATH,
+    centroids_path: str = CENTROIDS_PATH,
+) -> None:
+    Path(buckets_path).parent.mkdir(parents=True, exist_ok=True)
+    flop_buckets.astype(np.uint8).tofile(buckets_path)
+    centroids.astype(np.float32).tofile(centroids_path)
+
+
+@lru_cache(maxsize=None)
+def flop_table(path: str = FLOP_BUCKETS_PATH) -> np.ndarray:
+    """The flop bucket of every situation index, memory-mapped on first use."""
+    size = NUM_FLOPS * HOLES_PER_FLOP
+    if Path(path).stat().st_size != size:
+        raise ValueError(
+            f"{path} should hold {size} flop buckets; rebuild it with `python -m casino.games.poker.buckets`"
+        )
+    return np.memmap(path, dtype=np.uint8, mode="r", shape=(size,))
+
+
+@lru_cache(maxsize=None)
+def centroids(path: str = CENTROIDS_PATH) -> np.ndarray:
+    """`(E[HS], E[HS^2])` at the centre of each bucket, by street."""
+    return np.fromfile(path, dtype=np.float32).reshape(3, NUM_BUCKETS, 2).astype(np.float64)
+
+
+def bucket(hole: Sequence[int], board: Sequence[int]) -> int:
+    """Bucket (0 weakest) of hole cards on a flop, turn or river."""
+    if len(board) == 3:
+        return int(flop_table()[situation_index(hole, board)])
+    street = TURN if len(board) == 4 else RIVER
+    point = np.array([hand_strength(hole, board)])
+    return int(assign(point, centroids()[street])[0])
+
+
+def bucket_strength(hole: Sequence[int], board: Sequence[int]) -> float:
+    """E[HS] at the centre of the bucket of hole cards on a board."""
+    street = {3: FLOP, 4: TURN, 5: RIVER}[len(board)]
+    return float(centroids()[street, bucket(hole, board), 0])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m casino.games.poker.buckets",
+        description="Generate the flop bucket table and bucket centroids.",
+    )
+    parser.add_argument("--samples", type=int, default=GENERATOR_SAMPLES,
+                        help="turn and river situations sampled per flop")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--buckets-output", default=FLOP_BUCKETS_PATH)
+    parser.add_argument("--centroids-output", default=CENTROIDS_PATH)
+    args = parser.parse_args(argv)
+
+    flop_buckets, centroids_ = build_tables(args.samples, args.seed, args.workers, progress=True)
+    write_tables(flop_buckets, centroids_, args.buckets_output, args.centroids_output)
+    print(f"Wrote {args.buckets_output} and {args.centroids_output}")
+
+
+if __name__ == "__main__":
+    main()
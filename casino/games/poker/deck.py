@@ -0,0 +1,76 @@
+"""
+Integer deck for poker hands.
+
+A `PokerDeck` is a fixed list of the 52 evaluator card ids and a cursor.
+Dealing moves the cursor; starting a new hand shuffles the same list in
+place and rewinds the cursor, so no cards or decks are created per hand.
+The `StandardCard` objects used for drawing the table are built once and
+looked up by id.
+"""
+
+import random
+from functools import lru_cache
+from typing import Optional
+
+from casino.cards import StandardCard, StandardDeck
+
+from .evaluator import NUM_SUITS
+
+
+@lru_cache(maxsize=None)
+def card_objects() -> tuple[StandardCard, ...]:
+    """One face-up `StandardCard` per card id."""
+    cards = []
+    for card in range(52):
+        rank = StandardDeck.RANKS[card // NUM_SUITS]
+        suit = StandardDeck.SUITS[card % NUM_SUITS]
+        standard_card = StandardCard(rank, suit)
+        standard_card.hidden = False
+        cards.append(standard_card)
+    return tuple(cards)
+
+
+def card_object(card: int) -> StandardCard:
+    return card_objects()[card]
+
+
+class PokerDeck:
+    """
+    A 52 card deck that is reshuffled in place for every hand.
+
+    Arguments:
+        - rng: source of randomness; pass a seeded `random.Random` for
+            reproducible deals
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self.rng = rng or random.Random()
+        self.cards = list(range(52))
+        self.cursor = 0
+        self.shuffle()
+
+    def __len__(self) -> int:
+        """Cards left to deal."""
+        return 52 - self.cursor
+
+    def shuffle(self) -> None:
+        """Return every card to the deck and shuffle it for a new hand."""
+        self.rng.shuffle(self.cards)
+        self.cursor = 0
+
+    def draw(self) -> int:
+        if self.cursor >= 52:
+            raise IndexError("No cards left in the deck")
+        card = self.cards[self.cursor]
+        self.cursor += 1
+        return card
+
+    def burn(self) -> None:
+        self.draw()
+
+    def deal(self, count: int) -> list[int]:
+        if self.cursor + count > 52:
+            raise IndexError("No cards left in the deck")
+        cards = self.cards[self.cursor:self.cursor + count]
+        self.cursor += count
+        return cards
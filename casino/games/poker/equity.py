@@ -0,0 +1,292 @@
+"""
+Heads-up equity calculator.
+
+Works out how often a pair of hole cards wins, ties or loses against either
+a random opponent hand or a known one, given the cards already on the board.
+
+When few unknown cards remain (the turn and river, or a known opponent on
+the flop) every possible runout is enumerated and the answer is exact.
+Otherwise hands are sampled from a seeded generator in batches until the
+standard error of the equity drops below a tolerance. Sampling can be
+spread over a process pool; every batch gets its own child seed, so a
+given seed and worker count always produce the same answer.
+
+Cards are evaluator card ids (0-51).
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import combinations
+from math import comb
+from typing import Optional, Sequence
+
+import numpy as np
+
+from . import evaluator
+
+# Enumerate exactly when there are at most this many runouts to evaluate
+EXACT_LIMIT = 60_000
+
+# Monte Carlo hands dealt per batch, per worker
+BATCH_SIZE = 5_000
+
+# Stop sampling once the standard error of the equity is below TOLERANCE,
+# but never before MIN_SAMPLES hands and never after MAX_SAMPLES
+TOLERANCE = 0.005
+MIN_SAMPLES = 5_000
+MAX_SAMPLES = 200_000
+
+
+@dataclass(frozen=True)
+class EquityResult:
+    """
+    Outcome frequencies for the hero's hand.
+
+    Attributes:
+        win / tie / lose: fraction of runouts with that result
+        samples: number of runouts evaluated
+        exact: True when every runout was enumerated
+    """
+    win: float
+    tie: float
+    lose: float
+    samples: int
+    exact: bool
+
+    @property
+    def equity(self) -> float:
+        """Share of the pot won on average, counting ties as half."""
+        return self.win + self.tie / 2
+
+
+def _unseen(known: Sequence[int]) -> np.ndarray:
+    """Cards not among `known`, in id order."""
+    seen = set(known)
+    return np.array([card for card in range(52) if card not in seen], dtype=np.int64)
+
+
+def _card_masks(cards: np.ndarray) -> np.ndarray:
+    """64-bit mask of the cards in each row."""
+    return np.left_shift(np.int64(1), cards).sum(axis=1)
+
+
+def _with(fixed: Sequence[int], rows: np.ndarray) -> np.ndarray:
+    """Prepend the same fixed cards to every row."""
+    return np.hstack([np.broadcast_to(np.array(fixed, dtype=np.int64), (len(rows), len(fixed))), rows])
+
+
+def _result(wins: int, ties: int, total: int, exact: bool) -> EquityResult:
+    return EquityResult(wins / total, ties / total, (total - wins - ties) / total, total, exact)
+
+
+def _standard_error(wins: int, ties: int, total: int) -> float:
+    """Standard error of the equity estimated from `total` samples."""
+    mean = (wins + ties / 2) / total
+    variance = (wins + ties / 4) / total - mean ** 2
+    return (max(variance, 0.0) / total) ** 0.5
+
+
+def num_runouts(
+    hole: Sequence[int],
+    board: Sequence[int],
+    opponent: Optional[Sequence[int]] = None,
+) -> int:
+    """Number of distinct (opponent hand, board completion) pairs left."""
+    unseen = 52 - len(hole) - len(board) - (len(opponent) if opponent else 0)
+    missing = 5 - len(board)
+    if opponent:
+        return comb(unseen, missing)
+    return comb(unseen, 2) * comb(unseen - 2, missing)
+
+
+def enumerate_equity(
+    hole: Sequence[int],
+    board: Sequence[int] = (),
+    opponent: Optional[Sequence[int]] = None,
+) -> EquityResult:
+    """Exact equity over every possible runout."""
+    deck = _unseen([*hole, *board, *(opponent or ())])
+    missing = 5 - len(board)
+    completions = list(combinations(deck.tolist(), missing))
+    runouts = np.array(completions, dtype=np.int64).reshape(len(completions), missing)
+
+    hero = evaluator.evaluate_batch(_with([*hole, *board], runouts))
+    if opponent:
+        villain = evaluator.evaluate_batch(_with([*opponent, *board], runouts))
+    else:
+        # Every opponent hand with every runout that does not reuse its cards
+        hands = np.array(list(combinations(deck.tolist(), 2)), dtype=np.int64)
+        overlap = _card_masks(runouts)[:, None] & _card_masks(hands)[None, :]
+        runout_idx, hand_idx = np.nonzero(overlap == 0)
+        villain = evaluator.evaluate_batch(
+            np.hstack([hands[hand_idx], _with(board, runouts[runout_idx])]))
+        hero = hero[runout_idx]
+
+    wins = int((hero > villain).sum())
+    ties = int((hero == villain).sum())
+    return _result(wins, ties, len(hero), exact=True)
+
+
+def sample_batch(
+    hole: Sequence[int],
+    board: Sequence[int],
+    opponent: Optional[Sequence[int]],
+    samples: int,
+    seed: np.random.SeedSequence,
+) -> tuple[int, int, int]:
+    """
+    Deal `samples` random runouts and count them.
+
+    Returns `(wins, ties, samples)`.
+    """
+    rng = np.random.default_rng(seed)
+    deck = _unseen([*hole, *board, *(opponent or ())])
+    missing = 5 - len(board)
+    needed = missing + (0 if opponent else 2)
+
+    dealt = rng.permuted(np.tile(deck, (samples, 1)), axis=1)[:, :needed]
+    runouts = dealt[:, :missing]
+    hero = evaluator.evaluate_batch(_with([*hole, *board], runouts))
+    if opponent:
+        villain = evaluator.evaluate_batch(_with([*opponent, *board], runouts))
+    else:
+        villain = evaluator.evaluate_batch(np.hstack([dealt[:, missing:], _with(board, runouts)]))
+    return int((hero > villain).sum()), int((hero == villain).sum()), samples
+
+
+def _warm_up() -> None:
+    """Build the evaluator tables once in each worker process."""
+    evaluator.evaluate_batch(np.arange(7)[None, :])
+
+
+class EquityCalculator:
+    """
+    Equity queries, optionally spread over a pool of worker processes.
+
+    With `workers=1` everything runs in the calling process, which is the
+    fastest choice for single interactive queries. More workers pay off for
+    tight tolerances and batch jobs. Close the calculator (or use it as a
+    context manager) to shut its pool down.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        tolerance: float = TOLERANCE,
+        max_samples: int = MAX_SAMPLES,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        self.workers = workers
+        self.tolerance = tolerance
+        self.max_samples = max_samples
+        self.batch_size = batch_size
+        self.pool = None
+        if workers > 1:
+            self.pool = ProcessPoolExecutor(workers, initializer=_warm_up)
+
+    def __enter__(self) -> "EquityCalculator":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def equity(
+        self,
+        hole: Sequence[int],
+        board: Sequence[int] = (),
+        opponent: Optional[Sequence[int]] = None,
+        seed: Optional[int] = None,
+    ) -> EquityResult:
+        """
+        Win/tie/lose frequencies of `hole` against `opponent`.
+
+        Arguments:
+            - hole: the hero's two hole cards
+            - board: 0, 3, 4 or 5 community cards
+            - opponent: the opponent's hole cards, or None for a random hand
+            - seed: seed for Monte Carlo sampling; None for a fresh one
+        """
+        if num_runouts(hole, board, opponent) <= EXACT_LIMIT:
+            return enumerate_equity(hole, board, opponent)
+        return self.monte_carlo(hole, board, opponent, seed)
+
+    def monte_carlo(
+        self,
+        hole: Sequence[int],
+        board: Sequence[int] = (),
+        opponent: Optional[Sequence[int]] = None,
+        seed: Optional[int] = None,
+    ) -> EquityResult:
+        """Sample runouts until the equity is within `tolerance`."""
+        root = np.random.SeedSequence(seed)
+        wins = ties = total = 0
+        while total < self.max_samples:
+            seeds = root.spawn(self.workers)
+            args = [(hole, board, opponent, self.batch_size, child) for child in seeds]
+            if self.pool is None:
+                batches = [sample_batch(*arg) for arg in args]
+            else:
+                batches = self.pool.map(sample_batch, *zip(*args))
+            for batch_wins, batch_ties, batch_total in batches:
+                wins += batch_wins
+                ties += batch_ties
+                total += batch_total
+
+            if total >= MIN_SAMPLES and _standard_error(wins, ties, total) < self.tolerance:
+                break
+        return _result(wins, ties, total, exact=False)
+
+
+def anytime_equity(
+    hole: Sequence[int],
+    board: Sequence[int] = (),
+    opponent: Optional[Sequence[int]] = None,
+    budget_ms: float = 50.0,
+    seed: Optional[int] = None,
+    batch_size: int = 500,
+) -> EquityResult:
+    """
+    Best equity estimate available within a time budget.
+
+    Small enumerations (at most EXACT_LIMIT runouts, a few tens of ms) are
+    always done exactly. Otherwise small batches are sampled until the
+    budget runs out or the estimate is within TOLERANCE; at least one batch
+    is always sampled.
+    """
+    if num_runouts(hole, board, opponent) <= EXACT_LIMIT:
+        return enumerate_equity(hole, board, opponent)
+
+    deadline = time.perf_counter() + budget_ms / 1000
+    root = np.random.SeedSequence(seed)
+    wins = ties = total = 0
+    while True:
+        batch_wins, batch_ties, batch_total = sample_batch(
+            hole, board, opponent, batch_size, root.spawn(1)[0])
+        wins += batch_wins
+        ties += batch_ties
+        total += batch_total
+
+        if total >= MIN_SAMPLES and _standard_error(wins, ties, total) < TOLERANCE:
+            break
+        if time.perf_counter() >= deadline:
+            break
+    return _result(wins, ties, total, exact=False)
+
+
+_default_calculator = EquityCalculator()
+
+
+def equity(
+    hole: Sequence[int],
+    board: Sequence[int] = (),
+    opponent: Optional[Sequence[int]] = None,
+    seed: Optional[int] = None,
+) -> EquityResult:
+    """`EquityCalculator.equity` on a shared in-process calculator."""
+    return _default_calculator.equity(hole, board, opponent, seed)
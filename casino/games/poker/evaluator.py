@@ -0,0 +1,389 @@
+"""
+Lookup table poker hand evaluator.
+
+Cards are integers 0-51: `card = rank * 4 + suit`, where rank 0 is a deuce
+and rank 12 is an ace. `evaluate` takes 5 to 7 cards and returns the
+strength of the best five card hand they contain. Strengths run from 1
+(seven high) to 7462 (royal flush); every distinct five card hand, kickers
+included, has its own strength, so hands compare with plain `<` and `==`.
+Fewer than five cards get the strength of the weakest complete hand with
+the same made hand and top cards, so partial hands use the same scale.
+
+Two tables do all the work:
+
+- A flush table indexed by the 13-bit rank mask of a single suit. At most
+  one suit can hold five of seven cards, so checking the four suit masks
+  finds any flush or straight flush.
+- A rank table keyed by the base-5 encoding of how many cards of each rank
+  are held. It gives the best non-flush hand for every possible multiset
+  of up to 7 ranks.
+
+`HandState` keeps those keys up to date as cards are dealt one at a time,
+so the strength and draws of a hand are known at every street without
+rescanning its cards.
+
+The tables are built the first time they are needed, which takes a fraction
+of a second. After that a scalar evaluation is a handful of integer
+operations and a batch evaluation is a few NumPy array passes.
+"""
+
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+from casino.cards import StandardCard, StandardDeck
+
+NUM_RANKS = 13
+NUM_SUITS = 4
+
+RANK_INDEX = {rank: i for i, rank in enumerate(StandardDeck.RANKS)}
+SUIT_INDEX = {suit: i for i, suit in enumerate(StandardDeck.SUITS)}
+
+# Hand categories, matching the scores `poker.hand_score` used to return
+HIGH_CARD       = 1
+ONE_PAIR        = 2
+TWO_PAIR        = 3
+THREE_OF_A_KIND = 4
+STRAIGHT        = 5
+FLUSH           = 6
+FULL_HOUSE      = 7
+FOUR_OF_A_KIND  = 8
+STRAIGHT_FLUSH  = 9
+
+CATEGORY_NAMES = {
+    STRAIGHT_FLUSH: "Straight Flush",
+    FOUR_OF_A_KIND: "Four of a Kind",
+    FULL_HOUSE: "Full House",
+    FLUSH: "Flush",
+    STRAIGHT: "Straight",
+    THREE_OF_A_KIND: "Three of a Kind",
+    TWO_PAIR: "Two Pair",
+    ONE_PAIR: "One Pair",
+    HIGH_CARD: "High Card",
+}
+
+# Per-card contributions to the rank table key and to a suit's rank mask
+QUINARY = [5 ** (card // NUM_SUITS) for card in range(52)]
+RANK_BITS = [1 << (card // NUM_SUITS) for card in range(52)]
+
+_WHEEL = 0b1000000001111  # A 2 3 4 5
+
+
+def card_id(card: StandardCard) -> int:
+    """Integer id of a `StandardCard`."""
+    return RANK_INDEX[card.rank] * NUM_SUITS + SUIT_INDEX[card.suit]
+
+
+def card_ids(cards: Sequence[StandardCard]) -> list[int]:
+    return [card_id(card) for card in cards]
+
+
+def _straight_high(bits: int) -> int:
+    """Rank of the top card of the best straight in a rank mask, or -1."""
+    for high in range(NUM_RANKS - 1, 3, -1):
+        run = 0b11111 << (high - 4)
+        if bits & run == run:
+            return high
+    if bits & _WHEEL == _WHEEL:
+        return 3
+    return -1
+
+
+def _flush_hand(bits: int) -> tuple:
+    """Best hand from the ranks of five or more suited cards."""
+    high = _straight_high(bits)
+    if high >= 0:
+        return (STRAIGHT_FLUSH, high)
+    ranks = [rank for rank in range(NUM_RANKS - 1, -1, -1) if bits >> rank & 1]
+    return (FLUSH, *ranks[:5])
+
+
+def _rank_hand(counts: Sequence[int]) -> tuple:
+    """Best non-flush hand from the number of cards held of each rank."""
+    ranks = [rank for rank in range(NUM_RANKS - 1, -1, -1) if counts[rank]]
+    quads = [rank for rank in ranks if counts[rank] == 4]
+    trips = [rank for rank in ranks if counts[rank] == 3]
+    pairs = [rank for rank in ranks if counts[rank] == 2]
+
+    if quads:
+        kickers = [rank for rank in ranks if rank != quads[0]]
+        return (FOUR_OF_A_KIND, quads[0], *kickers[:1])
+    if trips and len(trips) + len(pairs) >= 2:
+        return (FULL_HOUSE, trips[0], max(trips[1:] + pairs))
+
+    bits = sum(1 << rank for rank in ranks)
+    high = _straight_high(bits)
+    if high >= 0:
+        return (STRAIGHT, high)
+
+    if trips:
+        kickers = [rank for rank in ranks if rank != trips[0]]
+        return (THREE_OF_A_KIND, trips[0], *kickers[:2])
+    if len(pairs) >= 2:
+        kickers = [rank for rank in ranks if rank not in pairs[:2]]
+        return (TWO_PAIR, pairs[0], pairs[1], *kickers[:1])
+    if pairs:
+        kickers = [rank for rank in ranks if rank != pairs[0]]
+        return (ONE_PAIR, pairs[0], *kickers[:3])
+    return (HIGH_CARD, *ranks[:5])
+
+
+def _rank_multisets(size: int, rank: int = 0):
+    """Every way to hold `size` cards over ranks `rank..12`, at most 4 each."""
+    if rank == NUM_RANKS:
+        if size == 0:
+            yield [0] * NUM_RANKS
+        return
+    for count in range(min(size, 4) + 1):
+        for counts in _rank_multisets(size - count, rank + 1):
+            counts[rank] = count
+            yield counts
+
+
+@lru_cache(maxsize=None)
+def _tables() -> tuple[list[int], dict[int, int], list[int]]:
+    """
+    Build the lookup tables.
+
+    Returns `(flush_table, rank_table, category_floors)`. `flush_table` is
+    indexed by a suit's rank mask (0 when the suit has no flush),
+    `rank_table` maps base-5 rank count keys to strengths and
+    `category_floors[c]` is the lowest strength in category `c`.
+    """
+    flush_hands = {}
+    for bits in range(1 << NUM_RANKS):
+        if bin(bits).count("1") >= 5:
+            flush_hands[bits] = _flush_hand(bits)
+
+    rank_hands = {}
+    complete = set(flush_hands.values())
+    for size in range(8):
+        for counts in _rank_multisets(size):
+            key = sum(count * 5 ** rank for rank, count in enumerate(counts))
+            rank_hands[key] = _rank_hand(counts)
+            if size >= 5:
+                complete.add(rank_hands[key])
+
+    # Every distinct hand is the best hand of some five card holding, so
+    # sorting the complete hands found above gives the strength of each one.
+    # A partial hand sorts just below the complete hands it can grow into.
+    distinct = sorted(complete)
+    strength = {hand: i + 1 for i, hand in enumerate(distinct)}
+
+    flush_table = [0] * (1 << NUM_RANKS)
+    for bits, hand in flush_hands.items():
+        flush_table[bits] = strength[hand]
+    rank_table = {key: bisect_left(distinct, hand) + 1 for key, hand in rank_hands.items()}
+
+    category_floors = [0] * (STRAIGHT_FLUSH + 2)
+    for hand in reversed(distinct):
+        category_floors[hand[0]] = strength[hand]
+    category_floors[STRAIGHT_FLUSH + 1] = len(distinct) + 1
+    return flush_table, rank_table, category_floors
+
+
+@lru_cache(maxsize=None)
+def _array_tables() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """`_tables` as arrays for `evaluate_batch`: flush table, sorted keys, values."""
+    flush_table, rank_table, _ = _tables()
+    keys = np.array(sorted(rank_table), dtype=np.int64)
+    values = np.array([rank_table[key] for key in keys.tolist()], dtype=np.int32)
+    return np.array(flush_table, dtype=np.int32), keys, values
+
+
+def evaluate(cards: Sequence[int]) -> int:
+    """
+    Strength of the best five card hand in up to 7 cards.
+
+    Higher is better and equal strengths split the pot.
+    """
+    flush_table, rank_table, _ = _tables()
+    key = 0
+    suit_bits = [0, 0, 0, 0]
+    for card in cards:
+        key += QUINARY[card]
+        suit_bits[card & 3] |= RANK_BITS[card]
+    return max(
+        rank_table[key],
+        flush_table[suit_bits[0]],
+        flush_table[suit_bits[1]],
+        flush_table[suit_bits[2]],
+        flush_table[suit_bits[3]],
+    )
+
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    Evaluate many hands at once.
+
+    Arguments:
+        - cards: `(n, k)` integer array of card ids with k <= 7
+
+    Returns an `(n,)` array of strengths, equal to calling `evaluate` on
+    each row.
+    """
+    flush_table, keys, values = _array_tables()
+    quinary, suit_bits = _batch_parts(cards)
+    best = values[np.searchsorted(keys, quinary)]
+    for bits in suit_bits:
+        np.maximum(best, flush_table[bits], out=best)
+    return best
+
+
+def _batch_parts(cards: np.ndarray) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Rank table key and per-suit rank masks of each row of cards."""
+    cards = np.asarray(cards, dtype=np.int64)
+    ranks = cards >> 2
+    suits = cards & 3
+    rank_bits = np.left_shift(1, ranks)
+    quinary = np.power(5, ranks).sum(axis=1)
+    suit_bits = [np.where(suits == suit, rank_bits, 0).sum(axis=1) for suit in range(NUM_SUITS)]
+    return quinary, suit_bits
+
+
+def evaluate_boards(boards: np.ndarray, holes: np.ndarray) -> np.ndarray:
+    """
+    Evaluate every pair of hole cards with every board.
+
+    Arguments:
+        - boards: `(n, k)` integer array of board card ids
+        - holes: `(m, 2)` integer array of hole cards, k + 2 <= 7
+
+    Returns an `(n, m)` array of strengths. The board and hole parts of the
+    rank key and suit masks are worked out once each, so this is much
+    cheaper than `evaluate_batch` on every combination. Strengths of hole
+    cards that share a card with the board are meaningless; mask them out.
+    """
+    flush_table, keys, values = _array_tables()
+    board_key, board_bits = _batch_parts(boards)
+    hole_key, hole_bits = _batch_parts(holes)
+
+    index = np.searchsorted(keys, board_key[:, None] + hole_key[None, :])
+    best = values[np.minimum(index, len(keys) - 1)]
+    for suit in range(NUM_SUITS):
+        np.maximum(best, flush_table[board_bits[suit][:, None] | hole_bits[suit][None, :]], out=best)
+    return best
+
+
+def category(strength: int) -> int:
+    """Hand category (HIGH_CARD ... STRAIGHT_FLUSH) of a strength."""
+    floors = _tables()[2]
+    return bisect_right(floors, strength, lo=HIGH_CARD) - 1
+
+
+def category_floor(hand_category: int) -> int:
+    """Lowest strength in a hand category."""
+    return _tables()[2][hand_category]
+
+
+def hand_name(strength: int) -> str:
+    return CATEGORY_NAMES.get(category(strength), "Unknown Hand")
+
+
+@lru_cache(maxsize=None)
+def _straight_outs() -> list[int]:
+    """
+    For every 13-bit rank mask, a mask of the ranks that would complete a
+    straight. Empty for masks that already hold a straight.
+    """
+    windows = [0b11111 << (high - 4) for high in range(4, NUM_RANKS)] + [_WHEEL]
+    outs = [0] * (1 << NUM_RANKS)
+    for bits in range(1 << NUM_RANKS):
+        completing = 0
+        for window in windows:
+            missing = window & ~bits
+            if missing == 0:
+                completing = 0
+                break
+            if missing & (missing - 1) == 0:
+                completing |= missing
+        outs[bits] = completing
+    return outs
+
+
+class HandState:
+    """
+    A hand that is dealt one card at a time.
+
+    Each `add` updates the rank table key, per-suit rank masks and suit
+    counts, so the current strength and draws are table lookups no matter
+    how many cards have been dealt.
+    """
+
+    def __init__(self, cards: Sequence[int] = ()) -> None:
+        self.num_cards = 0
+        self.key = 0
+        self.rank_bits = 0
+        self.suit_bits = [0, 0, 0, 0]
+        self.suit_counts = [0, 0, 0, 0]
+        for card in cards:
+            self.add(card)
+
+    def add(self, card: int) -> None:
+        suit = card & 3
+        self.num_cards += 1
+        self.key += QUINARY[card]
+        self.rank_bits |= RANK_BITS[card]
+        self.suit_bits[suit] |= RANK_BITS[card]
+        self.suit_counts[suit] += 1
+
+    def copy(self) -> "HandState":
+        state = HandState()
+        state.num_cards = self.num_cards
+        state.key = self.key
+        state.rank_bits = self.rank_bits
+        state.suit_bits = self.suit_bits[:]
+        state.suit_counts = self.suit_counts[:]
+        return state
+
+    @property
+    def strength(self) -> int:
+        """Same as `evaluate` on every card added so far."""
+        flush_table, rank_table, _ = _tables()
+        bits = self.suit_bits
+        return max(
+            rank_table[self.key],
+            flush_table[bits[0]],
+            flush_table[bits[1]],
+            flush_table[bits[2]],
+            flush_table[bits[3]],
+        )
+
+    @property
+    def category(self) -> int:
+        return category(self.strength)
+
+    @property
+    def cards_to_come(self) -> bool:
+        return self.num_cards < 7
+
+    @property
+    def flush_draw(self) -> bool:
+        """Four cards of one suit with cards still to come."""
+        return self.cards_to_come and max(self.suit_counts) == 4
+
+    @property
+    def open_ended(self) -> bool:
+        """An eight-out straight draw (open-ended or double gutshot)."""
+        outs = _straight_outs()[self.rank_bits]
+        return self.cards_to_come and outs & (outs - 1) != 0
+
+    @property
+    def gutshot(self) -> bool:
+        """Exactly one rank completes a straight."""
+        outs = _straight_outs()[self.rank_bits]
+        return self.cards_to_come and outs != 0 and outs & (outs - 1) == 0
+
+    def describe(self) -> str:
+        """Hand name plus any draws, e.g. `One Pair, flush draw`."""
+        parts = [hand_name(self.strength)]
+        if self.category < FLUSH and self.flush_draw:
+            parts.append("flush draw")
+        if self.category < STRAIGHT:
+            if self.open_ended:
+                parts.append("open-ended straight draw")
+            elif self.gutshot:
+                parts.append("gutshot")
+        return ", ".join(parts)
@@ -0,0 +1,228 @@
+"""
+Poker hand histories.
+
+Every finished hand at a `Table` can be appended to a hand log: one
+fixed-size record per hand (seats, hole cards, board, chips in and out)
+in the log file itself, and one fixed-size record per action in a
+`.actions` file next to it. Hands point into the actions file with
+`first_action` and `num_actions`.
+
+Both files are raw NumPy structured arrays with no header, so they can
+only grow by appending and are read back in large chunks with no parsing.
+Queries such as `position_stats` run over whole columns at a time.
+
+Cards are evaluator card ids (0-51), NO_CARD where nothing was dealt.
+"""
+
+import os
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .table import (
+    CALL, CHECK, FLOP, FOLD, MAX_SEATS, PREFLOP, RAISE, RIVER, TURN, Table,
+)
+
+NO_CARD = 255
+
+STREETS = (PREFLOP, FLOP, TURN, RIVER)
+ACTIONS = (FOLD, CHECK, CALL, RAISE)
+
+# Seat flags
+DEALT         = 1
+FOLDED        = 2
+VPIP          = 4  # put chips in voluntarily preflop
+PREFLOP_RAISE = 8
+
+HAND_DTYPE = np.dtype([
+    ("num_seats", "u1"),
+    ("button", "u1"),
+    ("showdown", "u1"),
+    ("small_blind", "<u4"),
+    ("big_blind", "<u4"),
+    ("board", "u1", 5),
+    ("hole", "u1", (MAX_SEATS, 2)),
+    ("stack", "<u4", MAX_SEATS),      # chips at the start of the hand
+    ("committed", "<u4", MAX_SEATS),
+    ("won", "<u4", MAX_SEATS),
+    ("flags", "u1", MAX_SEATS),
+    ("pot", "<u4"),
+    ("first_action", "<u8"),
+    ("num_actions", "<u2"),
+])
+
+ACTION_DTYPE = np.dtype([
+    ("street", "u1"),
+    ("seat", "u1"),
+    ("action", "u1"),
+    ("amount", "<u4"),
+])
+
+# Hands written per flush, and read per chunk
+FLUSH_EVERY = 100
+CHUNK_HANDS = 1_000_000
+
+STREET_INDEX = {street: i for i, street in enumerate(STREETS)}
+ACTION_INDEX = {action: i for i, action in enumerate(ACTIONS)}
+
+
+def actions_path(path: str) -> str:
+    return path + ".actions"
+
+
+class HandHistoryWriter:
+    """
+    Appends finished hands to a hand log.
+
+    Hands are kept in memory and written every `flush_every` hands, on
+    `flush()` and on `close()`. Pass the writer to a `Table` as its
+    `history` to record every hand it plays.
+    """
+
+    def __init__(self, path: str, flush_every: int = FLUSH_EVERY) -> None:
+        self.path = path
+        self.flush_every = flush_every
+        self.hands: list[tuple] = []
+        self.actions: list[tuple] = []
+        try:
+            self.actions_written = os.path.getsize(actions_path(path)) // ACTION_DTYPE.itemsize
+        except FileNotFoundError:
+            self.actions_written = 0
+
+    def __enter__(self) -> "HandHistoryWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def record(self, table: Table) -> None:
+        """Add the hand that just finished at `table`."""
+        padding = MAX_SEATS - len(table.seats)
+        flags = [
+            DEALT * bool(seat.hole) | FOLDED * (seat.folded and bool(seat.hole))
+            for seat in table.seats
+        ]
+        for action in table.actions:
+            if action.street == PREFLOP and action.action in (CALL, RAISE):
+                flags[action.seat] |= VPIP
+                if action.action == RAISE:
+                    flags[action.seat] |= PREFLOP_RAISE
+
+        first_action = self.actions_written + len(self.actions)
+        for action in table.actions:
+            self.actions.append((
+                STREET_INDEX[action.street], action.seat,
+                ACTION_INDEX[action.action], action.amount,
+            ))
+        self.hands.append((
+            len(table.seats),
+            table.button,
+            table.showdown,
+            table.small_blind,
+            table.big_blind,
+            table.board + [NO_CARD] * (5 - len(table.board)),
+            [seat.hole or [NO_CARD, NO_CARD] for seat in table.seats] + [[NO_CARD, NO_CARD]] * padding,
+            [seat.stack - won + seat.committed for seat, won in zip(table.seats, table.winnings)] + [0] * padding,
+            [seat.committed for seat in table.seats] + [0] * padding,
+            table.winnings + [0] * padding,
+            flags + [0] * padding,
+            sum(table.winnings),
+            first_action,
+            len(table.actions),
+        ))
+        if len(self.hands) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        # Actions go first, so a hand on disk never points past the actions file
+        if self.actions:
+            with open(actions_path(self.path), "ab") as file:
+                file.write(np.array(self.actions, dtype=ACTION_DTYPE).tobytes())
+            self.actions_written += len(self.actions)
+            self.actions = []
+        if self.hands:
+            with open(self.path, "ab") as file:
+                file.write(np.array(self.hands, dtype=HAND_DTYPE).tobytes())
+            self.hands = []
+
+    def close(self) -> None:
+        self.flush()
+
+
+def _read_chunks(path: str, dtype: np.dtype, chunk: int) -> Iterator[np.ndarray]:
+    with open(path, "rb") as file:
+        while True:
+            records = np.fromfile(file, dtype=dtype, count=chunk)
+            if len(records) == 0:
+                return
+            yield records
+
+
+def read_hands(path: str, chunk: int = CHUNK_HANDS) -> Iterator[np.ndarray]:
+    """Stream a hand log as `HAND_DTYPE` arrays of up to `chunk` hands."""
+    return _read_chunks(path, HAND_DTYPE, chunk)
+
+
+def read_actions(path: str, chunk: int = CHUNK_HANDS) -> Iterator[np.ndarray]:
+    """Stream the actions of a hand log as `ACTION_DTYPE` arrays."""
+    return _read_chunks(actions_path(path), ACTION_DTYPE, chunk)
+
+
+def load_hands(path: str) -> np.ndarray:
+    """A whole hand log in one array."""
+    return np.fromfile(path, dtype=HAND_DTYPE)
+
+
+def hand_actions(path: str, hand: np.void) -> np.ndarray:
+    """The actions of one hand read from a hand log."""
+    offset = int(hand["first_action"]) * ACTION_DTYPE.itemsize
+    return np.fromfile(actions_path(path), dtype=ACTION_DTYPE, count=int(hand["num_actions"]), offset=offset)
+
+
+def position_stats(path: str, chunk: int = CHUNK_HANDS, num_seats: Optional[int] = None) -> dict[str, np.ndarray]:
+    """
+    VPIP, preflop raise rate and results by position over a hand log.
+
+    Positions count clockwise from the button: 0 is the button, 1 the seat
+    after it and so on. Only seats dealt into a hand count. Pass
+    `num_seats` to only count hands at tables of that size.
+
+    Returns arrays indexed by position:
+        - hands: hands dealt in
+        - vpip / pfr: share of those hands with a voluntary preflop call
+            or raise, and with a preflop raise
+        - won: share of hands that won chips
+        - bb_per_100: net big blinds won per 100 hands
+    """
+    hands = np.zeros(MAX_SEATS, dtype=np.int64)
+    vpip = np.zeros(MAX_SEATS, dtype=np.int64)
+    pfr = np.zeros(MAX_SEATS, dtype=np.int64)
+    won = np.zeros(MAX_SEATS, dtype=np.int64)
+    net_bb = np.zeros(MAX_SEATS)
+
+    seats = np.arange(MAX_SEATS)
+    for records in read_hands(path, chunk):
+        if num_seats is not None:
+            records = records[records["num_seats"] == num_seats]
+        table_size = records["num_seats"].astype(np.int64)[:, None]
+        position = (seats[None, :] - records["button"].astype(np.int64)[:, None]) % table_size
+        flags = records["flags"]
+        dealt = (flags & DEALT) != 0
+        position = position[dealt]
+        net = records["won"].astype(np.int64) - records["committed"]
+
+        hands += np.bincount(position, minlength=MAX_SEATS)
+        vpip += np.bincount(position, weights=(flags[dealt] & VPIP) != 0, minlength=MAX_SEATS).astype(np.int64)
+        pfr += np.bincount(position, weights=(flags[dealt] & PREFLOP_RAISE) != 0, minlength=MAX_SEATS).astype(np.int64)
+        won += np.bincount(position, weights=net[dealt] > 0, minlength=MAX_SEATS).astype(np.int64)
+        big_blinds = net / records["big_blind"].astype(np.float64)[:, None]
+        net_bb += np.bincount(position, weights=big_blinds[dealt], minlength=MAX_SEATS)
+
+    played = np.maximum(hands, 1)
+    return {
+        "hands": hands,
+        "vpip": vpip / played,
+        "pfr": pfr / played,
+        "won": won / played,
+        "bb_per_100": 100 * net_bb / played,
+    }
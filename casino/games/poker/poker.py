@@ -3,13 +3,18 @@ import os
 import shutil
 
 from casino.card_assets import assign_card_art
-from casino.cards import Deck, StandardDeck, StandardCard
+from casino.cards import StandardCard
 from casino.stats import GameStats, display_stats
 from casino.types import GameContext
 from casino.utils import clear_screen, cprint, cinput, display_topbar
 
-from itertools import combinations
-from collections import Counter
+from functools import lru_cache
+
+from . import equity, evaluator, preflop
+from .bot import Decision, PokerBot
+from .deck import card_object
+from .history import HandHistoryWriter
+from .table import CALL, CHECK, FOLD, RAISE, Action, Seat, Table
 
 
 POKER_HEADER = """
@@ -35,134 +40,63 @@ STAY_AT_TABLE_PROMPT   = "🤵: Would you like to stay at the table?"
 INVALID_CHOICE_MSG     = "🤵: That's not a choice in this game."
 NO_FUNDS_MSG           = "🤵: You don't have enough chips to play. Goodbye."
 
-FULL_DECK: StandardDeck = StandardDeck()
-
+SMALL_BLIND    = 10
+BIG_BLIND      = 20
+OPPONENT_CHIPS = 1000
 
-def deal_card(turn: list[StandardCard], deck: StandardDeck) -> None:
-    """Deal a card to the player."""
-    card = deck.draw()
-    turn.append(card)
+# Seats at the heads-up table
+PLAYER   = 0
+OPPONENT = 1
 
 def hand_score(hand: list[StandardCard], board: list[StandardCard]) -> int:
-    """Calculate the score of a poker hand."""
-
-    all_cards = hand + board
-
-    if len(all_cards) < 5:
-        return get_partial_hand_score(all_cards)
-
-
-    score=0
-    for five_cards in combinations(hand + board, 5):
-        current_score = evaluate_hand(list(five_cards))
-        if current_score > score:
-            score = current_score
-
-    return score
+    """
+    Calculate the strength of a poker hand.
 
-def evaluate_hand(cards: list[StandardCard]) -> int:
-    ranks = [get_card_value(card.rank) for card in cards]
-    suits = [card.suit for card in cards]
+    Strengths come from `evaluator.evaluate` and compare across every hand,
+    kickers included.
+    """
+    return evaluator.evaluate(evaluator.card_ids(hand + board))
 
-    rank_counts = Counter(ranks)
-    suit_counts = Counter(suits)
+@lru_cache(maxsize=64)
+def hud_equity(hole: tuple[int, ...], board: tuple[int, ...]) -> float:
+    """
+    Equity against a random hand, cached so redrawing the table is free.
 
-    is_flush = 5 in suit_counts.values()
-    is_straight = (len(rank_counts) == 5 and 
-                   (max(ranks) - min(ranks) == 4 or 
-                    set(ranks) == {14, 2, 3, 4, 5}))  # this is for the Ace-low straight (A, 2, 3, 4, 5)
-    
-    rank_counts = sorted(rank_counts.values(), reverse=True)
-
-    if is_straight and is_flush:
-        return 9  # Straight Flush
-    elif rank_counts == [4, 1]:
-        return 8  # Four of a Kind
-    elif rank_counts == [3, 2]:
-        return 7  # Full House
-    elif is_flush:
-        return 6  # Flush
-    elif is_straight:
-        return 5  # Straight
-    elif rank_counts == [3, 1, 1]:
-        return 4  # Three of a Kind
-    elif rank_counts == [2, 2, 1]:
-        return 3  # Two Pair
-    elif rank_counts == [2, 1, 1, 1]:
-        return 2  # One Pair
-    else:
-        return 1  # High Card
+    Preflop equities come straight from the precomputed table.
+    """
+    if not board:
+        return preflop.preflop_equity(hole)
+    return equity.equity(hole, board, seed=0).equity
 
-def get_partial_hand_score(hand: list[StandardCard]) -> int:
-    """Evaluate hands with less than 5 cards"""
-    if len(hand) < 2:
-        return 1  # High Card
-    
-    ranks = [card.rank for card in hand]
-    rank_counts = Counter(ranks)
-    count_values = sorted(rank_counts.values(), reverse=True)
-
-    if 4 in count_values:
-        return 8  # Four of a Kind
-    elif 3 in count_values:
-        return 4
-    elif count_values.count(2) == 2:
-        return 3  # Two Pair
-    elif 2 in count_values: 
-        return 2  # One Pair
-    else:
-        return 1  # High Card
-
-
-def get_card_value(rank: int | str) -> int:
-    """Get the value of a rank."""
-    if isinstance(rank, int):
-        return rank
-    if rank == "J":
-        return 11
-    if rank == "Q":
-        return 12
-    if rank == "K":
-        return 13
-    if rank == "A":
-        return 14
-    return int(rank)
-    
 def hand_name(score: int) -> str:
     """Get the name of a poker hand based on its score."""
-    names = {
-        9: "Straight Flush",
-        8: "Four of a Kind",
-        7: "Full House",
-        6: "Flush",
-        5: "Straight",
-        4: "Three of a Kind",
-        3: "Two Pair",
-        2: "One Pair",
-        1: "High Card"
-    }
-    return names.get(score, "Unknown Hand")
-
-def print_game(ctx, stage: str, player_hand: list[StandardCard], opponent_hand: list[StandardCard], board: list[StandardCard], pot: int, message: str = "") -> None:
+    return evaluator.hand_name(score)
+
+def print_game(ctx, table: Table, message: str = "") -> None:
+    player = table.seats[PLAYER]
+    opponent = table.seats[OPPONENT]
+    board = [card_object(card) for card in table.board]
     clear_screen()
     display_poker_topbar(ctx)
     if message:
         cprint(message + "\n")
-    cprint(f"=== {stage.upper()} ===\n")
+    cprint(f"=== {table.street} ===\n")
     cprint("Opponent hand:")
-    if stage != "SHOWDOWN":
-        print_hand(opponent_hand, hidden=True)
-    else:
-        print_hand(opponent_hand, hidden=False)
+    opponent_hand = [card_object(card) for card in opponent.hole]
+    print_hand(opponent_hand, hidden=not table.showdown)
+    cprint(f"Opponent chips: {opponent.stack}")
     cprint("Board:")
     if len(board) == 0:
         cprint("No cards on the board yet.")
     else:
         print_hand(board)
     cprint("Your hand:")
-    print_hand(player_hand)
-    cprint(f"Your current hand type: {hand_name(hand_score(player_hand,board))}")
-    cprint(f"Pot: {pot} chips")
+    print_hand([card_object(card) for card in player.hole])
+    cprint(f"Your current hand type: {player.state.describe()}")
+    if not table.hand_over:
+        odds = hud_equity(tuple(player.hole), tuple(table.board))
+        cprint(f"Your odds vs. a random hand: {odds:.1%}")
+    cprint(f"Pot: {table.total_pot} chips")
     cprint(f"Your balance: {ctx.account.balance} chips\n")
 
 def print_opponent_cards(opponent_hand: list[StandardCard]) -> None:
@@ -219,278 +153,147 @@ def get_and_validate_raise_amount(min_raise, account_balance, current_bet: int =
         raise_amount_int = int(raise_amount)
         if raise_amount_int <= 0:
             return None, "🤵: Raise must be positive number"
-        if raise_amount_int < min_raise:
-            return None, f"🤵: Raise must be at least {min_raise}"
         required = current_bet + raise_amount_int
         if account_balance < required:
             return None, "🤵: You don't have enough chips to raise that much."
+        # Going all in is allowed for less than the minimum
+        if raise_amount_int < min_raise and required < account_balance:
+            return None, f"🤵: Raise must be at least {min_raise}"
         return raise_amount_int, ""
     except ValueError:
         return None,  "🤵: Raise amount must be number"
 
+def settle(account, seat: Seat) -> None:
+    """Bring the account balance in line with the player's chips at the table."""
+    difference = seat.stack - account.balance
+    if difference > 0:
+        account.deposit(difference)
+    elif difference < 0:
+        account.withdraw(-difference)
+
+def describe_action(action: Action) -> str:
+    if action.action == RAISE:
+        return f"🤖: Opponent raises, putting in {action.amount}."
+    if action.action == CALL:
+        return f"🤖: Opponent calls {action.amount}."
+    return f"🤖: Opponent {action.action}s."
+
+def bot_decision(bot: PokerBot, table: Table) -> Decision:
+    seat = table.seats[table.to_act]
+    return bot.decide(
+        seat.hole, table.board, table.to_call(), table.total_pot,
+        table.min_raise, seat.stack, len(table.players_in_hand()) - 1,
+    )
+
 def play_poker(ctx: GameContext) -> None:
     """Play a poker game."""
     account = ctx.account
-    min_raise = ctx.config.poker_min_raise
-    if account.balance < 20:
+    if account.balance < BIG_BLIND:
         clear_screen()
         display_poker_topbar(ctx)
         cprint(NO_FUNDS_MSG)
         cinput("Press enter to continue.")
         return
+    history_path = ctx.config.poker_history_path
+    history = HandHistoryWriter(history_path) if history_path else None
+    table = Table(
+        [account.balance, OPPONENT_CHIPS], SMALL_BLIND, BIG_BLIND,
+        min_raise=ctx.config.poker_min_raise, history=history,
+    )
+    bot = PokerBot(ctx.config.poker_bot_think_ms, buckets=ctx.config.poker_bot_buckets)
+    try:
+        play_hands(ctx, table, bot)
+    finally:
+        if history is not None:
+            history.close()
+
+def play_hands(ctx: GameContext, table: Table, bot: PokerBot) -> None:
+    """Play hands against the bot until the player leaves."""
+    account = ctx.account
     continue_game = True
     stubborn = 0 # gets to 7 and you're out
     stats = GameStats("Poker", account.balance)
+    player = table.seats[PLAYER]
 
     while continue_game:
-        clear_screen()
-        display_poker_topbar(ctx)
-        
-        player_status = True
-        opponent_status = True
-        player_chips = 1000
-        opponent_chips = 1000
-        pot = 10 # small blind 
-        current_bet = 20 #  + big blind (10 + 20)
-        player_folded = False
-
-        deck = FULL_DECK
-
-        player_hand = []
-        opponent_hand = []
-        board = []
-
-        #first deal of the game
-        for _ in range(2):
-            deal_card(player_hand, deck)
-            deal_card(opponent_hand, deck)
-
-        while player_status and opponent_status:
-            print_game(ctx, "PRE-FLOP", player_hand, opponent_hand, board, pot)
-
-            action = cinput(f"[F]old   [C]all {current_bet}   [R]aise\n")
-            raise_amount = 0
-
-            #get a proper action from the player
-            while action not in "FfCcRr" or action == "" or (action.lower() == "r") or (action.lower() == "c" and account.balance < current_bet):
-                stubborn += 1
-                if stubborn >= 7:
-                    clear_screen()
-                    cprint(SECURITY_MSG)
-                    cprint("You have been banned from the casino for being too stubborn.")
-                    return
-
-                if (action.lower() == "r"):
-                    raise_amount, validation_msg = get_and_validate_raise_amount(min_raise, account.balance, current_bet)
-                    if validation_msg:
-                        print_game(ctx, "PRE-FLOP", player_hand, opponent_hand, board, pot, validation_msg)
-                    else:
+        player.stack = account.balance
+        # The opponent rebuys for every hand
+        table.seats[OPPONENT].stack = OPPONENT_CHIPS
+        table.start_hand()
+        settle(account, player)
+        message = ""
+
+        while not table.hand_over:
+            if table.to_act == OPPONENT:
+                decision = bot_decision(bot, table)
+                table.act(decision.action, decision.amount)
+                message = describe_action(table.actions[-1])
+                continue
+
+            to_call = table.to_call()
+            prompt = f"[F]old   [C]all {to_call}   [R]aise\n" if to_call else "[F]old   [C]heck   [R]aise\n"
+            print_game(ctx, table, message)
+            action = cinput(prompt).lower()
+
+            # get a proper action from the player
+            while True:
+                if action == "f":
+                    table.act(FOLD)
+                    break
+                if action == "c":
+                    table.act(CALL if to_call else CHECK)
+                    break
+                if action == "r":
+                    raise_amount, message = get_and_validate_raise_amount(table.min_raise, player.stack, to_call)
+                    if not message:
+                        table.act(RAISE, raise_amount)
                         break
+                else:
+                    message = INVALID_CHOICE_MSG + "\n"
 
-                if (action.lower() == "c" and account.balance < current_bet):
-                    print_game(ctx, "PRE-FLOP", player_hand, opponent_hand, board, pot, f"🤵: You don't have enough chips to call {current_bet}.")
-                if action not in "FfCcRr" or action == "":
-                    print_game(ctx, "PRE-FLOP", player_hand, opponent_hand, board, pot, INVALID_CHOICE_MSG + "\n")
-                
-                action = cinput(f"[F]old   [C]all {current_bet}   [R]aise\n")
-
-            clear_screen()
-            display_poker_topbar(ctx)
-
-            if action.lower() == "f":
-                player_folded = True
-                player_status = False
-                opponent_status = False
-            elif action.lower() == "c":
-                account.withdraw(current_bet)
-                pot += current_bet
-                player_status = False
-            elif action.lower() == "r":
-                current_bet += raise_amount
-                account.withdraw(current_bet)
-                pot += current_bet
-
-                # as of right now, i will make the bot always call a raise
-                opponent_chips -= current_bet
-                pot += current_bet
-                player_status = False
-            else:
-                raise ValueError(f"Invalid choice: {action}")
-            
-        # flop
-        if not player_folded:
-            
-            # burn a card (standard in most casinos)
-            deck.draw()
-
-            # deal flop (3 cards)
-            for _ in range(3):
-                deal_card(board, deck)
-            
-            print_game(ctx, "FLOP", player_hand, opponent_hand, board, pot)
-
-            action = cinput("[F]old   [C]heck   [R]aise\n")
-            raise_amount = 0
-
-            while action not in "FfCcRr" or action == "" or (action.lower() == "r"):
-                if (action.lower() == "r"):
-                    raise_amount, validation_msg = get_and_validate_raise_amount(min_raise, account.balance)
-                    if validation_msg:
-                        print_game(ctx, "FLOP", player_hand, opponent_hand, board, pot, validation_msg)
-                    else:
-                        break
-                stubborn += 1
-                if stubborn >= 7: 
-                    clear_screen()
-                    cprint(SECURITY_MSG)
-                    return
-                action = cinput("[F]old   [C]heck   [R]aise\n")
-            current_bet = 0
-            if action.lower() == "f":
-                player_folded = True
-                player_status = False
-                opponent_status = False
-            elif action.lower() == "c":
-                account.withdraw(current_bet)
-                pot += current_bet
-                player_status = False
-            elif action.lower() == "r":
-                current_bet += raise_amount
-                account.withdraw(current_bet)
-                pot += current_bet
-
-                # as of right now, i will make the bot always call a raise
-                opponent_chips -= 50
-                pot += 50
-                player_status = False
-            
-
-        #turn
-        if not player_folded:
-            
-            # burn a card (standard in most casinos)
-            deal_card([], deck)
-
-            # deal turn (1 card)
-            deal_card(board, deck)
-
-            print_game(ctx, "TURN", player_hand, opponent_hand, board, pot)
-
-            action = cinput("[F]old   [C]heck   [R]aise\n")
-            raise_amount = 0
-            while action not in "FfCcRr" or action == "" or (action.lower() == "r"):
-                if (action.lower() == "r"):
-                    raise_amount, validation_msg = get_and_validate_raise_amount(min_raise, account.balance)
-                    if validation_msg:
-                        print_game(ctx, "TURN", player_hand, opponent_hand, board, pot, validation_msg)
-                    else:
-                        break
-                stubborn += 1
-                if stubborn >= 7:
-                    clear_screen()
-                    cprint(SECURITY_MSG)
-                    return
-                action = cinput("[F]old   [C]heck   [R]aise\n")
-            current_bet = 0
-            if action.lower() == "f":
-                player_folded = True
-                player_status = False
-                opponent_status = False
-            elif action.lower() == "c":
-                account.withdraw(current_bet)
-                pot += current_bet
-                player_status = False
-            elif action.lower() == "r":
-                current_bet += raise_amount
-                account.withdraw(current_bet)
-                pot += current_bet
-
-                # as of right now, i will make the bot always call a raise
-                opponent_chips -= 50
-                pot += 50
-                player_status = False
-        
-        
-        #river
-        if not player_folded:
-            # burn a card (standard in most casinos)
-            deck.draw()
-
-            # deal river (1 card)
-            deal_card(board, deck)
-
-            print_game(ctx, "RIVER", player_hand, opponent_hand, board, pot)
-
-            action = cinput("[F]old   [C]heck   [R]aise\n")
-            raise_amount = 0
-            while action not in "FfCcRr" or action == "" or (action.lower() == "r"):
-                if (action.lower() == "r"):
-                    raise_amount, validation_msg = get_and_validate_raise_amount(min_raise, account.balance)
-                    if validation_msg:
-                        print_game(ctx, "RIVER", player_hand, opponent_hand, board, pot, validation_msg)
-                    else:
-                        break
                 stubborn += 1
                 if stubborn >= 7:
                     clear_screen()
                     cprint(SECURITY_MSG)
+                    cprint("You have been banned from the casino for being too stubborn.")
+                    settle(account, player)
                     return
-                action = cinput("[F]old   [C]heck   [R]aise\n")
-            current_bet = 0
-            if action.lower() == "f":
-                player_folded = True
-                player_status = False
-                opponent_status = False
-            elif action.lower() == "c":
-                account.withdraw(current_bet)
-                pot += current_bet
-                player_status = False
-            elif action.lower() == "r":
-                current_bet += raise_amount
-                account.withdraw(current_bet)
-                pot += current_bet
-
-                # as of right now, i will make the bot always call a raise
-                opponent_chips -= 50
-                pot += 50
-                player_status = False
-
-        #showdown
-        stats.rounds_played += 1
-        if not player_folded:
-            print_game(ctx, "SHOWDOWN", player_hand, opponent_hand, board, pot)
+                print_game(ctx, table, message)
+                action = cinput(prompt).lower()
 
-            player_score = hand_score(player_hand, board)
-            opponent_score = hand_score(opponent_hand, board)
+            message = ""
+            settle(account, player)
 
+        settle(account, player)
+        stats.rounds_played += 1
+        net = table.winnings[PLAYER] - player.committed
+        if table.showdown:
+            print_game(ctx, table)
+            player_score = player.state.strength
+            opponent_score = table.seats[OPPONENT].state.strength
             if player_score > opponent_score:
                 cprint(f"You win with a {hand_name(player_score)}!")
-                account.deposit(pot)
-                stats.wins += 1
             elif opponent_score > player_score:
                 cprint(f"Opponent wins with a {hand_name(opponent_score)}.")
-                opponent_chips += pot
-                stats.losses += 1
             else:
                 cprint(f"It's a tie with both players having a {hand_name(player_score)}.")
-                account.deposit(pot//2)
-                opponent_chips += pot // 2
-                stats.pushes += 1
-
-            cprint(f"Your balance: {account.balance} chips\n")
         else:
             clear_screen()
             display_poker_topbar(ctx)
-            cprint("You folded. Opponent wins the pot.")
-            opponent_chips += pot
+            if player.folded:
+                cprint("You folded. Opponent wins the pot.")
+            else:
+                cprint("Opponent folds. You win the pot!")
+        if net > 0:
+            stats.wins += 1
+        elif net < 0:
             stats.losses += 1
-            cprint(f"Your balance: {account.balance} chips\n")
-        
-        # Regenerate the deck (i.e. return all cards to deck and shuffle)
-        deck.generate_deck()
-        
+        else:
+            stats.pushes += 1
+        cprint(f"Your balance: {account.balance} chips\n")
+
         # game restart?
-        if account.balance < 20: # The starting bet pre-flop
+        if account.balance < BIG_BLIND:
             cprint(NO_FUNDS_MSG)
             cinput("Press enter to continue.")
             stats.ending_balance = account.balance
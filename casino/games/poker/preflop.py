@@ -0,0 +1,162 @@
+"""
+Precomputed preflop equities for the 169 starting hand classes.
+
+Two hole cards fall into one of 169 classes: 13 pairs, 78 suited and 78
+offsuit hands. Classes are numbered by their cell in the usual 13x13 grid,
+`high * 13 + low` for suited hands and `low * 13 + high` for offsuit hands,
+with pairs on the diagonal.
+
+The table of every class against every other class never changes, so it is
+generated once with `python -m casino.games.poker.preflop` and stored as a
+raw 169x169 float16 array (57 KB). `table()` memory-maps it on first use,
+after which a preflop equity is a single index lookup.
+"""
+
+import argparse
+import time
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from . import evaluator
+
+NUM_CLASSES = 169
+
+PREFLOP_TABLE_PATH = "./casino/assets/poker/preflop_equity.f16"
+
+RANK_CHARS = "23456789TJQKA"
+
+# Samples per class matchup when generating the table
+GENERATOR_SAMPLES = 10_000
+
+
+def hand_class(card1: int, card2: int) -> int:
+    """Starting hand class (0-168) of two hole cards."""
+    rank1, rank2 = card1 >> 2, card2 >> 2
+    high, low = max(rank1, rank2), min(rank1, rank2)
+    if (card1 & 3) == (card2 & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+
+def class_name(hand: int) -> str:
+    """Short name of a class, e.g. `AA`, `AKs` or `T9o`."""
+    row, col = divmod(hand, 13)
+    if row == col:
+        return RANK_CHARS[row] * 2
+    if row > col:
+        return RANK_CHARS[row] + RANK_CHARS[col] + "s"
+    return RANK_CHARS[col] + RANK_CHARS[row] + "o"
+
+
+@lru_cache(maxsize=None)
+def class_combos(hand: int) -> tuple[tuple[int, int], ...]:
+    """Every pair of specific cards in a class."""
+    return tuple(
+        (card1, card2)
+        for card1, card2 in combinations(range(52), 2)
+        if hand_class(card1, card2) == hand
+    )
+
+
+def _matchup_equity(hand: int, other: int, samples: int, rng: np.random.Generator) -> float:
+    """Monte Carlo equity of one class against another."""
+    pairs = [
+        (a, b) for a in class_combos(hand) for b in class_combos(other)
+        if not set(a) & set(b)
+    ]
+    dealt = np.array(pairs, dtype=np.int64).reshape(-1, 4)[rng.integers(len(pairs), size=samples)]
+
+    # Pick 5 of the 48 live cards, then step each pick past the dead cards
+    board = np.argsort(rng.random((samples, 48)), axis=1)[:, :5]
+    for dead in np.sort(dealt, axis=1).T:
+        board += board >= dead[:, None]
+
+    hero = evaluator.evaluate_batch(np.hstack([dealt[:, :2], board]))
+    villain = evaluator.evaluate_batch(np.hstack([dealt[:, 2:], board]))
+    return float(((hero > villain).sum() + (hero == villain).sum() / 2) / samples)
+
+
+def build_table(samples: int = GENERATOR_SAMPLES, seed: int = 0, progress: bool = False) -> np.ndarray:
+    """
+    Simulate every class against every other class.
+
+    Only the upper triangle is simulated; the rest follows from
+    `table[b, a] = 1 - table[a, b]`.
+    """
+    rng = np.random.default_rng(seed)
+    result = np.full((NUM_CLASSES, NUM_CLASSES), 0.5)
+    start = time.perf_counter()
+    for hand in range(NUM_CLASSES):
+        for other in range(hand + 1, NUM_CLASSES):
+            equity = _matchup_equity(hand, other, samples, rng)
+            result[hand, other] = equity
+            result[other, hand] = 1 - equity
+        if progress:
+            elapsed = time.perf_counter() - start
+            print(f"{hand + 1}/{NUM_CLASSES} classes done ({elapsed:.0f}s)")
+    return result
+
+
+def write_table(table_: np.ndarray, path: str = PREFLOP_TABLE_PATH) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    table_.astype(np.float16).tofile(path)
+
+
+@lru_cache(maxsize=None)
+def table(path: str = PREFLOP_TABLE_PATH) -> np.ndarray:
+    """The equity table, memory-mapped on first use."""
+    return np.memmap(path, dtype=np.float16, mode="r", shape=(NUM_CLASSES, NUM_CLASSES))
+
+
+@lru_cache(maxsize=None)
+def vs_random_equities() -> np.ndarray:
+    """
+    Equity of each class against a random hand.
+
+    Each opposing class is weighted by how many of its combos are still
+    possible once a hand of the first class has been dealt.
+    """
+    combos = [class_combos(hand) for hand in range(NUM_CLASSES)]
+    weights = np.array([
+        [sum(1 for combo in combos[other] if not set(combo) & set(combos[hand][0]))
+         for other in range(NUM_CLASSES)]
+        for hand in range(NUM_CLASSES)
+    ], dtype=np.float64)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return (np.asarray(table(), dtype=np.float64) * weights).sum(axis=1)
+
+
+def preflop_equity(hole: Sequence[int], opponent: Optional[Sequence[int]] = None) -> float:
+    """
+    Preflop equity of two hole cards against a known hand or a random one.
+
+    Equities are class averages, so the exact suits only matter through
+    whether each hand is suited.
+    """
+    hand = hand_class(*hole)
+    if opponent is None:
+        return float(vs_random_equities()[hand])
+    return float(table()[hand, hand_class(*opponent)])
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m casino.games.poker.preflop",
+        description="Generate the preflop equity table.",
+    )
+    parser.add_argument("--samples", type=int, default=GENERATOR_SAMPLES,
+                        help="samples per class matchup")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=PREFLOP_TABLE_PATH)
+    args = parser.parse_args(argv)
+
+    write_table(build_table(args.samples, args.seed, progress=True), args.output)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
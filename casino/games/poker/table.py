@@ -0,0 +1,361 @@
+"""
+Headless Texas Hold'em table.
+
+A `Table` runs no-limit hands for 2-9 seats. It moves the button, posts the
+blinds and deals, then runs each betting round and splits the pot at
+showdown, side pots included. It never prompts anyone. Callers read whose
+turn it is from `to_act` and answer with `act()`, so the interactive game,
+bots and simulations all drive hands the same way.
+
+Cards are evaluator card ids (0-51).
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
+
+from .deck import PokerDeck
+from .evaluator import HandState
+
+if TYPE_CHECKING:
+    from .history import HandHistoryWriter
+
+FOLD  = "fold"
+CHECK = "check"
+CALL  = "call"
+RAISE = "raise"
+
+PREFLOP  = "PRE-FLOP"
+FLOP     = "FLOP"
+TURN     = "TURN"
+RIVER    = "RIVER"
+SHOWDOWN = "SHOWDOWN"
+
+# Board cards dealt at the start of each street after the preflop
+STREET_CARDS = {FLOP: 3, TURN: 1, RIVER: 1}
+NEXT_STREET = {PREFLOP: FLOP, FLOP: TURN, TURN: RIVER}
+
+MIN_SEATS = 2
+MAX_SEATS = 9
+
+
+@dataclass
+class Seat:
+    """
+    One player's chips and cards.
+
+    Attributes:
+        stack: chips in front of the player, not yet bet
+        hole: hole cards for the current hand
+        state: the hole cards plus the board as a `HandState`
+        bet: chips put in during the current street
+        committed: chips put in during the whole hand
+        folded: out of the current hand (seats without chips sit out folded)
+        all_in: has no chips left to bet
+        acted: has acted since the last full raise
+    """
+    stack: int
+    hole: list[int] = field(default_factory=list)
+    state: HandState = field(default_factory=HandState)
+    bet: int = 0
+    committed: int = 0
+    folded: bool = True
+    all_in: bool = False
+    acted: bool = False
+
+    @property
+    def can_act(self) -> bool:
+        return not self.folded and not self.all_in
+
+
+@dataclass(frozen=True)
+class Action:
+    """
+    One entry in the action log of a hand.
+
+    `amount` is the number of chips the action put in: 0 for folds and
+    checks, the call for calls and the call plus the raise for raises.
+    """
+    street: str
+    seat: int
+    action: str
+    amount: int
+
+
+def side_pots(committed: Sequence[int], live: Sequence[bool]) -> list[tuple[int, list[int]]]:
+    """
+    Split the chips committed to a hand into a main pot and side pots.
+
+    Every distinct amount committed by a live (not folded) seat closes a
+    pot that the seats who put in at least that much can win. Folded chips
+    are added to the pots they were bet into.
+
+    Arguments:
+        - committed: chips each seat put in during the hand
+        - live: whether each seat can still win
+
+    Returns a list of `(amount, eligible seats)`, main pot first.
+    """
+    levels = sorted({chips for chips, is_live in zip(committed, live) if is_live and chips > 0})
+    pots = []
+    previous = 0
+    for level in levels:
+        amount = sum(min(chips, level) - min(chips, previous) for chips in committed)
+        eligible = [seat for seat, (chips, is_live) in enumerate(zip(committed, live)) if is_live and chips >= level]
+        pots.append((amount, eligible))
+        previous = level
+
+    # Chips folded above the largest live commitment go to the last pot
+    leftover = sum(committed) - sum(amount for amount, _ in pots)
+    if leftover and pots:
+        amount, eligible = pots[-1]
+        pots[-1] = (amount + leftover, eligible)
+    return pots
+
+
+class Table:
+    """
+    A no-limit hold'em table.
+
+    Arguments:
+        - stacks: starting chips for each seat (2-9 seats)
+        - small_blind / big_blind: forced bets posted every hand
+        - min_raise: smallest opening raise on each street; defaults to
+            the big blind. After a raise the minimum becomes the size of
+            that raise.
+        - rng: source of randomness for the deck
+        - history: if given, every finished hand is recorded to it
+        - button: seat the button moves on from at the first hand; by
+            default the first seat dealt in gets it
+    """
+
+    def __init__(
+        self,
+        stacks: Sequence[int],
+        small_blind: int,
+        big_blind: int,
+        min_raise: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+        history: Optional["HandHistoryWriter"] = None,
+        button: int = -1,
+    ) -> None:
+        if not MIN_SEATS <= len(stacks) <= MAX_SEATS:
+            raise ValueError(f"A table seats {MIN_SEATS} to {MAX_SEATS} players, not {len(stacks)}")
+        self.seats = [Seat(stack) for stack in stacks]
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.opening_raise = min_raise or big_blind
+        self.deck = PokerDeck(rng)
+        self.history = history
+
+        self.button = button
+        self.small_blind_seat = self.big_blind_seat = -1
+        self.street = SHOWDOWN
+        self.board: list[int] = []
+        self.pot = 0
+        self.current_bet = 0
+        self.min_raise = self.opening_raise
+        self.to_act: Optional[int] = None
+        self.hand_over = True
+        self.showdown = False
+        self.actions: list[Action] = []
+        self.winnings = [0] * len(self.seats)
+        self.hands_played = 0
+
+    @property
+    def total_pot(self) -> int:
+        """Chips in the middle, counting bets on the current street."""
+        return self.pot + sum(seat.bet for seat in self.seats)
+
+    def to_call(self, seat: Optional[int] = None) -> int:
+        """Chips a seat (by default the one to act) needs to call."""
+        if seat is None:
+            seat = self.to_act
+        return self.current_bet - self.seats[seat].bet
+
+    def players_in_hand(self) -> list[int]:
+        return [i for i, seat in enumerate(self.seats) if not seat.folded]
+
+    def _next(self, seat: int, predicate: Callable[[Seat], bool]) -> Optional[int]:
+        """First seat after `seat`, going clockwise, that matches `predicate`."""
+        count = len(self.seats)
+        for step in range(1, count + 1):
+            candidate = (seat + step) % count
+            if predicate(self.seats[candidate]):
+                return candidate
+        return None
+
+    def _put(self, seat: Seat, chips: int) -> int:
+        """Move chips from a stack into its bet, all in if it runs out."""
+        chips = min(chips, seat.stack)
+        seat.stack -= chips
+        seat.bet += chips
+        seat.committed += chips
+        if seat.stack == 0:
+            seat.all_in = True
+        return chips
+
+    def _pending(self, seat: Seat) -> bool:
+        return seat.can_act and (not seat.acted or seat.bet < self.current_bet)
+
+    def start_hand(self) -> None:
+        """Move the button, post the blinds and deal the hole cards."""
+        if not self.hand_over:
+            raise RuntimeError("The current hand is not finished")
+        if sum(seat.stack > 0 for seat in self.seats) < 2:
+            raise ValueError("At least two seats need chips to play a hand")
+
+        for seat in self.seats:
+            seat.hole = []
+            seat.state = HandState()
+            seat.bet = seat.committed = 0
+            seat.folded = seat.stack == 0
+            seat.all_in = seat.acted = False
+
+        dealt_in = lambda seat: not seat.folded
+        self.button = self._next(self.button, dealt_in)
+        if len(self.players_in_hand()) == 2:
+            # Heads up the button posts the small blind and acts first preflop
+            self.small_blind_seat = self.button
+        else:
+            self.small_blind_seat = self._next(self.button, dealt_in)
+        self.big_blind_seat = self._next(self.small_blind_seat, dealt_in)
+
+        self.deck.shuffle()
+        for _ in range(2):
+            seat_index = self.button
+            for _ in self.players_in_hand():
+                seat_index = self._next(seat_index, dealt_in)
+                card = self.deck.draw()
+                self.seats[seat_index].hole.append(card)
+                self.seats[seat_index].state.add(card)
+
+        self.street = PREFLOP
+        self.board = []
+        self.pot = 0
+        self.hand_over = False
+        self.showdown = False
+        self.actions = []
+        self.winnings = [0] * len(self.seats)
+        self._put(self.seats[self.small_blind_seat], self.small_blind)
+        self._put(self.seats[self.big_blind_seat], self.big_blind)
+        self.current_bet = self.big_blind
+        self.min_raise = self.opening_raise
+        self._continue(self.big_blind_seat)
+
+    def act(self, action: str, amount: int = 0) -> None:
+        """
+        Play an action for the seat to act.
+
+        Arguments:
+            - action: FOLD, CHECK, CALL or RAISE
+            - amount: for raises, chips raised on top of the call. Raises
+                the stack cannot cover go all in, and so do calls.
+        """
+        if self.hand_over:
+            raise RuntimeError("No hand in progress")
+        index = self.to_act
+        seat = self.seats[index]
+        to_call = self.current_bet - seat.bet
+        put_in = 0
+
+        if action == FOLD:
+            seat.folded = True
+        elif action == CHECK:
+            if to_call > 0:
+                raise ValueError(f"Cannot check facing a bet of {to_call}")
+        elif action == CALL:
+            if to_call <= 0:
+                raise ValueError("There is no bet to call")
+            put_in = self._put(seat, to_call)
+        elif action == RAISE:
+            if amount <= 0:
+                raise ValueError("Raise must be a positive amount")
+            if amount < self.min_raise and to_call + amount < seat.stack:
+                raise ValueError(f"Raise must be at least {self.min_raise}")
+            put_in = self._put(seat, to_call + amount)
+            raised_by = seat.bet - self.current_bet
+            if raised_by > 0:
+                # A short all-in raise does not reopen the betting
+                if raised_by >= self.min_raise:
+                    self.min_raise = raised_by
+                    for other in self.seats:
+                        other.acted = False
+                self.current_bet = seat.bet
+            else:
+                # The stack did not cover more than the call
+                action = CALL
+        else:
+            raise ValueError(f"Invalid action: {action}")
+
+        seat.acted = True
+        self.actions.append(Action(self.street, index, action, put_in))
+        self._continue(index)
+
+    def _round_complete(self) -> bool:
+        actors = [seat for seat in self.seats if seat.can_act]
+        if len(actors) == 1 and actors[0].bet >= self.current_bet:
+            # Nobody is left to bet against
+            return True
+        return not any(self._pending(seat) for seat in actors)
+
+    def _continue(self, last_seat: int) -> None:
+        """Pass the action on, moving through the streets as rounds close."""
+        if len(self.players_in_hand()) == 1:
+            self._collect_bets()
+            self._award([(self.pot, self.players_in_hand())])
+            return
+
+        while self._round_complete():
+            self._collect_bets()
+            if self.street == RIVER:
+                self._showdown()
+                return
+            self._deal_street()
+            last_seat = self.button
+        self.to_act = self._next(last_seat, self._pending)
+
+    def _collect_bets(self) -> None:
+        for seat in self.seats:
+            self.pot += seat.bet
+            seat.bet = 0
+            seat.acted = False
+        self.current_bet = 0
+        self.min_raise = self.opening_raise
+
+    def _deal_street(self) -> None:
+        self.street = NEXT_STREET[self.street]
+        self.deck.burn()
+        for card in self.deck.deal(STREET_CARDS[self.street]):
+            self.board.append(card)
+            for seat in self.seats:
+                if not seat.folded:
+                    seat.state.add(card)
+
+    def _showdown(self) -> None:
+        self.street = SHOWDOWN
+        self.showdown = True
+        committed = [seat.committed for seat in self.seats]
+        live = [not seat.folded for seat in self.seats]
+        self._award(side_pots(committed, live))
+
+    def _award(self, pots: list[tuple[int, list[int]]]) -> None:
+        """Split each pot between its best hands and end the hand."""
+        count = len(self.seats)
+        for amount, eligible in pots:
+            best = max(self.seats[i].state.strength for i in eligible)
+            winners = [i for i in eligible if self.seats[i].state.strength == best]
+            # Odd chips go to the winners closest to the left of the button
+            winners.sort(key=lambda i: (i - self.button - 1) % count)
+            share, odd_chips = divmod(amount, len(winners))
+            for position, i in enumerate(winners):
+                self.winnings[i] += share + (position < odd_chips)
+
+        for seat, won in zip(self.seats, self.winnings):
+            seat.stack += won
+        self.pot = 0
+        self.to_act = None
+        self.hand_over = True
+        self.hands_played += 1
+        if self.history is not None:
+            self.history.record(self)
@@ -0,0 +1,209 @@
+"""
+Bot-vs-bot multi-table poker tournaments.
+
+Every player is a `PokerBot` playing in fixed-sample mode, so a tournament
+is fully determined by its seed. Players start spread over as few tables as
+possible. Each round plays one hand at every table. Blinds go up every
+`hands_per_level` rounds. When a table can be broken, a table is left with
+one player, or the tables differ by two or more players, the survivors are
+reseated at random. Play goes on until one player holds every chip.
+
+`run_tournaments` plays many tournaments in a process pool and yields
+their results as they finish.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .bot import PokerBot
+from .table import Table
+
+# (small blind, big blind) for each level; past the last level the blinds
+# keep doubling, so every tournament ends
+DEFAULT_BLINDS = (
+    (10, 20), (15, 30), (25, 50), (50, 100), (75, 150), (100, 200),
+    (150, 300), (200, 400), (300, 600), (400, 800), (600, 1200), (1000, 2000),
+)
+
+
+@dataclass(frozen=True)
+class TournamentConfig:
+    """
+    Structure of a tournament.
+
+    Attributes:
+        players: entrants
+        seats: seats per table (2-9)
+        starting_stack: chips each player starts with
+        blinds: (small blind, big blind) for each level
+        hands_per_level: rounds played before the blinds go up
+        bot_samples: runouts each bot samples for a postflop decision
+    """
+    players: int = 18
+    seats: int = 9
+    starting_stack: int = 1500
+    blinds: tuple[tuple[int, int], ...] = DEFAULT_BLINDS
+    hands_per_level: int = 10
+    bot_samples: int = 200
+
+    def level_blinds(self, level: int) -> tuple[int, int]:
+        if level < len(self.blinds):
+            return self.blinds[level]
+        small, big = self.blinds[-1]
+        factor = 2 ** (level - len(self.blinds) + 1)
+        return small * factor, big * factor
+
+
+@dataclass
+class TournamentResult:
+    """
+    What happened in one tournament.
+
+    Attributes:
+        tournament: index of the tournament in its run
+        seed: seed it was played with
+        finish: finishing position of each player, 1 for the winner
+        hands: hands dealt over all tables
+        hands_played: hands each player was dealt into
+        chips: every player's stack at the start of each level and at the end
+    """
+    tournament: int
+    seed: int
+    finish: list[int]
+    hands: int
+    hands_played: list[int]
+    chips: list[list[int]]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def tournament_seeds(count: int, seed: Optional[int] = None) -> list[int]:
+    """One independent seed per tournament, all derived from `seed`."""
+    children = np.random.SeedSequence(seed).spawn(count)
+    return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in children]
+
+
+def _seat_players(alive: list[int], seats: int, rng: random.Random) -> list[list[int]]:
+    """Deal the players out over as few tables as possible, evenly."""
+    players = alive[:]
+    rng.shuffle(players)
+    num_tables = -(-len(players) // seats)
+    return [players[i::num_tables] for i in range(num_tables)]
+
+
+def _first_button(players: list[int], last_button: list[int]) -> int:
+    """Seat at a new table that gets the button: whoever has gone longest without it."""
+    return min(range(len(players)), key=lambda seat: last_button[players[seat]])
+
+
+def play_tournament(config: TournamentConfig, seed: int, tournament: int = 0) -> TournamentResult:
+    """Play one tournament to the end."""
+    rng = random.Random(seed)
+    bot = PokerBot(rng=random.Random(rng.getrandbits(64)), samples=config.bot_samples)
+    stacks = [config.starting_stack] * config.players
+    finish = [0] * config.players
+    hands_played = [0] * config.players
+    # Hand on which each player last had the button, so reseating keeps
+    # the button going round instead of restarting it at every table
+    last_button = [-1] * config.players
+    chips = [stacks[:]]
+    hands = 0
+    rounds = 0
+
+    alive = list(range(config.players))
+    tables: list[tuple[list[int], Table]] = []
+    reseat = True
+    while len(alive) > 1:
+        if reseat:
+            tables = []
+            for players in _seat_players(alive, config.seats, rng):
+                table = Table(
+                    [stacks[p] for p in players], 1, 2,
+                    rng=random.Random(rng.getrandbits(64)),
+                    button=_first_button(players, last_button) - 1,
+                )
+                tables.append((players, table))
+            reseat = False
+
+        level, rest = divmod(rounds, config.hands_per_level)
+        if rest == 0 and rounds:
+            chips.append(stacks[:])
+        small_blind, big_blind = config.level_blinds(level)
+
+        starting = stacks[:]
+        for players, table in tables:
+            table.small_blind, table.big_blind = small_blind, big_blind
+            table.opening_raise = big_blind
+            table.start_hand()
+            while not table.hand_over:
+                seat = table.seats[table.to_act]
+                decision = bot.decide(
+                    seat.hole, table.board, table.to_call(), table.total_pot,
+                    table.min_raise, seat.stack, len(table.players_in_hand()) - 1,
+                )
+                table.act(decision.action, decision.amount)
+
+            last_button[players[table.button]] = hands
+            hands += 1
+            for player, seat in zip(players, table.seats):
+                if seat.hole:
+                    hands_played[player] += 1
+                stacks[player] = seat.stack
+        rounds += 1
+
+        # Players knocked out together finish in order of their stacks
+        # at the start of the hand
+        busted = sorted((p for p in alive if stacks[p] == 0), key=lambda p: -starting[p])
+        for place, player in enumerate(busted, len(alive) - len(busted) + 1):
+            finish[player] = place
+        if busted:
+            alive = [p for p in alive if stacks[p] > 0]
+            sizes = [sum(stacks[p] > 0 for p in players) for players, _ in tables]
+            reseat = (
+                -(-len(alive) // config.seats) < len(tables)
+                or max(sizes) - min(sizes) > 1
+                or min(sizes) < 2
+            )
+
+    finish[alive[0]] = 1
+    chips.append(stacks[:])
+    return TournamentResult(tournament, seed, finish, hands, hands_played, chips)
+
+
+def _warm_up() -> None:
+    """Build the evaluator tables and opening ranges once per worker."""
+    PokerBot()
+
+
+def run_tournaments(
+    config: TournamentConfig,
+    count: int,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Iterator[TournamentResult]:
+    """
+    Play `count` tournaments and yield each result as soon as it finishes.
+
+    Tournament `i` is always played with the `i`th of `tournament_seeds`,
+    so results don't depend on the number of workers or finishing order.
+    """
+    seeds = tournament_seeds(count, seed)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for index, tournament_seed in enumerate(seeds):
+            yield play_tournament(config, tournament_seed, index)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_warm_up) as pool:
+        futures = [
+            pool.submit(play_tournament, config, tournament_seed, index)
+            for index, tournament_seed in enumerate(seeds)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
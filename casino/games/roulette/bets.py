@@ -0,0 +1,341 @@
+"""
+Roulette bets and their payouts.
+
+Every bet covers a set of pockets, kept as a pocket mask: an int with bit
+`pocket` set for each pocket the bet wins on. A bet covering `k` pockets
+returns `36 // k` chips per chip staked, so every payout follows from the
+mask's popcount: 36 for a straight-up, 18 for a split, 7 for the American
+basket, 2 for red.
+
+The inside bets are generated from the layout: numbers 1-36 sit in twelve
+columns of three, with the zeros at the end next to 1-3. A set of numbers
+typed by a player is a valid inside bet exactly when its mask is one of
+the generated ones.
+
+Every bet a player can make is one row of a payout matrix with one column
+per pocket on the wheel. An entry is what each chip staked on the bet
+returns when the ball lands in that pocket, the stake included, and 0 when
+the bet loses. Resolving any number of bets on a spin is then one gather:
+`stakes * matrix[bet_ids, pocket]`. The matrix is stored pocket-major, so
+the column for a spin is one contiguous row.
+
+Pockets are numbered by their number, with "00" as pocket 37 on the
+American wheel.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+EUROPEAN_POCKETS = 37
+AMERICAN_POCKETS = 38
+
+POCKET_LABELS = [str(number) for number in range(37)] + ["00"]
+POCKET_INDEX = {label: index for index, label in enumerate(POCKET_LABELS)}
+DOUBLE_ZERO = POCKET_INDEX["00"]
+
+RED_NUMBERS = {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}
+
+DOZENS = {
+    "1": set(range(1, 13)),
+    "2": set(range(13, 25)),
+    "3": set(range(25, 37)),
+}
+
+COLUMNS = {
+    "1": set(range(1, 37, 3)),  # 1,4,7,...,34
+    "2": set(range(2, 37, 3)),  # 2,5,8,...,35
+    "3": set(range(3, 37, 3)),  # 3,6,9,...,36
+}
+
+# A bet on k pockets returns PAYOUT_BASE // k per chip, stake included
+PAYOUT_BASE = 36
+
+# Bets touching the zeros, besides the straight-ups
+ZERO_BETS = {
+    EUROPEAN_POCKETS: [
+        ("inside_split", (0, 1)), ("inside_split", (0, 2)), ("inside_split", (0, 3)),
+        ("inside_street", (0, 1, 2)), ("inside_street", (0, 2, 3)),
+        ("inside_corner", (0, 1, 2, 3)),
+    ],
+    AMERICAN_POCKETS: [
+        ("inside_split", (0, DOUBLE_ZERO)),
+        ("inside_split", (0, 1)), ("inside_split", (0, 2)),
+        ("inside_split", (DOUBLE_ZERO, 2)), ("inside_split", (DOUBLE_ZERO, 3)),
+        ("inside_street", (0, 1, 2)), ("inside_street", (0, DOUBLE_ZERO, 2)), ("inside_street", (DOUBLE_ZERO, 2, 3)),
+        ("inside_basket", (0, DOUBLE_ZERO, 1, 2, 3)),
+    ],
+}
+
+# How each kind of bet is shown to players
+BET_NAMES = {
+    "inside_number": "number",
+    "inside_split": "split",
+    "inside_street": "street",
+    "inside_corner": "corner",
+    "inside_line": "six line",
+    "inside_basket": "basket",
+}
+
+
+def pocket_index(label: str) -> int:
+    """Pocket number of a wheel label such as "17" or "00"."""
+    return POCKET_INDEX[label]
+
+
+def split_labels(text: str) -> list[str]:
+    """Pocket labels typed by a player, such as "17-20" or "1, 2, 4, 5"."""
+    return [label for label in re.split(r"[\s,/-]+", text.strip()) if label]
+
+
+def pocket_mask(pockets: Iterable[int]) -> int:
+    mask = 0
+    for pocket in pockets:
+        mask |= 1 << pocket
+    return mask
+
+
+def _label_order(pocket: int) -> float:
+    """Sort key putting "00" right after "0"."""
+    return 0.5 if pocket == DOUBLE_ZERO else pocket
+
+
+def mask_value(mask: int) -> str:
+    """The pockets of `mask` as a bet value, such as "1-2-4-5"."""
+    pockets = sorted((pocket for pocket in range(AMERICAN_POCKETS) if mask >> pocket & 1), key=_label_order)
+    return "-".join(POCKET_LABELS[pocket] for pocket in pockets)
+
+
+@dataclass(frozen=True)
+class BetDefinition:
+    """
+    One bet on the layout.
+
+    Attributes:
+        kind: bet type, such as "inside_split" or "outside_dozen"
+        value: what the bet is on within its type, such as "17-20" or "red"
+        mask: pocket mask of the pockets the bet wins on
+    """
+    kind: str
+    value: str
+    mask: int
+
+    @property
+    def pockets(self) -> frozenset[int]:
+        return frozenset(pocket for pocket in range(AMERICAN_POCKETS) if self.mask >> pocket & 1)
+
+    @property
+    def multiplier(self) -> int:
+        """Chips returned per chip staked on a win."""
+        return PAYOUT_BASE // self.mask.bit_count()
+
+
+def inside_bets(num_pockets: int) -> list[BetDefinition]:
+    """Every inside bet on the layout, straight-ups first."""
+    # Layout position of a number: column 0-11 along the table, row 0-2 across it
+    def number(column: int, row: int) -> int:
+        return 3 * column + row + 1
+
+    groups = [("inside_number", (pocket,)) for pocket in range(num_pockets)]
+    for column in range(12):
+        groups += [("inside_split", (number(column, row), number(column, row + 1))) for row in range(2)]
+        if column < 11:
+            groups += [("inside_split", (number(column, row), number(column + 1, row))) for row in range(3)]
+    groups += ZERO_BETS[num_pockets]
+    groups += [("inside_street", tuple(number(column, row) for row in range(3))) for column in range(12)]
+    for column in range(11):
+        groups += [
+            ("inside_corner", (number(column, row), number(column, row + 1),
+                               number(column + 1, row), number(column + 1, row + 1)))
+            for row in range(2)
+        ]
+    groups += [
+        ("inside_line", tuple(number(c, row) for c in (column, column + 1) for row in range(3)))
+        for column in range(11)
+    ]
+    return [BetDefinition(kind, mask_value(pocket_mask(pockets)), pocket_mask(pockets)) for kind, pockets in groups]
+
+
+def standard_bets(num_pockets: int) -> list[BetDefinition]:
+    """Every inside bet, then the outside bets."""
+    numbers = range(1, 37)
+    green = [pocket for pocket in (0, DOUBLE_ZERO) if pocket < num_pockets]
+    outside = [
+        ("outside_color", "red", {n for n in numbers if n in RED_NUMBERS}),
+        ("outside_color", "black", {n for n in numbers if n not in RED_NUMBERS}),
+        ("outside_color", "green", green),
+        ("outside_parity", "odd", {n for n in numbers if n % 2 == 1}),
+        ("outside_parity", "even", {n for n in numbers if n % 2 == 0}),
+        ("outside_highlow", "low", set(range(1, 19))),
+        ("outside_highlow", "high", set(range(19, 37))),
+    ]
+    outside += [("outside_dozen", value, pockets) for value, pockets in DOZENS.items()]
+    outside += [("outside_column", value, pockets) for value, pockets in COLUMNS.items()]
+    return inside_bets(num_pockets) + [
+        BetDefinition(kind, value, pocket_mask(pockets)) for kind, value, pockets in outside
+    ]
+
+
+class BetTable:
+    """
+    Every bet on one wheel, and the payout matrix for them.
+
+    Bets are referred to by their row in the matrix, their bet id.
+    """
+
+    def __init__(self, num_pockets: int) -> None:
+        self.num_pockets = num_pockets
+        self.definitions = standard_bets(num_pockets)
+        self.ids = {(bet.kind, bet.value): bet_id for bet_id, bet in enumerate(self.definitions)}
+        self.inside_ids: dict[int, int] = {}
+        for bet_id, bet in enumerate(self.definitions):
+            if bet.kind.startswith("inside_"):
+                self.inside_ids.setdefault(bet.mask, bet_id)
+
+        # One row per pocket: what each bet returns when that pocket wins,
+        # the multiplier where the pocket's bit is set in the bet's mask
+        masks = np.array([bet.mask for bet in self.definitions], dtype=np.uint64)
+        multipliers = np.array([bet.multiplier for bet in self.definitions], dtype=np.int64)
+        pockets = np.arange(num_pockets, dtype=np.uint64)[:, None]
+        self.by_pocket = ((masks >> pockets) & np.uint64(1)).astype(np.int64) * multipliers
+
+    def __len__(self) -> int:
+        return len(self.definitions)
+
+    def bet_id(self, kind: str, value: str) -> int:
+        try:
+            return self.ids[(kind, value)]
+        except KeyError:
+            raise ValueError(f"Unknown bet: {kind} {value}") from None
+
+    def inside_bet_id(self, labels: Iterable[str]) -> int:
+        """
+        Bet id of the inside bet covering exactly the pockets labelled.
+
+        Raises ValueError if a label isn't on this wheel or the pockets
+        don't form a bet on the layout.
+        """
+        labels = list(labels)
+        try:
+            pockets = [pocket_index(label) for label in labels]
+        except KeyError:
+            pockets = []
+        mask = pocket_mask(pocket for pocket in pockets if pocket < self.num_pockets)
+        if len(set(pockets)) != len(labels) or mask.bit_count() != len(labels) or mask not in self.inside_ids:
+            raise ValueError(f"Not a bet on this table: {'-'.join(labels)}")
+        return self.inside_ids[mask]
+
+    def multiplier(self, bet_id: int, pocket: int) -> int:
+        """Chips returned per chip staked on bet `bet_id` when `pocket` wins."""
+        return int(self.by_pocket[pocket, bet_id])
+
+    def resolve(self, bet_ids: np.ndarray, stakes: np.ndarray, pocket: int) -> np.ndarray:
+        """Chips returned on each bet, 0 for a losing bet."""
+        return stakes * self.by_pocket[pocket][bet_ids]
+
+
+EUROPEAN_BETS = BetTable(EUROPEAN_POCKETS)
+AMERICAN_BETS = BetTable(AMERICAN_POCKETS)
+
+
+class BetSlip:
+    """
+    Every bet placed on one spin, by any number of players.
+
+    Bets are kept as three parallel arrays: bet id, stake and the index of
+    the account that placed it. Each account's total stake is kept up to
+    date as bets are added, so checking a new bet against a balance is one
+    lookup.
+
+    `repeat` and `doubled` issue a new slip in constant time: the new slip
+    shares the arrays of the old one, and stakes are multiplied by `scale`
+    when read. The arrays are only copied if a shared slip is changed.
+    """
+
+    def __init__(self, num_accounts: int, capacity: int = 16) -> None:
+        self._bet_ids = np.empty(capacity, dtype=np.int64)
+        self._stakes = np.empty(capacity, dtype=np.int64)
+        self._accounts = np.empty(capacity, dtype=np.int64)
+        self._totals = np.zeros(num_accounts, dtype=np.int64)
+        self.size = 0
+        self.scale = 1
+        self._shared = False
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def bet_ids(self) -> np.ndarray:
+        return self._bet_ids[:self.size]
+
+    @property
+    def stakes(self) -> np.ndarray:
+        return self._stakes[:self.size] * self.scale
+
+    @property
+    def accounts(self) -> np.ndarray:
+        return self._accounts[:self.size]
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Total stake of each account."""
+        return self._totals * self.scale
+
+    def total(self, account: int) -> int:
+        return int(self._totals[account]) * self.scale
+
+    def fits(self, account: int, stake: int, balance: int) -> bool:
+        """Whether `account` can add a bet of `stake` with `balance` chips."""
+        return stake > 0 and self.total(account) + stake <= balance
+
+    def over_balance(self, balances: np.ndarray) -> np.ndarray:
+        """Which accounts have staked more than their balance."""
+        return self.totals > balances
+
+    def add(self, account: int, bet_id: int, stake: int) -> None:
+        self._own()
+        if self.size == len(self._stakes):
+            capacity = 2 * len(self._stakes)
+            self._bet_ids = np.resize(self._bet_ids, capacity)
+            self._stakes = np.resize(self._stakes, capacity)
+            self._accounts = np.resize(self._accounts, capacity)
+        self._bet_ids[self.size] = bet_id
+        self._stakes[self.size] = stake
+        self._accounts[self.size] = account
+        self._totals[account] += stake
+        self.size += 1
+
+    def bets_of(self, account: int) -> list[tuple[int, int]]:
+        """(bet id, stake) of every bet `account` placed, in order."""
+        mine = self.accounts == account
+        return list(zip(self.bet_ids[mine].tolist(), self.stakes[mine].tolist()))
+
+    def repeat(self) -> "BetSlip":
+        """The same bets again."""
+        slip = BetSlip.__new__(BetSlip)
+        slip.__dict__.update(self.__dict__)
+        slip._shared = self._shared = True
+        return slip
+
+    def doubled(self) -> "BetSlip":
+        """The same bets at twice the stakes."""
+        slip = self.repeat()
+        slip.scale *= 2
+        return slip
+
+    def resolve(self, table: BetTable, pocket: int) -> np.ndarray:
+        """Chips returned to each account when `pocket` wins."""
+        returns = table.resolve(self.bet_ids, self.stakes, pocket)
+        return np.bincount(self.accounts, weights=returns, minlength=len(self._totals)).astype(np.int64)
+
+    def _own(self) -> None:
+        """Stop sharing arrays, and fold the scale into the stakes."""
+        if self._shared or self.scale != 1:
+            self._bet_ids = self._bet_ids.copy()
+            self._stakes = self._stakes * self.scale
+            self._accounts = self._accounts.copy()
+            self._totals = self._totals * self.scale
+            self.scale = 1
+            self._shared = False
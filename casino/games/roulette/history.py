@@ -0,0 +1,228 @@
+"""
+Roulette spin history.
+
+A table's `SpinHistory` keeps the last `size` spins in a ring buffer, with
+counters for how often each pocket, color, dozen and column came up in
+them and the current streak of each. Recording a spin adds it to the
+counters and takes out the spin it pushes off the ring, so every update
+is constant time however long the history is.
+
+Spins can also be appended to a spin log: one byte per spin, the pocket
+number, with no header. Each wheel keeps its own log, named by
+`wheel_log_path`. Logs are read back whole with `load_spins` for offline
+analysis.
+
+Pockets are numbered as in `bets`, with "00" as pocket 37.
+"""
+
+import os
+
+import numpy as np
+
+from .bets import AMERICAN_POCKETS, COLUMNS, DOZENS, EUROPEAN_POCKETS, POCKET_LABELS, RED_NUMBERS
+
+HISTORY_SIZE = 100
+FLUSH_EVERY = 100
+
+# Spins shown on the history board, and pockets listed as hot and cold
+BOARD_SPINS = 12
+HOT_COLD = 3
+
+SPIN_DTYPE = np.dtype("u1")
+
+# What is counted for each spin
+FEATURES = ("pocket", "color", "dozen", "column")
+COLORS = ("red", "black", "green")
+
+# Dozen and column of the zeros
+ZERO = 3
+
+WHEEL_NAMES = {EUROPEAN_POCKETS: "european", AMERICAN_POCKETS: "american"}
+
+
+def _color(pocket: int) -> int:
+    if pocket in RED_NUMBERS:
+        return 0
+    return 1 if 1 <= pocket <= 36 else 2
+
+
+def _group(pocket: int, groups: dict[str, set[int]]) -> int:
+    return next((i for i, numbers in enumerate(groups.values()) if pocket in numbers), ZERO)
+
+
+# The value of each feature for each pocket
+POCKET_FEATURES = [
+    (pocket, _color(pocket), _group(pocket, DOZENS), _group(pocket, COLUMNS))
+    for pocket in range(AMERICAN_POCKETS)
+]
+FEATURE_SIZES = (AMERICAN_POCKETS, len(COLORS), ZERO + 1, ZERO + 1)
+
+
+class SpinHistory:
+    """
+    The last spins at one table, and running counts over them.
+
+    Pass `path` to also append every spin to a spin log; spins are written
+    every `flush_every` spins, on `flush()` and on `close()`.
+    """
+
+    def __init__(
+        self,
+        num_pockets: int,
+        size: int = HISTORY_SIZE,
+        path: str = "",
+        flush_every: int = FLUSH_EVERY,
+    ) -> None:
+        self.num_pockets = num_pockets
+        self.size = size
+        self.path = path
+        self.flush_every = flush_every
+        self.pending: list[int] = []
+
+        self.ring = [0] * size
+        self.head = 0   # where the next spin goes
+        self.filled = 0
+        self.spins = 0  # every spin recorded, including ones off the ring
+
+        self.counts = [[0] * feature_size for feature_size in FEATURE_SIZES]
+        self.streak_values = [-1] * len(FEATURES)
+        self.streak_lengths = [0] * len(FEATURES)
+
+    def __enter__(self) -> "SpinHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.filled
+
+    def record(self, pocket: int) -> None:
+        if self.filled == self.size:
+            for counts, value in zip(self.counts, POCKET_FEATURES[self.ring[self.head]]):
+                counts[value] -= 1
+        else:
+            self.filled += 1
+        self.ring[self.head] = pocket
+        self.head = (self.head + 1) % self.size
+        self.spins += 1
+
+        for feature, value in enumerate(POCKET_FEATURES[pocket]):
+            self.counts[feature][value] += 1
+            if self.streak_values[feature] == value:
+                self.streak_lengths[feature] += 1
+            else:
+                self.streak_values[feature] = value
+                self.streak_lengths[feature] = 1
+
+        if self.path:
+            self.pending.append(pocket)
+            if len(self.pending) >= self.flush_every:
+                self.flush()
+
+    def recent(self, count: int = BOARD_SPINS) -> list[int]:
+        """The last `count` pockets, newest first."""
+        count = min(count, self.filled)
+        return [self.ring[(self.head - i) % self.size] for i in range(1, count + 1)]
+
+    def count(self, feature: str, value: int) -> int:
+        """How often `value` of `feature` came up in the spins on the ring."""
+        return self.counts[FEATURES.index(feature)][value]
+
+    def streak(self, feature: str) -> tuple[int, int]:
+        """(value, length) of the current streak of `feature`; length 0 before any spin."""
+        index = FEATURES.index(feature)
+        return self.streak_values[index], self.streak_lengths[index]
+
+    def hot(self, count: int = HOT_COLD) -> list[int]:
+        """The pockets that came up most on the ring, most first."""
+        pockets = self.counts[0][:self.num_pockets]
+        hot = sorted(range(self.num_pockets), key=lambda pocket: -pockets[pocket])[:count]
+        return [pocket for pocket in hot if pockets[pocket]]
+
+    def cold(self, count: int = HOT_COLD) -> list[int]:
+        """The pockets that came up least on the ring, least first."""
+        pockets = self.counts[0][:self.num_pockets]
+        return sorted(range(self.num_pockets), key=lambda pocket: pockets[pocket])[:count]
+
+    def flush(self) -> None:
+        if self.pending:
+            with open(self.path, "ab") as file:
+                file.write(np.array(self.pending, dtype=SPIN_DTYPE).tobytes())
+        self.pending = []
+
+    def close(self) -> None:
+        if self.path:
+            self.flush()
+
+
+def wheel_log_path(path: str, num_pockets: int) -> str:
+    """The spin log for one wheel, such as "spins.european.bin" for "spins.bin"; empty for no log."""
+    if not path:
+        return ""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{WHEEL_NAMES[num_pockets]}{ext}"
+
+
+def load_spins(path: str) -> np.ndarray:
+    """Every pocket in a spin log, oldest first."""
+    return np.fromfile(path, dtype=SPIN_DTYPE).astype(np.int64)
+
+
+def longest_streaks(spins: np.ndarray) -> dict[str, tuple[int, int]]:
+    """(value, length) of the longest run of each feature over `spins`."""
+    table = np.array(POCKET_FEATURES, dtype=np.int64)[spins]
+    longest = {}
+    for feature, values in zip(FEATURES, table.T):
+        if not len(values):
+            longest[feature] = (-1, 0)
+            continue
+        starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+        lengths = np.diff(np.r_[starts, len(values)])
+        best = int(np.argmax(lengths))
+        longest[feature] = (int(values[starts[best]]), int(lengths[best]))
+    return longest
+
+
+def feature_label(feature: str, value: int) -> str:
+    """How a value of a feature is shown, such as "red" or "dozen 2"."""
+    if feature == "pocket":
+        return POCKET_LABELS[value]
+    if feature == "color":
+        return COLORS[value]
+    if value == ZERO:
+        return "zero"
+    return f"{feature} {value + 1}"
+
+
+def history_board(history: SpinHistory, render_cell) -> list[str]:
+    """
+    Lines of the history board for `history`.
+
+    `render_cell(label, color)` draws one pocket in the recent spins row.
+    """
+    if not history.spins:
+        return ["No spins yet."]
+
+    def counts(feature: str, values: range) -> str:
+        return "/".join(str(history.count(feature, value)) for value in values)
+
+    def pockets(chosen: list[int]) -> str:
+        return " ".join(f"{POCKET_LABELS[pocket]}×{history.count('pocket', pocket)}" for pocket in chosen)
+
+    colors = "  ".join(f"{name.title()} {history.count('color', value)}" for value, name in enumerate(COLORS))
+    streaks = "  ".join(
+        f"{feature_label(feature, value)} ×{length}"
+        for feature, (value, length) in ((feature, history.streak(feature)) for feature in FEATURES[1:])
+    )
+    recent = " ".join(
+        render_cell(POCKET_LABELS[pocket].rjust(2), COLORS[POCKET_FEATURES[pocket][1]])
+        for pocket in history.recent()
+    )
+    return [
+        f"Last spins: {recent}",
+        f"Last {len(history)} spins:  {colors}  Dozens {counts('dozen', range(3))}"
+        f"  Columns {counts('column', range(3))}",
+        f"Hot: {pockets(history.hot())}   Cold: {pockets(history.cold())}",
+        f"Streaks: {streaks}",
+    ]
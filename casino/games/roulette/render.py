@@ -0,0 +1,41 @@
+"""
+Drawing helpers shared by every roulette table.
+"""
+
+import re
+import shutil
+
+import casino.utils as utils
+
+ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def _visible_len(s: str) -> int:
+    return len(ANSI_RE.sub("", s))
+
+
+def cprint_ansi_center(line: str, end: str = "\n") -> None:
+    """Center a string that may contain ANSI escape codes."""
+    width = shutil.get_terminal_size().columns
+    vis = _visible_len(line)
+    pad_left = max(0, (width - vis) // 2)
+    print((" " * pad_left) + line, end=end)
+
+
+def cprint_table_center(block: str) -> None:
+    lines = block.strip("\n").splitlines()
+    term_width = shutil.get_terminal_size().columns
+
+    max_len = max(_visible_len(line) for line in lines)
+    pad_left = max(0, (term_width - max_len) // 2)
+
+    for line in lines:
+        padded_line = " " * pad_left + line
+        print(f"{utils.theme['color']}{padded_line}{utils.theme['reset']}")
+
+
+def render_cell(num_str: str, color: str) -> str:
+    bg = {"black": "40",
+          "red": "41",
+          "green": "42"}
+    return f"\x1b[{bg[color]}m\x1b[97m{num_str}\x1b[0m"
@@ -0,0 +1,580 @@
+"""
+A roulette table.
+
+`Roulette` plays any wheel in `wheels`; its bets, header and betting
+layout all follow from the wheel it is given. Each table keeps everything
+that changes while it plays to itself: its players' bets, its spin history,
+its random number generator and its cache of wheel drawings. Module-level
+data is only ever read, so any number of tables can run side by side in
+one process.
+"""
+
+import random
+import sys
+import time
+from time import sleep
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from casino.accounts import Account
+from casino.types import GameContext
+from casino.utils import clear_screen, cprint, cinput, display_topbar
+from .bets import BET_NAMES, BetSlip, pocket_index, split_labels
+from .history import SpinHistory, history_board, wheel_log_path
+from .render import cprint_ansi_center, cprint_table_center, render_cell
+from .wheels import BET_TABLES, GRID_COLS, GRID_ROWS, HEADERS, LAYOUTS, WheelPocket
+
+HEADER_MARGIN = 1
+
+TOTAL_ROTATIONS = 2
+SEC_BTWN_SPIN = 0.04
+
+
+class Roulette:
+    """
+    One roulette table.
+
+    Attributes:
+        wheel (tuple[WheelPocket, ...]): The roulette wheel, where each entry
+            is a tuple like ("0", "green", row, col).
+        accounts (list[Account]): List of all player accounts.
+        bet_table (BetTable): Every bet on this wheel and its payouts.
+        slip (BetSlip): The current round's bets. Accounts are referred to by
+            their index in `accounts`, and a player may place any number of
+            bets on a round.
+        last_slip (BetSlip): The previous round's bets, for repeating them.
+        history (SpinHistory): Spins at this table, kept for the whole session.
+        rng (random.Random): Picks the winning pocket of every spin.
+
+        Stakes stay in the players' balances while they bet; each player's
+        total stake is withdrawn in one go by `collect_stakes` before the
+        wheel spins.
+    """
+
+    def __init__(
+        self,
+        accounts: List[Account],
+        wheel: Sequence[WheelPocket],
+        history_path: str = "",
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """
+        Initializes roulette
+
+        Spins are appended to this wheel's log next to `history_path`, if one
+        is given (see `wheel_log_path`).
+        """
+        self.wheel = tuple(wheel)
+        self.num_pockets = len(self.wheel)
+        self.header = HEADERS[self.num_pockets]
+        self.layout = LAYOUTS[self.num_pockets]
+        self.bet_table = BET_TABLES[self.num_pockets]
+        self.rng = rng or random.Random()
+
+        self.accounts = accounts
+
+        # Current and previous round's bets
+        self.slip = BetSlip(len(accounts))
+        self.last_slip: Optional[BetSlip] = None
+        self.history = SpinHistory(self.num_pockets, path=wheel_log_path(history_path, self.num_pockets))
+        self.winning_value: Optional[WheelPocket] = None
+
+        # Lines of the wheel drawing, by the pocket highlighted on it
+        self._frames: dict[Optional[str], list[str]] = {}
+
+    def close(self) -> None:
+        self.history.close()
+
+    def display_roulette_topbar(self, ctx: GameContext) -> None:
+        display_topbar(ctx.account, header=self.header, margin=HEADER_MARGIN)
+
+    def refresh_roulette_topbar(self, ctx: GameContext) -> None:
+        # Number of lines occupied by the topbar: header (3 lines) + user/balance line + margin
+        header_lines = len(self.header.strip("\n").splitlines())
+        total_lines = header_lines + 1 + HEADER_MARGIN
+
+        sys.stdout.write("\x1b[s")  # Save current cursor position
+        sys.stdout.write("\x1b[H")  # Move cursor to top-left corner
+
+        # Clear all topbar lines
+        for _ in range(total_lines):
+            sys.stdout.write("\x1b[2K")  # clear line
+            sys.stdout.write("\x1b[1B")  # down 1 line
+
+        # Move back to top-left and redraw the topbar
+        sys.stdout.write("\x1b[H")
+        self.display_roulette_topbar(ctx)
+
+        # Restore cursor position so the rest of the screen stays intact
+        sys.stdout.write("\x1b[u")
+        sys.stdout.flush()
+
+    def render_header(self, ctx: GameContext) -> None:
+        clear_screen()
+        self.display_roulette_topbar(ctx)
+
+    def render_outside_bets_menu(self, ctx: GameContext) -> None:
+        self.render_header(ctx)
+        title = "Outside bets:"
+        options = [
+            "[1] Red / Black",
+            "[2] Odd / Even",
+            "[3] High / Low",
+            "[4] Dozen",
+            "[5] Column",
+        ]
+
+        content_width = max(len(title), *(len(o) for o in options))
+        left_pad = 2
+        right_pad = 2
+        box_width = content_width + left_pad + right_pad
+
+        cprint("┌" + "─" * box_width + "┐")
+        cprint("│" + title.center(box_width) + "│")
+        cprint("│" + " " * box_width + "│")
+
+        for opt in options:
+            line = " " * left_pad + opt.ljust(content_width) + " " * right_pad
+            cprint("│" + line + "│")
+
+        cprint("└" + "─" * box_width + "┘")
+
+    def prompt_with_error(self, ctx: GameContext, prompt: str, validator, error_text: str,
+                          render_table: bool = False, transform=lambda s: s.strip().lower()):
+        last_error = ""
+        while True:
+            self.render_header(ctx)
+            if render_table:
+                cprint_table_center(self.layout)
+            if last_error:
+                cprint(f"🤵: {last_error}")
+
+            answer = transform(cinput(prompt))
+            if validator(answer):
+                return answer
+            last_error = error_text
+
+    def wheel_frame(self, highlighted_num: Optional[str] = None) -> list[str]:
+        """Lines of the wheel drawing with `highlighted_num` marked, drawn once per pocket."""
+        frame = self._frames.get(highlighted_num)
+        if frame is None:
+            grid = [[' '] * GRID_COLS for _ in range(GRID_ROWS)]
+            for (num_str, color, row, col) in self.wheel:
+                if num_str == highlighted_num:
+                    # the spot in the column before and column after the number become *'s
+                    grid[row][col - 1] = "*"
+                    grid[row][col + 1] = "*"
+                grid[row][col] = render_cell(num_str.rjust(2), color)
+            frame = self._frames[highlighted_num] = ["".join(row) for row in grid]
+        return frame
+
+    def print_wheel(self, highlighted_num: Optional[str] = None) -> None:
+        # Center the wheel in the terminal
+        for line in self.wheel_frame(highlighted_num):
+            cprint_ansi_center(line)
+
+    def wheel_animation(self, ctx: GameContext, sequence, sec_btwn_spins: float = SEC_BTWN_SPIN) -> None:
+        for num in sequence:
+            clear_screen()
+            self.display_roulette_topbar(ctx)
+            self.print_wheel(highlighted_num=num)
+            time.sleep(sec_btwn_spins)
+
+    def spin(self) -> int:
+        """Pick the winning pocket and record it; returns its place on the wheel."""
+        random_index = self.rng.randrange(len(self.wheel))
+        self.winning_value = self.wheel[random_index]
+        self.history.record(pocket_index(self.winning_value[0]))
+        return random_index
+
+    def spin_wheel(self, ctx: GameContext) -> WheelPocket:
+        """
+        Pick a winning color and number, and show the wheel landing on it.
+
+        Returns:
+            tuple[str, str, int, int]: The winning pocket, starting with:
+                - str: The winning number (e.g., "28", "00", "0")
+                - str: The winning color (either "red", "green" or "black")
+        """
+        random_index = self.spin()
+        assert self.winning_value is not None
+
+        wheel_sequence = [num for num, _, _, _ in self.wheel]
+
+        # do TOTAL_ROTATIONS number of rotations before landing on number
+        sequence = (wheel_sequence * TOTAL_ROTATIONS) + wheel_sequence[:random_index + 1]
+        self.wheel_animation(ctx, sequence)
+
+        winning_number = self.winning_value[0]
+        winning_color = self.winning_value[1]
+
+        cprint(f"Winning number: {winning_number}")
+        cprint(f"Winning color: {winning_color}")
+
+        player_bets = [bet for index, account in enumerate(self.accounts) if account.aid == ctx.account.aid
+                       for bet in self.slip.bets_of(index)]
+        if not player_bets:
+            cprint("Your bets: (none)")
+        else:
+            cprint(f"Your bets: {', '.join(self._format_bet(bet_id, amount) for bet_id, amount in player_bets)}")
+
+        return self.winning_value
+
+    def print_history(self) -> None:
+        for line in history_board(self.history, render_cell):
+            cprint_ansi_center(line)
+
+    def reset_round(self) -> None:
+        if len(self.slip):
+            self.last_slip = self.slip
+        self.slip = BetSlip(len(self.accounts))
+        self.winning_value = None
+
+    def repeat_bets(self, double: bool = False) -> Optional[str]:
+        """
+        Place the previous round's bets again, at twice the stakes if `double`.
+
+        Returns an error message, and places nothing, if there are no bets
+        to repeat or a player can't cover their stakes.
+        """
+        if self.last_slip is None:
+            return "There are no bets to repeat yet."
+
+        slip = self.last_slip.doubled() if double else self.last_slip.repeat()
+        balances = np.array([account.balance for account in self.accounts], dtype=np.int64)
+        short = np.flatnonzero(slip.over_balance(balances))
+        if len(short):
+            return f"Player {short[0] + 1} can't cover {slip.total(int(short[0]))} coins of bets."
+        self.slip = slip
+        return None
+
+    def collect_stakes(self) -> None:
+        """Withdraw every player's total stake for the round."""
+        for account, total in zip(self.accounts, self.slip.totals.tolist()):
+            if total:
+                account.withdraw(total)
+
+    def submit_bets(self, ctx: GameContext) -> None | str:
+        """
+        Instruct users to submit bets.
+
+        Each player may place any number of bets, each either an inside bet
+        on one number or neighbouring numbers, or an outside bet.
+        """
+
+        # Loop over all users
+        player_index = 0
+        adding = False  # The player asked to place another bet
+        while player_index < len(self.accounts):
+            if self._all_players_bankrupt():
+                cprint("🤵: All players have gone bankrupt. "
+                       "You cannot play any more roulette.")
+                sleep(3)
+                return "BANKRUPT"
+
+            if self.accounts[player_index].balance == 0:
+                cprint(f"Skipping player {player_index + 1} because of empty balance...")
+                player_index += 1
+                continue
+
+            will_bet = "y" if adding else self.prompt_with_error(
+                ctx=ctx,
+                prompt=f"🤵: Would you like to bet, Player {player_index + 1} (y/N): ",
+                validator=lambda a: a in {"", "y", "yes", "n", "no"},
+                error_text="Invalid input. Enter either 'Y' for yes or 'N' for no.",
+                render_table=False,
+                transform=lambda s: s.strip().lower(),
+            )
+
+            if will_bet in {"", "n", "no"}:
+                cprint("User skipped betting. Moving to next user...", end="\n\n")
+                player_index += 1
+                continue
+
+            bet_amount = self._prompt_bet_amount(ctx, player_index)
+
+            # Ask for desired bet type
+            area = self._prompt_bet_area(ctx)
+
+            self.render_header(ctx)
+
+            # Color or number betting
+            if area == "inside":
+                bet_type, bet_value = self._prompt_inside_bet(ctx)
+            else:
+                bet_type = self._prompt_outside_type(ctx)
+                bet_value = self._prompt_outside_value(ctx, bet_type)
+
+            # Once values are successfully chosen, add to the slip
+            self._save_bet(player_index, bet_type, bet_value, bet_amount)
+
+            if self.slip.total(player_index) < self.accounts[player_index].balance:
+                another = self.prompt_with_error(
+                    ctx=ctx,
+                    prompt=f"🤵: Place another bet, Player {player_index + 1} (y/N): ",
+                    validator=lambda a: a in {"", "y", "yes", "n", "no"},
+                    error_text="Invalid input. Enter either 'Y' for yes or 'N' for no.",
+                    render_table=False,
+                    transform=lambda s: s.strip().lower(),
+                )
+                adding = another in {"y", "yes"}
+                if adding:
+                    continue
+
+            adding = False
+            player_index += 1  # Move to next user
+
+    def _all_players_bankrupt(self) -> bool:
+        return sum(a.balance for a in self.accounts) == 0
+
+    def _prompt_bet_amount(self, ctx: GameContext, player_index: int) -> int:
+        """Ask for bet amount, check it against what the player has left to bet, and return it."""
+        balance = self.accounts[player_index].balance
+        available = balance - self.slip.total(player_index)
+
+        raw = self.prompt_with_error(
+            ctx=ctx,
+            prompt=f"Player {player_index + 1}'s Bet: ",
+            validator=lambda s: s.isdigit() and self.slip.fits(player_index, int(s), balance),
+            error_text=f"Please enter a positive integer up to {available}.",
+            render_table=False,
+            transform=lambda s: s.strip(),
+        )
+
+        bet_amount = int(raw)
+
+        self.render_header(ctx)
+        return bet_amount
+
+    def _prompt_bet_area(self, ctx: GameContext) -> str:
+        """Return 'inside' or 'outside'."""
+        ans = self.prompt_with_error(
+            ctx=ctx,
+            prompt="🤵: Choose your bet area: [I]nside (numbers) / [O]utside: ",
+            validator=lambda a: a in {"i", "inside", "o", "outside"},
+            error_text="Choose 'I' for inside or 'O' for outside.",
+            render_table=False,
+            transform=lambda s: s.strip().lower(),
+        )
+        if ans in {"i", "inside"}:
+            return "inside"
+        else:
+            return "outside"
+
+    def _is_inside_bet(self, answer: str) -> bool:
+        try:
+            self.bet_table.inside_bet_id(split_labels(answer))
+        except ValueError:
+            return False
+        return True
+
+    def _prompt_inside_bet(self, ctx: GameContext) -> tuple[str, str]:
+        """
+        Inside bet: the numbers it covers, as a straight-up (17), split
+        (17-20), street (13-14-15), corner (17-18-20-21), six line
+        (1-2-3-4-5-6) or, on a double-zero wheel, the basket (0-00-1-2-3).
+        Returns the bet's type and value.
+        """
+        answer = self.prompt_with_error(
+            ctx=ctx,
+            prompt="🤵: Enter the numbers to bet on, separated by '-' (e.g. 17, 17-20, 13-14-15): ",
+            validator=self._is_inside_bet,
+            error_text="Those numbers aren't a bet. Pick one number, or neighbours on the table.",
+            render_table=True,
+            transform=lambda s: s.strip(),
+        )
+        bet = self.bet_table.definitions[self.bet_table.inside_bet_id(split_labels(answer))]
+        return bet.kind, bet.value
+
+    def _prompt_outside_type(self, ctx: GameContext) -> str:
+        """Return outside bet type identifier."""
+        mapping = {
+            "1": "outside_color",
+            "2": "outside_parity",
+            "3": "outside_highlow",
+            "4": "outside_dozen",
+            "5": "outside_column",
+        }
+
+        last_error = ""
+        while True:
+            self.render_outside_bets_menu(ctx)
+            if last_error:
+                cprint(last_error)
+
+            choice = cinput("🤵: Choose option (1-5): ").strip()
+            if choice in mapping:
+                return mapping[choice]
+            last_error = "Choose a number from 1 to 5."
+
+    def _prompt_outside_value(self, ctx: GameContext, bet_type: str) -> str:
+        """Prompt for the value of an outside bet."""
+        if bet_type == "outside_color":
+            ans = self.prompt_with_error(
+                ctx=ctx,
+                prompt="🤵: Choose color [R]ed / [B]lack / [G]reen: ",
+                validator=lambda a: a in {"r", "red", "b", "black", "g", "green"},
+                error_text="Choose red, black or green.",
+                render_table=False,
+                transform=lambda s: s.strip().lower(),
+            )
+            return {"r": "red", "b": "black", "g": "green"}.get(ans, ans)
+
+        if bet_type == "outside_parity":
+            ans = self.prompt_with_error(
+                ctx=ctx,
+                prompt="🤵: Choose [O]dd / [E]ven: ",
+                validator=lambda a: a in {"o", "odd", "e", "even"},
+                error_text="Choose odd or even.",
+                render_table=False,
+                transform=lambda s: s.strip().lower(),
+            )
+            if ans in {"o", "odd"}:
+                return "odd"
+            else:
+                return "even"
+
+        if bet_type == "outside_highlow":
+            ans = self.prompt_with_error(
+                ctx=ctx,
+                prompt="🤵: Choose [L]ow (1-18) / [H]igh (19-36): ",
+                validator=lambda a: a in {"l", "low", "h", "high"},
+                error_text="Choose low or high.",
+                render_table=True,
+                transform=lambda s: s.strip().lower(),
+            )
+            if ans in {"l", "low"}:
+                return "low"
+            else:
+                return "high"
+
+        if bet_type == "outside_column":
+            ans = self.prompt_with_error(
+                ctx=ctx,
+                prompt="🤵: Choose column: [1]=1st [2]=2nd [3]=3rd: ",
+                validator=lambda a: a in {"1", "2", "3"},
+                error_text="Choose 1, 2, or 3.",
+                render_table=True,
+                transform=lambda s: s.strip().lower(),
+            )
+            return ans
+
+        if bet_type == "outside_dozen":
+            ans = self.prompt_with_error(
+                ctx=ctx,
+                prompt="🤵: Choose dozen: [1]=1-12 [2]=13-24 [3]=25-36: ",
+                validator=lambda a: a in {"1", "2", "3"},
+                error_text="Choose 1, 2, or 3.",
+                render_table=True,
+                transform=lambda s: s.strip().lower(),
+            )
+            return ans
+
+        raise ValueError(f"Unknown outside bet type: {bet_type}")
+
+    def _save_bet(self, player_index: int, bet_type: str, bet_value: str, bet_amount: int) -> None:
+        self.slip.add(player_index, self.bet_table.bet_id(bet_type, bet_value), bet_amount)
+
+    def _format_bet(self, bet_id: int, amount: int) -> str:
+        bet = self.bet_table.definitions[bet_id]
+        t = bet.kind
+        v = bet.value
+        a = amount
+
+        if t.startswith("inside_"):
+            return f"{a} on {BET_NAMES[t]} {v}"
+
+        if t == "outside_color":
+            return f"{a} on {v} (color)"
+
+        if t == "outside_parity":
+            return f"{a} on {v} (parity)"
+
+        if t == "outside_highlow":
+            return f"{a} on {v} (high/low)"
+
+        if t == "outside_dozen":
+            label = {"1": "1-12", "2": "13-24", "3": "25-36"}[v]
+            return f"{a} on dozen {v} ({label})"
+
+        if t == "outside_column":
+            return f"{a} on column {v}"
+
+        return f"{a} on {t}:{v}"
+
+    def payout(self) -> None:
+        assert self.winning_value is not None
+        winning_number = self.winning_value[0]
+
+        cprint("Paying out all winners...")
+        returns = self.slip.resolve(self.bet_table, pocket_index(winning_number))
+
+        for index, (account, staked, win_amount) in enumerate(
+                zip(self.accounts, self.slip.totals.tolist(), returns.tolist())):
+            if not staked:
+                continue
+            if win_amount > 0:
+                account.deposit(win_amount)
+                cprint(f"Player {index + 1}: Won {win_amount} coins.")
+            else:
+                cprint(f"Player {index + 1}: Lost {staked} coins.")
+
+        cprint("Finished payout.")
+
+
+def play_table(context: GameContext, roulette: Roulette) -> None:
+    """Play rounds at `roulette` until the player quits, then close it."""
+    try:
+        play_rounds(context, roulette)
+    finally:
+        roulette.close()
+
+
+def play_rounds(context: GameContext, roulette: Roulette) -> None:
+    error = ""
+    while True:
+        roulette.reset_round()
+        roulette.render_header(context)
+        roulette.print_history()
+        if error:
+            cprint(f"🤵: {error}")
+
+        # Input to stop loop from running constantly
+        choice = cinput("Press [Enter] to start a new round, [r] to repeat your last bets, "
+                        "[d] to double them and [q] to quit: ").strip().lower()
+
+        if choice in {"q", "quit"}:
+            return
+
+        if choice in {"r", "repeat", "d", "double"}:
+            error = roulette.repeat_bets(double=choice in {"d", "double"}) or ""
+            if error:
+                continue
+        else:
+            status = roulette.submit_bets(context)
+            if status == "BANKRUPT":
+                return
+
+        roulette.collect_stakes()
+        roulette.spin_wheel(context)
+        roulette.payout()
+        roulette.refresh_roulette_topbar(context)
+
+        # play again?
+        play_again = cinput("🤵: Would you like to play another round (Y/n): ").strip().lower()
+        if play_again in {"", "y", "yes"}:
+            pass  # next round
+        elif play_again in {"n", "no"}:
+            return
+        else:
+            play_again = roulette.prompt_with_error(
+                ctx=context,
+                prompt="🤵: Would you like to play another round (Y/n): ",
+                validator=lambda a: a in {"", "y", "yes", "n", "no"},
+                error_text="Please enter 'Yes' or 'No'.",
+                render_table=False,
+                transform=lambda s: s.strip().lower(),
+            )
+            if play_again in {"n", "no"}:
+                return
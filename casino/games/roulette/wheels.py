@@ -0,0 +1,145 @@
+"""
+The roulette wheels, and how each is drawn.
+
+A wheel is a list of its pockets in the order they sit around the wheel:
+(label, color, row, col), where row and col place the pocket on the
+drawing of the wheel. Everything else about a table (its bets, its
+header and its betting layout) follows from the wheel, looked up by how
+many pockets it has.
+
+Nothing here is changed after import, so any number of tables can share it.
+"""
+
+from .bets import AMERICAN_BETS, AMERICAN_POCKETS, EUROPEAN_BETS, EUROPEAN_POCKETS, BetTable
+
+WheelPocket = tuple[str, str, int, int]
+
+# Size of the wheel drawing, in cells
+GRID_ROWS, GRID_COLS = 17, 33
+
+STANDARD_EUROPEAN_ROULETTE_WHEEL: tuple[WheelPocket, ...] = (
+    ('0', 'green', 0, 14),
+    ('32', 'red', 0, 17),
+    ('15', 'black', 0, 20),
+    ('19', 'red', 1, 24),
+    ('4', 'black', 2, 27),
+    ('21', 'red', 3, 28),
+    ('2', 'black', 4, 30),
+    ('25', 'red', 5, 30),
+    ('17', 'black', 6, 31),
+    ('34', 'red', 7, 31),
+    ('6', 'black', 8, 31),
+    ('27', 'red', 9, 31),
+    ('13', 'black', 10, 31),
+    ('36', 'red', 11, 30),
+    ('11', 'black', 12, 30),
+    ('30', 'red', 13, 28),
+    ('8', 'black', 14, 26),
+    ('23', 'red', 15, 24),
+    ('10', 'black', 16, 19),
+    ('5', 'red', 16, 16),
+    ('24', 'black', 16, 13),
+    ('16', 'red', 15, 8),
+    ('33', 'black', 14, 6),
+    ('1', 'red', 13, 4),
+    ('20', 'black', 12, 2),
+    ('14', 'red', 11, 2),
+    ('31', 'black', 10, 1),
+    ('9', 'red', 9, 1),
+    ('22', 'black', 8, 1),
+    ('18', 'red', 7, 1),
+    ('29', 'black', 6, 1),
+    ('7', 'red', 5, 2),
+    ('28', 'black', 4, 2),
+    ('12', 'red', 3, 4),
+    ('35', 'black', 2, 5),
+    ('3', 'red', 1, 8),
+    ('26', 'black', 0, 11),
+)
+
+STANDARD_AMERICAN_ROULETTE_WHEEL: tuple[WheelPocket, ...] = (
+    ('0', 'green', 0, 13),
+    ('28', 'black', 0, 16),
+    ('9', 'red', 0, 19),
+    ('26', 'black', 1, 24),
+    ('30', 'red', 2, 26),
+    ('11', 'black', 3, 27),
+    ('7', 'red', 4, 29),
+    ('20', 'black', 5, 29),
+    ('32', 'red', 6, 30),
+    ('17', 'black', 7, 30),
+    ('5', 'red', 8, 30),
+    ('22', 'black', 9, 30),
+    ('34', 'red', 10, 30),
+    ('15', 'black', 11, 29),
+    ('3', 'red', 12, 29),
+    ('24', 'black', 13, 27),
+    ('36', 'red', 14, 26),
+    ('13', 'black', 15, 24),
+    ('1', 'red', 16, 19),
+    ('00', 'green', 16, 16),
+    ('27', 'red', 16, 13),
+    ('10', 'black', 16, 10),
+    ('25', 'red', 15, 7),
+    ('29', 'black', 14, 6),
+    ('12', 'red', 13, 4),
+    ('8', 'black', 12, 3),
+    ('19', 'red', 11, 3),
+    ('31', 'black', 10, 2),
+    ('18', 'red', 9, 2),
+    ('6', 'black', 8, 2),
+    ('21', 'red', 7, 2),
+    ('33', 'black', 6, 2),
+    ('16', 'red', 5, 3),
+    ('4', 'black', 4, 3),
+    ('23', 'red', 3, 5),
+    ('35', 'black', 2, 6),
+    ('14', 'red', 1, 8),
+    ('2', 'black', 0, 10),
+)
+
+EUROPEAN_HEADER = """
+┌────────────────────────────────────────────────┐
+│     ♠ E U R O P E A N    R O U L E T T E ♠     │
+└────────────────────────────────────────────────┘
+"""
+
+AMERICAN_HEADER = """
+┌─────────────────────────────┐
+│     ♠ R O U L E T T E ♠     │
+└─────────────────────────────┘
+"""
+
+EUROPEAN_LAYOUT = """
+      ┌───────────────────────────────────────────────────────────┐
+      │         [L]ow = 1-18        │        [H]igh = 19-36       │
+┌─────────────────────────────────────────────────────────────────┐───────────┐ C
+│     │  3 │  6 │  9 │ 12 │ 15 │ 18 │ 21 │ 24 │ 27 │ 30 │ 33 │ 36 │ [3] = 3rd │ O
+│     │────│────│────│────│────│────│────│────│────│────│────│────│───────────│ L
+│  0  │  2 │  5 │  8 │ 11 │ 14 │ 17 │ 20 │ 23 │ 26 │ 29 │ 32 │ 35 │ [2] = 2nd │ U
+│     │────│────│────│────│────│────│────│────│────│────│────│────│───────────│ M
+│     │  1 │  4 │  7 │ 10 │ 13 │ 16 │ 19 │ 22 │ 25 │ 28 │ 31 │ 34 │ [1] = 1st │ N
+└─────────────────────────────────────────────────────────────────┘───────────┘ S
+      │     [1] = 1-12    │    [2] = 13-24    │    [3] = 25-36    │
+      └───────────────────────────────────────────────────────────┘
+                          D   O   Z   E   N   S                   
+"""
+
+AMERICAN_LAYOUT = """
+      ┌───────────────────────────────────────────────────────────┐
+      │         [L]ow = 1-18        │        [H]igh = 19-36       │
+┌─────────────────────────────────────────────────────────────────┐───────────┐ C
+│     │  3 │  6 │  9 │ 12 │ 15 │ 18 │ 21 │ 24 │ 27 │ 30 │ 33 │ 36 │ [3] = 3rd │ O
+│ 00  │────│────│────│────│────│────│────│────│────│────│────│────│───────────│ L
+│─────│  2 │  5 │  8 │ 11 │ 14 │ 17 │ 20 │ 23 │ 26 │ 29 │ 32 │ 35 │ [2] = 2nd │ U
+│  0  │────│────│────│────│────│────│────│────│────│────│────│────│───────────│ M
+│     │  1 │  4 │  7 │ 10 │ 13 │ 16 │ 19 │ 22 │ 25 │ 28 │ 31 │ 34 │ [1] = 1st │ N
+└─────────────────────────────────────────────────────────────────┘───────────┘ S
+      │     [1] = 1-12    │    [2] = 13-24    │    [3] = 25-36    │
+      └───────────────────────────────────────────────────────────┘
+                          D   O   Z   E   N   S                   
+"""
+
+HEADERS = {EUROPEAN_POCKETS: EUROPEAN_HEADER, AMERICAN_POCKETS: AMERICAN_HEADER}
+LAYOUTS = {EUROPEAN_POCKETS: EUROPEAN_LAYOUT, AMERICAN_POCKETS: AMERICAN_LAYOUT}
+BET_TABLES: dict[int, BetTable] = {EUROPEAN_POCKETS: EUROPEAN_BETS, AMERICAN_POCKETS: AMERICAN_BETS}
@@ -0,0 +1,169 @@
+"""
+Slots autoplay.
+
+Spins are worked out in batches with `spin_batch`: the stops of every spin
+in the batch are drawn at once and all their paylines settled with one
+`line_pays` call. `autoplay` checks the stop conditions against the whole
+batch, cuts it at the first spin that meets one, and yields the batch so
+the caller can settle it with a single balance update. Spins past the cut
+are thrown away, so the result is exactly as if the spins had been played
+one at a time. A mystery jackpot is one of the stop conditions: each spin
+of the batch draws whether it hits, so autoplay stops on the spin that
+wins it.
+
+Nothing here draws to the screen, so simulations use the same API as
+`play_slots`.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+from .machine import SlotMachine, line_pays
+
+BATCH_SIZE = 1_000
+
+# Reasons autoplay stopped
+SPINS_DONE   = "spins done"
+LOSS_LIMIT   = "loss limit reached"
+BIG_WIN      = "big win"
+BALANCE_LOW  = "balance too low"
+JACKPOT      = "jackpot"
+
+
+@dataclass(frozen=True)
+class AutoplayLimits:
+    """
+    When to stop autoplay; None leaves a condition out.
+
+    Attributes:
+        spins: spins to play
+        loss_limit: stop once the net loss reaches this many chips
+        win_threshold: stop after a spin that wins at least this many chips
+        balance_floor: stop before a spin that could take the balance
+            below this many chips
+    """
+    spins: int
+    loss_limit: Optional[int] = None
+    win_threshold: Optional[int] = None
+    balance_floor: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class SpinBatch:
+    """
+    Results of a batch of spins, one entry per spin.
+
+    Attributes:
+        stops: reel stops
+        won: chips won on the winning lines
+        net: chips won minus the bets on the losing lines
+    """
+    stops: np.ndarray
+    won: np.ndarray
+    net: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.net)
+
+    def __getitem__(self, index: slice) -> "SpinBatch":
+        return SpinBatch(self.stops[index], self.won[index], self.net[index])
+
+
+@dataclass(frozen=True)
+class AutoplayBatch:
+    """
+    One settled batch of autoplay.
+
+    Attributes:
+        spins: spins played in the batch
+        net: net chips over the batch, to add to the balance
+        biggest_win: most chips won on one spin of the batch
+        last_stops: reel stops of the last spin
+        stop_reason: why autoplay stopped after this batch, None if it goes on
+    """
+    spins: int
+    net: int
+    biggest_win: int
+    last_stops: tuple[int, ...]
+    stop_reason: Optional[str]
+
+
+def spin_batch(
+    machine: SlotMachine,
+    bets: Sequence[int],
+    count: int,
+    rng: np.random.Generator,
+) -> SpinBatch:
+    """Play `count` spins with `bets[i]` on payline `i`."""
+    stops = np.stack([table.sample(count, rng) for table in machine.stop_tables], axis=1)
+    bets = np.array(bets, dtype=np.int64)
+    pays = line_pays(machine, stops)[:, :len(bets)]
+    won = (pays * bets).sum(axis=1).astype(np.int64)
+    lost = np.where(pays == 0, bets, 0).sum(axis=1)
+    return SpinBatch(stops, won, won - lost)
+
+
+def autoplay(
+    machine: SlotMachine,
+    bets: Sequence[int],
+    balance: int,
+    limits: AutoplayLimits,
+    rng: Optional[np.random.Generator] = None,
+    batch_size: int = BATCH_SIZE,
+    jackpot_odds: Optional[float] = None,
+) -> Iterator[AutoplayBatch]:
+    """
+    Spin until a stop condition is met, one batch at a time.
+
+    `balance` is the balance when autoplay starts; every yielded batch's
+    `net` should be applied to it before the next one is asked for. With
+    `jackpot_odds`, each spin wins the jackpot with that chance and
+    autoplay stops with `JACKPOT` after the spin that does.
+    """
+    rng = rng or np.random.default_rng()
+    stake = sum(bets)
+    floor = max(limits.balance_floor or 0, 0)
+    played = 0
+    total_net = 0
+    if balance - stake < floor or limits.spins <= 0:
+        return
+
+    while True:
+        batch = spin_batch(machine, bets, min(batch_size, limits.spins - played), rng)
+        balances = balance + np.cumsum(batch.net)
+        nets = total_net + np.cumsum(batch.net)
+
+        # A spin meeting any condition is the last one played
+        conditions = []
+        if jackpot_odds is not None:
+            conditions.append((JACKPOT, rng.random(len(batch)) < jackpot_odds))
+        conditions.append((BALANCE_LOW, balances - stake < floor))
+        if limits.loss_limit is not None:
+            conditions.append((LOSS_LIMIT, nets <= -limits.loss_limit))
+        if limits.win_threshold is not None:
+            conditions.append((BIG_WIN, batch.won >= limits.win_threshold))
+        stop = np.logical_or.reduce([met for _, met in conditions])
+
+        reason = None
+        if stop.any():
+            last = int(np.argmax(stop))
+            batch = batch[:last + 1]
+            reason = next(name for name, met in conditions if met[last])
+        elif played + len(batch) == limits.spins:
+            reason = SPINS_DONE
+
+        net = int(batch.net.sum())
+        played += len(batch)
+        total_net += net
+        balance += net
+        yield AutoplayBatch(
+            spins=len(batch),
+            net=net,
+            biggest_win=int(batch.won.max()),
+            last_stops=tuple(int(stop) for stop in batch.stops[-1]),
+            stop_reason=reason,
+        )
+        if reason is not None:
+            return
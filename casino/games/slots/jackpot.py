@@ -0,0 +1,215 @@
+"""
+Progressive jackpot shared by every running casino.
+
+The pot lives in a SQLite database in WAL mode, so any number of processes
+can play against it at once. Every spin puts a share of its stake into the
+pot. Each process adds up its own contributions and writes them in one
+statement every `flush_every` spins or `flush_ms` milliseconds, whichever
+comes first. Contributions come out of the house edge, not the player's
+balance.
+
+A claim runs in a single write transaction. It flushes the claimer's own
+pending contributions, reads the pot, pays it out and reseeds it, so two
+processes can never both be paid the same pot. The pot is kept in
+thousandths of a chip so fractional contributions add up exactly. Whole
+chips are paid out and the fraction stays in the pot.
+
+The jackpot is a mystery jackpot: any spin can win it, with a fixed chance
+that doesn't depend on the reels.
+"""
+
+import random
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+MILLI = 1000
+
+SEED_CHIPS = 1000
+CONTRIBUTION_RATE = 0.01
+JACKPOT_ODDS = 1 / 100_000
+
+FLUSH_EVERY = 50
+FLUSH_MS = 500
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS jackpot (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        pot_milli INTEGER NOT NULL,
+        contributed_milli INTEGER NOT NULL DEFAULT 0,
+        seeded_milli INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS claims (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        winner TEXT NOT NULL,
+        paid INTEGER NOT NULL,
+        claimed_at REAL NOT NULL
+    )""",
+)
+
+
+class JackpotStore:
+    """
+    One process's connection to the shared jackpot.
+
+    Call `contribute` on every spin, `claim` when a spin hits the jackpot,
+    and `close` when done so no contribution is lost.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        seed_chips: int = SEED_CHIPS,
+        contribution_rate: float = CONTRIBUTION_RATE,
+        flush_every: int = FLUSH_EVERY,
+        flush_ms: float = FLUSH_MS,
+    ) -> None:
+        self.path = path
+        self.seed_milli = seed_chips * MILLI
+        self.contribution_rate = contribution_rate
+        self.flush_every = flush_every
+        self.flush_ms = flush_ms
+        self.pending_milli = 0
+        self.pending_spins = 0
+        self.last_flush = time.perf_counter()
+
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("BEGIN IMMEDIATE")
+        for statement in SCHEMA:
+            self.db.execute(statement)
+        self.db.execute(
+            "INSERT OR IGNORE INTO jackpot (id, pot_milli, seeded_milli) VALUES (1, ?, ?)",
+            (self.seed_milli, self.seed_milli),
+        )
+        self.db.execute("COMMIT")
+
+    def __enter__(self) -> "JackpotStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def pot(self) -> int:
+        """Whole chips in the pot, this process's unflushed share included."""
+        (pot_milli,) = self.db.execute("SELECT pot_milli FROM jackpot WHERE id = 1").fetchone()
+        return (pot_milli + self.pending_milli) // MILLI
+
+    def contribute(self, stake: int, spins: int = 1) -> None:
+        """Add the share of `stake` chips bet over `spins` spins."""
+        self.pending_milli += round(stake * self.contribution_rate * MILLI)
+        self.pending_spins += spins
+        elapsed_ms = (time.perf_counter() - self.last_flush) * 1000
+        if self.pending_spins >= self.flush_every or elapsed_ms >= self.flush_ms:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending_milli:
+            self.db.execute(
+                "UPDATE jackpot SET pot_milli = pot_milli + ?1, contributed_milli = contributed_milli + ?1"
+                " WHERE id = 1",
+                (self.pending_milli,),
+            )
+        self.pending_milli = 0
+        self.pending_spins = 0
+        self.last_flush = time.perf_counter()
+
+    def claim(self, winner: str) -> int:
+        """Pay the whole pot to `winner` and reseed it; returns the chips won."""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.flush()
+            (pot_milli,) = self.db.execute("SELECT pot_milli FROM jackpot WHERE id = 1").fetchone()
+            paid = pot_milli // MILLI
+            self.db.execute(
+                "UPDATE jackpot SET pot_milli = ?1 + ?2, seeded_milli = seeded_milli + ?1 WHERE id = 1",
+                (self.seed_milli, pot_milli - paid * MILLI),
+            )
+            self.db.execute(
+                "INSERT INTO claims (winner, paid, claimed_at) VALUES (?, ?, ?)",
+                (winner, paid, time.time()),
+            )
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return paid
+
+    def close(self) -> None:
+        if self.db is not None:
+            self.flush()
+            self.db.close()
+            self.db = None
+
+
+def jackpot_hit(spins: int = 1, rng: Optional[random.Random] = None, odds: float = JACKPOT_ODDS) -> bool:
+    """Whether any of `spins` spins wins the jackpot."""
+    rng = rng or random
+    return rng.random() < 1 - (1 - odds) ** spins
+
+
+def ledger(path: str) -> dict[str, int]:
+    """
+    Totals from the jackpot database, in thousandths of a chip.
+
+    Every thousandth that went in (seeds and contributions) is either
+    still in the pot or was paid out, so `seeded + contributed` always
+    equals `pot + paid`.
+    """
+    db = sqlite3.connect(path, timeout=60)
+    try:
+        pot, contributed, seeded = db.execute(
+            "SELECT pot_milli, contributed_milli, seeded_milli FROM jackpot WHERE id = 1").fetchone()
+        claims, paid = db.execute("SELECT COUNT(*), COALESCE(SUM(paid), 0) FROM claims").fetchone()
+    finally:
+        db.close()
+    return {
+        "pot": pot,
+        "contributed": contributed,
+        "seeded": seeded,
+        "paid": paid * MILLI,
+        "claims": claims,
+    }
+
+
+def _stress_worker(path: str, spins: int, stake: int, odds: float, seed: int, flush_every: int) -> tuple[int, int]:
+    """Spin against the shared pot; returns (spins, claims)."""
+    rng = random.Random(seed)
+    claims = 0
+    with JackpotStore(path, flush_every=flush_every) as store:
+        for _ in range(spins):
+            store.contribute(stake)
+            if jackpot_hit(rng=rng, odds=odds):
+                store.claim(f"worker-{seed}")
+                claims += 1
+    return spins, claims
+
+
+def stress(
+    path: str,
+    processes: int,
+    spins: int,
+    stake: int = 10,
+    odds: float = 1 / 1000,
+    flush_every: int = FLUSH_EVERY,
+    seed: Optional[int] = None,
+) -> tuple[int, int]:
+    """
+    Spin `spins` times in each of `processes` processes sharing one pot.
+
+    Returns the total spins and claims.
+    """
+    # Create the database before the workers race to
+    JackpotStore(path).close()
+    rng = random.Random(seed)
+    with ProcessPoolExecutor(processes) as pool:
+        futures = [
+            pool.submit(_stress_worker, path, spins, stake, odds, rng.getrandbits(64), flush_every)
+            for _ in range(processes)
+        ]
+        results = [future.result() for future in futures]
+    return sum(s for s, _ in results), sum(c for _, c in results)
+
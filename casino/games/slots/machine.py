@@ -0,0 +1,297 @@
+"""
+Reel-strip slot machine.
+
+Every reel is a strip of symbols. A spin stops each reel at a random
+position, and the window shows three rows of each reel: the symbol at the
+stop in the middle row, with its neighbours on the strip above and below.
+Stops are equally likely unless the reel has stop weights (a virtual
+reel), which let rare symbols sit on short strips. Stops are drawn from
+alias tables either way. Paylines pick one row per reel, and a line wins
+when every cell on it shows the same symbol. Each line is bet on
+separately. Pays are the chips won per chip bet on the line, and the bet
+is kept on a win.
+
+Lines are matched with bitmasks: each window cell is one bit, each payline
+is the mask of its cells, and a symbol wins a line when the mask of the
+cells it occupies covers the line's mask.
+
+`machine_stats` enumerates every combination of stops to give the exact
+return to player (RTP), hit frequency and variance of a machine.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from casino.sampling import AliasTable
+
+LOW_ITEMS = ["A", "B", "C"]
+HIGH_ITEMS = ["D"]
+ALL_ITEMS = LOW_ITEMS + HIGH_ITEMS
+
+LOW_PAY = 10
+HIGH_PAY = 60
+
+# Six of each low symbol and two high symbols per reel; each reel is
+# ordered differently so the reels don't spin in step
+REEL_STRIPS = (
+    ("A", "B", "C", "A", "D", "B", "C", "A", "B", "C", "A", "B", "C", "D", "A", "B", "C", "A", "B", "C"),
+    ("C", "A", "B", "D", "C", "A", "B", "C", "A", "B", "C", "A", "D", "B", "C", "A", "B", "C", "A", "B"),
+    ("B", "C", "A", "B", "C", "A", "D", "B", "C", "A", "B", "C", "A", "B", "C", "D", "A", "B", "C", "A"),
+)
+
+ROWS = 3
+TOP, MIDDLE, BOTTOM = range(ROWS)
+
+# A payline is the row it crosses on each reel
+Payline = tuple[int, ...]
+
+# Stops enumerated at once by `machine_stats`
+ENUMERATION_CHUNK = 1 << 18
+
+
+def row_line(row: int, reels: int) -> Payline:
+    return (row,) * reels
+
+
+def diagonal_line(reels: int, descending: bool = True) -> Payline:
+    """From the top row to the bottom row across the reels (or bottom to top)."""
+    rows = tuple(round(BOTTOM * i / max(reels - 1, 1)) for i in range(reels))
+    return rows if descending else tuple(BOTTOM - row for row in rows)
+
+
+def v_line(reels: int, inverted: bool = False) -> Payline:
+    """Down to the bottom row in the middle reel and back up (or up and down)."""
+    rows = tuple(min(i, reels - 1 - i, BOTTOM) for i in range(reels))
+    return tuple(BOTTOM - row for row in rows) if inverted else rows
+
+
+def zigzag_line(reels: int, start: int = TOP) -> Payline:
+    """Alternate between `start` and the middle row."""
+    return tuple(start if i % 2 == 0 else MIDDLE for i in range(reels))
+
+
+def standard_paylines(reels: int) -> tuple[Payline, ...]:
+    """Rows first, then diagonals, V's and zig-zags, without repeats."""
+    lines = [
+        row_line(MIDDLE, reels), row_line(TOP, reels), row_line(BOTTOM, reels),
+        diagonal_line(reels), diagonal_line(reels, descending=False),
+        v_line(reels), v_line(reels, inverted=True),
+        zigzag_line(reels, TOP), zigzag_line(reels, BOTTOM),
+    ]
+    return tuple(dict.fromkeys(lines))
+
+
+def build_paytable(
+    low_items: Sequence[str] = LOW_ITEMS,
+    high_items: Sequence[str] = HIGH_ITEMS,
+    low_pay: float = LOW_PAY,
+    high_pay: float = HIGH_PAY,
+) -> dict[str, float]:
+    """Pay for a full line of each symbol."""
+    paytable = {item: low_pay for item in low_items}
+    paytable.update({item: high_pay for item in high_items})
+    return paytable
+
+
+def cell_bit(reel: int, row: int, reels: int) -> int:
+    return 1 << (row * reels + reel)
+
+
+def line_mask(payline: Payline) -> int:
+    """Bitmask of the window cells on a payline."""
+    mask = 0
+    for reel, row in enumerate(payline):
+        mask |= cell_bit(reel, row, len(payline))
+    return mask
+
+
+class LineWin(NamedTuple):
+    line: int
+    symbol: str
+    pay: float
+
+
+@dataclass(frozen=True)
+class SlotMachine:
+    """
+    Reel strips, paylines and the pays for a full line of each symbol.
+
+    Symbols missing from the paytable never pay. `stop_weights` holds a
+    weight for every stop of every reel; leave it empty for equally likely
+    stops.
+    """
+    strips: tuple[tuple[str, ...], ...] = REEL_STRIPS
+    paytable: Mapping[str, float] = field(default_factory=build_paytable)
+    paylines: tuple[Payline, ...] = ()
+    stop_weights: tuple[tuple[float, ...], ...] = ()
+    line_masks: tuple[int, ...] = field(init=False, repr=False, compare=False)
+    stop_tables: tuple[AliasTable, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.paylines:
+            object.__setattr__(self, "paylines", standard_paylines(len(self.strips)))
+        for payline in self.paylines:
+            if len(payline) != len(self.strips) or not all(0 <= row < ROWS for row in payline):
+                raise ValueError(f"Invalid payline {payline} for {len(self.strips)} reels")
+        if len(self.strips) * ROWS > 63:
+            raise ValueError("Too many reels for a 64-bit window mask")
+        object.__setattr__(self, "line_masks", tuple(line_mask(payline) for payline in self.paylines))
+
+        weights = self.stop_weights or tuple((1,) * len(strip) for strip in self.strips)
+        if len(weights) != len(self.strips) or any(len(w) != len(s) for w, s in zip(weights, self.strips)):
+            raise ValueError("Stop weights need one weight per stop of every reel")
+        object.__setattr__(self, "stop_tables", tuple(AliasTable(w) for w in weights))
+
+    @property
+    def reels(self) -> int:
+        return len(self.strips)
+
+    @property
+    def symbols(self) -> list[str]:
+        """Every symbol on the strips, in first-seen order."""
+        return list(dict.fromkeys(symbol for strip in self.strips for symbol in strip))
+
+    def spin(self, rng: Optional[random.Random] = None) -> tuple[int, ...]:
+        """Stop index of each reel."""
+        rng = rng or random
+        return tuple(table.draw(rng) for table in self.stop_tables)
+
+    def window(self, stops: Sequence[int]) -> tuple[tuple[str, ...], ...]:
+        """Rows of symbols in the window, top to bottom."""
+        return tuple(
+            tuple(strip[(stop + row - MIDDLE) % len(strip)] for strip, stop in zip(self.strips, stops))
+            for row in range(ROWS)
+        )
+
+    def line(self, stops: Sequence[int], line: int = 0) -> tuple[str, ...]:
+        """Symbols on one payline for the given stops."""
+        window = self.window(stops)
+        return tuple(window[row][reel] for reel, row in enumerate(self.paylines[line]))
+
+    def pay(self, line: Sequence[str]) -> float:
+        """Chips won per chip bet on a line of symbols, 0 if it does not win."""
+        if len(set(line)) != 1:
+            return 0
+        return self.paytable.get(line[0], 0)
+
+    def symbol_masks(self, window: Sequence[Sequence[str]]) -> dict[str, int]:
+        """Bitmask of the window cells each symbol occupies."""
+        masks: dict[str, int] = {}
+        for row, symbols in enumerate(window):
+            for reel, symbol in enumerate(symbols):
+                masks[symbol] = masks.get(symbol, 0) | cell_bit(reel, row, self.reels)
+        return masks
+
+    def line_wins(self, stops: Sequence[int], lines: Optional[int] = None) -> list[LineWin]:
+        """Winning lines among the first `lines` paylines (all by default)."""
+        line_masks = self.line_masks[:lines]
+        wins = []
+        for symbol, mask in self.symbol_masks(self.window(stops)).items():
+            pay = self.paytable.get(symbol, 0)
+            if not pay:
+                continue
+            for line, cells in enumerate(line_masks):
+                if mask & cells == cells:
+                    wins.append(LineWin(line, symbol, pay))
+        return sorted(wins)
+
+    def net_win(self, wins: Sequence[LineWin], bets: Sequence[float]) -> float:
+        """Chips won on the winning lines minus the bets on the losing ones."""
+        pays = {win.line: win.pay for win in wins}
+        return sum(bet * pays[line] if line in pays else -bet for line, bet in enumerate(bets))
+
+
+@dataclass(frozen=True)
+class MachineStats:
+    """
+    Exact long-run behaviour of a machine, per chip bet.
+
+    Averages are weighted by the chance of each stop combination.
+
+    Attributes:
+        combinations: stop combinations enumerated
+        rtp: average chips returned, the bets included
+        hit_frequency: share of spins with at least one winning line
+        variance: variance of the chips returned
+    """
+    combinations: int
+    rtp: float
+    hit_frequency: float
+    variance: float
+
+    @property
+    def std_dev(self) -> float:
+        return self.variance ** 0.5
+
+
+def _strip_ids(machine: SlotMachine) -> tuple[list[np.ndarray], np.ndarray]:
+    """Each strip as symbol ids, and the pay of each id."""
+    ids = {symbol: i for i, symbol in enumerate(machine.symbols)}
+    strips = [np.array([ids[symbol] for symbol in strip], dtype=np.int64) for strip in machine.strips]
+    pays = np.array([machine.paytable.get(symbol, 0) for symbol in machine.symbols], dtype=np.float64)
+    return strips, pays
+
+
+def line_pays(machine: SlotMachine, stops: np.ndarray) -> np.ndarray:
+    """
+    Pay on every payline for a batch of spins.
+
+    `stops` holds one row of reel stops per spin; the result holds one row
+    of pays per spin, one column per payline.
+    """
+    strips, pays = _strip_ids(machine)
+    reels = machine.reels
+    bits = np.array(
+        [[cell_bit(reel, row, reels) for reel in range(reels)] for row in range(ROWS)], dtype=np.int64)
+    window = np.stack([
+        np.stack([strip[(stops[:, reel] + row - MIDDLE) % len(strip)] for reel, strip in enumerate(strips)], axis=1)
+        for row in range(ROWS)
+    ], axis=1)
+
+    line_masks = np.array(machine.line_masks, dtype=np.int64)
+    result = np.zeros((len(stops), len(line_masks)))
+    for symbol, pay in enumerate(pays):
+        if not pay:
+            continue
+        masks = np.where(window == symbol, bits, 0).sum(axis=(1, 2))
+        covered = (masks[:, None] & line_masks[None, :]) == line_masks[None, :]
+        result += covered * pay
+    return result
+
+
+def machine_stats(machine: SlotMachine, bets: Optional[Sequence[float]] = None) -> MachineStats:
+    """
+    Enumerate every combination of stops.
+
+    `bets` is the bet on each payline, one chip on every line by default.
+    Stop combinations are evaluated `ENUMERATION_CHUNK` at a time.
+    """
+    bets = np.array(bets if bets is not None else [1] * len(machine.paylines), dtype=np.float64)
+    bets = np.pad(bets, (0, len(machine.paylines) - len(bets)))
+    staked = bets.sum()
+    sizes = [len(strip) for strip in machine.strips]
+    combinations = int(np.prod(sizes))
+
+    probabilities = [table.probabilities for table in machine.stop_tables]
+
+    rtp = returned_squared = hits = 0.0
+    for start in range(0, combinations, ENUMERATION_CHUNK):
+        index = np.arange(start, min(start + ENUMERATION_CHUNK, combinations))
+        stops = np.stack(np.unravel_index(index, sizes), axis=1)
+        chance = np.prod([p[stops[:, reel]] for reel, p in enumerate(probabilities)], axis=0)
+        pays = line_pays(machine, stops)
+        wins = (pays > 0) & (bets > 0)
+        result = (np.where(wins, 1 + pays, 0) * bets).sum(axis=1) / staked
+        rtp += (chance * result).sum()
+        returned_squared += (chance * result ** 2).sum()
+        hits += chance[wins.any(axis=1)].sum()
+
+    return MachineStats(
+        combinations=combinations,
+        rtp=float(rtp),
+        hit_frequency=float(hits),
+        variance=float(returned_squared - rtp ** 2),
+    )
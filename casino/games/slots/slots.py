@@ -1,12 +1,14 @@
-import random
 import time
-from typing import Literal
+from typing import Literal, Mapping, Optional
 
 from casino.accounts import Account
 from casino.types import GameContext
 from casino.utils import clear_screen, cprint, cinput, display_topbar
+from .autoplay import JACKPOT, AutoplayLimits, autoplay
+from .jackpot import JACKPOT_ODDS, JackpotStore, jackpot_hit
+from .machine import SlotMachine
 
-SlotsMenuChoice = Literal["respin", "change_bet", "quit"]
+SlotsMenuChoice = Literal["respin", "autoplay", "change_bet", "quit"]
 
 SLOTS_HEADER = """
 ┌───────────────────────────────┐
@@ -18,55 +20,43 @@ HEADER_OPTIONS = {
     "margin": 1,
 }
 
-BET_PROMPT        = "How much would you like to bet?"
+BET_PROMPT        = "How much would you like to bet per line?"
+LINES_PROMPT      = "How many lines would you like to play?"
 INVALID_BET_MSG   = "That's not a valid bet."
 INVALID_INPUT_MSG = "Invalid input. Please try again."
 
 SEC_BTWN_SPIN = 0.1
 TOTAL_SPINS = 10
-WIN_PROBABILITY = 0.2
-HIGH_VALUE_PROBABILITY = 0.05
 
 
 def get_slots_menu_prompt(ctx: GameContext, bet_amount: int) -> str:
-    """Generate slots menu prompt."""
+    """Generate slots menu prompt for a total bet of `bet_amount`."""
     if ctx.account.balance < ctx.config.slots_min_line_bet:
         return f"[Q]uit"
     if ctx.account.balance < bet_amount:
         return f"[C]hange Bet [Q]uit"
     else:
-        return f"[R]espin [C]hange Bet [Q]uit"
+        return f"[R]espin [A]utoplay [C]hange Bet [Q]uit"
 
 
-def generate_payout_legend(
-    low_items: list[str],
-    high_items: list[str],
-) -> str:
-    """Generate payout legend."""
-    low_items_str = " | ".join(low_items)
-    high_items_str = " | ".join(high_items)
-    max_len = max(len(low_items_str), len(high_items_str))
-    low_str  = f"Matching {low_items_str .ljust(max_len)}  | x1.5"
-    high_str = f"Matching {high_items_str.ljust(max_len)}  | x5.0"
-    return f"{low_str}\n{high_str}"
+def generate_payout_legend(paytable: Mapping[str, float]) -> str:
+    """Generate payout legend, one line per pay from lowest to highest."""
+    by_pay: dict[float, list[str]] = {}
+    for item, pay in paytable.items():
+        by_pay.setdefault(pay, []).append(item)
+    items_strs = {pay: " | ".join(items) for pay, items in by_pay.items()}
+    max_len = max(len(items_str) for items_str in items_strs.values())
+    return "\n".join(
+        f"Matching {items_strs[pay].ljust(max_len)}  | x{pay:g}"
+        for pay in sorted(items_strs)
+    )
 
 
-LOW_ITEMS = ["A", "B", "C"]
-HIGH_ITEMS = ["D"]
-ALL_ITEMS = LOW_ITEMS + HIGH_ITEMS
-PAYOUT_LEGEND = generate_payout_legend(LOW_ITEMS, HIGH_ITEMS)
+MACHINE = SlotMachine()
+PAYOUT_LEGEND = generate_payout_legend(MACHINE.paytable)
 
-# Currently 1 pay line, goal is to have several and:
-# - implement pattern patching for wins across lines
-# - be able to bet across lines independently
-# - then maybe special lines
-
-
-def get_rand_item() -> str:
-    return random.choice(ALL_ITEMS)
-
-
-def print_spin(items: tuple[str, str, str], frame: int) -> None:
+def print_spin(window: tuple[tuple[str, ...], ...], frame: int) -> None:
+    top, middle, bottom = window
     legend_lines = PAYOUT_LEGEND.splitlines()
     low_line = legend_lines[0] if len(legend_lines) > 0 else ""
     high_line = legend_lines[1] if len(legend_lines) > 1 else ""
@@ -85,13 +75,13 @@ def print_spin(items: tuple[str, str, str], frame: int) -> None:
 │───────────────────────────────────────│
     │                                       │┌───┐
     │   ┌───────┐   ┌───────┐   ┌───────┐   ││   │
-    │   │       │   │       │   │       │   │└───┘
+    │   │{top[0].center(7)}│   │{top[1].center(7)}│   │{top[2].center(7)}│   │└───┘
     │   └───────┘   └───────┘   └───────┘   │ │ │
     │   ┌───────┐   ┌───────┐   ┌───────┐   │ │ │
-    │ - │{items[0].center(7)}│   │{items[1].center(7)}│   │{items[2].center(7)}│ - │ │ │
+    │ - │{middle[0].center(7)}│   │{middle[1].center(7)}│   │{middle[2].center(7)}│ - │ │ │
     │   └───────┘   └───────┘   └───────┘   │ │ │
     │   ┌───────┐   ┌───────┐   ┌───────┐   │ │ │
-    │   │       │   │       │   │       │   │─┘ │
+    │   │{bottom[0].center(7)}│   │{bottom[1].center(7)}│   │{bottom[2].center(7)}│   │─┘ │
     │   └───────┘   └───────┘   └───────┘   │───┘
 │                                       │
 │───────────────────────────────────────│
@@ -110,13 +100,13 @@ def print_spin(items: tuple[str, str, str], frame: int) -> None:
 │───────────────────────────────────────│
 │                                       │
 │   ┌───────┐   ┌───────┐   ┌───────┐   │
-    │   │       │   │       │   │       │   │┌───┐
+    │   │{top[0].center(7)}│   │{top[1].center(7)}│   │{top[2].center(7)}│   │┌───┐
     │   └───────┘   └───────┘   └───────┘   ││   │
     │   ┌───────┐   ┌───────┐   ┌───────┐   │└───┘
-    │ - │{items[0].center(7)}│   │{items[1].center(7)}│   │{items[2].center(7)}│ - │ │ │
+    │ - │{middle[0].center(7)}│   │{middle[1].center(7)}│   │{middle[2].center(7)}│ - │ │ │
     │   └───────┘   └───────┘   └───────┘   │ │ │
     │   ┌───────┐   ┌───────┐   ┌───────┐   │ │ │
-    │   │       │   │       │   │       │   │─┘ │
+    │   │{bottom[0].center(7)}│   │{bottom[1].center(7)}│   │{bottom[2].center(7)}│   │─┘ │
     │   └───────┘   └───────┘   └───────┘   │───┘
 │                                       │
 │───────────────────────────────────────│
@@ -135,13 +125,13 @@ def print_spin(items: tuple[str, str, str], frame: int) -> None:
 │───────────────────────────────────────│
 │                                       │
 │   ┌───────┐   ┌───────┐   ┌───────┐   │
-│   │       │   │       │   │       │   │
+│   │{top[0].center(7)}│   │{top[1].center(7)}│   │{top[2].center(7)}│   │
 │   └───────┘   └───────┘   └───────┘   │
 │   ┌───────┐   ┌───────┐   ┌───────┐   │
-    │ - │{items[0].center(7)}│   │{items[1].center(7)}│   │{items[2].center(7)}│ - │┌───┐
+    │ - │{middle[0].center(7)}│   │{middle[1].center(7)}│   │{middle[2].center(7)}│ - │┌───┐
     │   └───────┘   └───────┘   └───────┘   ││   │
     │   ┌───────┐   ┌───────┐   ┌───────┐   │└───┘
-    │   │       │   │       │   │       │   │─┘ │
+    │   │{bottom[0].center(7)}│   │{bottom[1].center(7)}│   │{bottom[2].center(7)}│   │─┘ │
     │   └───────┘   └───────┘   └───────┘   │───┘
 │                                       │
 │───────────────────────────────────────│
@@ -157,7 +147,7 @@ def print_spin(items: tuple[str, str, str], frame: int) -> None:
 
 
 def get_bet_amount(ctx: GameContext) -> int:
-    """Prompt user for bet amount."""
+    """Prompt user for bet amount per line."""
     account = ctx.account
     min_bet = ctx.config.slots_min_line_bet
     while True:
@@ -183,9 +173,28 @@ def get_bet_amount(ctx: GameContext) -> int:
         return bet
 
 
+def get_line_count(ctx: GameContext, bet_amount: int) -> int:
+    """Prompt user for the number of pay lines to bet `bet_amount` on."""
+    account = ctx.account
+    max_lines = min(len(MACHINE.paylines), account.balance // bet_amount)
+    if max_lines == 1:
+        return 1
+    while True:
+        lines_str = cinput(f"{LINES_PROMPT} (1-{max_lines})").strip()
+        try:
+            lines = int(lines_str)
+        except ValueError:
+            lines = 0
+        if 1 <= lines <= max_lines:
+            return lines
+        clear_screen()
+        display_topbar(account, **HEADER_OPTIONS)
+        cprint(f"Choose between 1 and {max_lines} lines.")
+
+
 def get_player_choice(
     ctx: GameContext,
-    items: tuple[str, str, str],
+    window: tuple[tuple[str, ...], ...],
     bet_amount: int,
 ) -> SlotsMenuChoice:
     """Prompt user for slots menu choice."""
@@ -196,7 +205,7 @@ def get_player_choice(
         if not first_iter:
             clear_screen()
             display_topbar(account, **HEADER_OPTIONS)
-            print_spin(items, 0)
+            print_spin(window, 0)
             cprint(INVALID_INPUT_MSG)
         first_iter = False
         menu_prompt = get_slots_menu_prompt(ctx, bet_amount)
@@ -209,86 +218,210 @@ def get_player_choice(
             if account.balance < bet_amount:
                 continue
             return "respin"
+        elif player_input in "aA":
+            if account.balance < bet_amount:
+                continue
+            return "autoplay"
         elif player_input in "cC":
             if account.balance < min_bet:
                 continue
             return "change_bet"
 
 
+def get_optional_amount(ctx: GameContext, prompt: str) -> Optional[int]:
+    """Prompt user for a number of chips, None if left blank."""
+    while True:
+        amount_str = cinput(prompt).strip()
+        if amount_str == "":
+            return None
+        try:
+            amount = int(amount_str)
+        except ValueError:
+            amount = -1
+        if amount >= 0:
+            return amount
+        clear_screen()
+        display_topbar(ctx.account, **HEADER_OPTIONS)
+        cprint(INVALID_INPUT_MSG)
+
+
+def get_autoplay_limits(ctx: GameContext) -> AutoplayLimits:
+    """Prompt user for the autoplay stop conditions."""
+    spins = None
+    while not spins:
+        spins = get_optional_amount(ctx, "How many spins?")
+    return AutoplayLimits(
+        spins=spins,
+        loss_limit=get_optional_amount(ctx, "Stop after losing how many chips? (blank for no limit)"),
+        win_threshold=get_optional_amount(ctx, "Stop after a win of how many chips? (blank for no limit)"),
+        balance_floor=get_optional_amount(ctx, "Stop below what balance? (blank for no floor)"),
+    )
+
+
 def spin_animation(
     account: Account,
+    stops: tuple[int, ...],
+    machine: SlotMachine = MACHINE,
     total_spins: int = TOTAL_SPINS,
     sec_btwn_spins: float = SEC_BTWN_SPIN,
 ) -> None:
-    """Animate the spin of the slot machine."""
+    """Animate the spin of the slot machine, rolling the reels onto `stops`."""
+    def window_before(steps: int) -> tuple[tuple[str, ...], ...]:
+        return machine.window([stop - steps for stop in stops])
+
     # Animate pulling the arm
     for i in range(5):
         clear_screen()
         display_topbar(account, **HEADER_OPTIONS)
-        print_spin((get_rand_item(), get_rand_item(), get_rand_item()), i)
+        print_spin(window_before(total_spins), i)
         time.sleep(sec_btwn_spins)
     # Animate the slots spinning
-    for _ in range(total_spins):
+    for steps in range(total_spins - 1, 0, -1):
         clear_screen()
         display_topbar(account, **HEADER_OPTIONS)
-        print_spin((get_rand_item(), get_rand_item(), get_rand_item()), 0)
+        print_spin(window_before(steps), 0)
         time.sleep(sec_btwn_spins)
 
 
+def claim_jackpot(ctx: GameContext, jackpot: JackpotStore) -> None:
+    paid = jackpot.claim(ctx.account.name)
+    ctx.account.deposit(paid)
+    cprint(f"*** JACKPOT! +{paid} chips ***")
+
+
+def play_spin(
+    ctx: GameContext,
+    bet_amount: int,
+    lines: int,
+    jackpot: Optional[JackpotStore] = None,
+) -> tuple[tuple[str, ...], ...]:
+    """Spin once with the animation and settle every line bet."""
+    account = ctx.account
+    stops = MACHINE.spin()
+    spin_animation(account, stops)
+
+    # Display final spin result
+    window = MACHINE.window(stops)
+    wins = MACHINE.line_wins(stops, lines)
+    net = int(MACHINE.net_win(wins, [bet_amount] * lines))
+    if net > 0:
+        account.deposit(net)
+    elif net < 0:
+        account.withdraw(-net)
+    clear_screen()
+    display_topbar(account, **HEADER_OPTIONS)
+    print_spin(window, 0)
+    for win in wins:
+        cprint(f"LINE {win.line + 1} MATCH {win.symbol}: +{int(bet_amount * win.pay)} chips")
+    if not wins:
+        cprint(f"NO MATCH: -{bet_amount * lines} chips")
+    elif lines > 1:
+        cprint(f"TOTAL: {net:+} chips")
+    if jackpot is not None:
+        jackpot.contribute(bet_amount * lines)
+        if jackpot_hit():
+            claim_jackpot(ctx, jackpot)
+        cprint(f"JACKPOT: {jackpot.pot} chips")
+    return window
+
+
+def play_autoplay(
+    ctx: GameContext,
+    bet_amount: int,
+    lines: int,
+    window: tuple[tuple[str, ...], ...],
+    jackpot: Optional[JackpotStore] = None,
+) -> tuple[tuple[str, ...], ...]:
+    """
+    Run autoplay without animation, then show the last spin and a summary.
+
+    `window` is shown if no spin gets played. Autoplay stops on the spin
+    that wins the jackpot, and only the spins played contribute to it.
+    """
+    account = ctx.account
+    clear_screen()
+    display_topbar(account, **HEADER_OPTIONS)
+    limits = get_autoplay_limits(ctx)
+
+    spins = net = biggest_win = 0
+    reason = None
+    jackpot_odds = JACKPOT_ODDS if jackpot is not None else None
+    for batch in autoplay(MACHINE, [bet_amount] * lines, account.balance, limits, jackpot_odds=jackpot_odds):
+        # One ledger update per batch
+        if batch.net > 0:
+            account.deposit(batch.net)
+        elif batch.net < 0:
+            account.withdraw(-batch.net)
+        spins += batch.spins
+        net += batch.net
+        biggest_win = max(biggest_win, batch.biggest_win)
+        window = MACHINE.window(batch.last_stops)
+        reason = batch.stop_reason
+        if jackpot is not None:
+            jackpot.contribute(bet_amount * lines * batch.spins, batch.spins)
+
+    clear_screen()
+    display_topbar(account, **HEADER_OPTIONS)
+    print_spin(window, 0)
+    if spins == 0:
+        cprint("AUTOPLAY: no spins played, the balance is already at the floor")
+        return window
+    cprint(f"AUTOPLAY: {spins} spins, {net:+} chips, biggest win {biggest_win} chips")
+    cprint(f"Stopped: {reason}")
+    if reason == JACKPOT:
+        claim_jackpot(ctx, jackpot)
+    if jackpot is not None:
+        cprint(f"JACKPOT: {jackpot.pot} chips")
+    return window
+
+
 def play_slots(ctx: GameContext) -> None:
     """Play slots game."""
+    jackpot = None
+    if ctx.config.slots_jackpot_path:
+        jackpot = JackpotStore(ctx.config.slots_jackpot_path)
+    try:
+        play_spins(ctx, jackpot)
+    finally:
+        if jackpot is not None:
+            jackpot.close()
+
+
+def play_spins(ctx: GameContext, jackpot: Optional[JackpotStore]) -> None:
+    """Take bets and spin until the player quits."""
     account = ctx.account
     min_bet = ctx.config.slots_min_line_bet
     take_new_bet = True
+    run_autoplay = False
     bet_amount = 0
+    lines = 1
+    window = MACHINE.window(MACHINE.spin())
     while True:
         clear_screen()
         display_topbar(account, **HEADER_OPTIONS)
-        if take_new_bet or bet_amount > account.balance:
+        if take_new_bet or bet_amount * lines > account.balance:
             if account.balance < min_bet:
                 cprint("You don't have enough money to make a bet.\n\n")
                 cinput("Press Enter to continue...")
                 return
             bet_amount = get_bet_amount(ctx)
+            lines = get_line_count(ctx, bet_amount)
             take_new_bet = False
 
-        spin_animation(account)
-        clear_screen()
-        display_topbar(account, **HEADER_OPTIONS)
-
-        # Display final spin result
-        items: tuple[str, str, str]
-        rng = random.random()
-        if rng <= WIN_PROBABILITY:
-            money_gain = 0
-            if rng <= HIGH_VALUE_PROBABILITY:
-                win_item = HIGH_ITEMS[random.randint(0, len(HIGH_ITEMS) - 1)]
-                money_gain = bet_amount * 5
-            else:
-                win_item = LOW_ITEMS[random.randint(0, len(LOW_ITEMS) - 1)]
-                money_gain = int(bet_amount * 1.5)
-            items = (win_item, win_item, win_item)
-            account.deposit(money_gain)
-            clear_screen()
-            display_topbar(account, **HEADER_OPTIONS)
-            print_spin(items, 0)
-            cprint(f"MATCH: +{money_gain} chips")
+        if run_autoplay:
+            window = play_autoplay(ctx, bet_amount, lines, window, jackpot)
+            run_autoplay = False
         else:
-            items = (get_rand_item(), get_rand_item(), get_rand_item())
-            while len(set(items)) == 1:
-                items = (get_rand_item(), get_rand_item(), get_rand_item())
-            clear_screen()
-            account.withdraw(bet_amount)
-            display_topbar(account, **HEADER_OPTIONS)
-            print_spin(items, 0)
-            cprint(f"NO MATCH: -{bet_amount} chips")
+            window = play_spin(ctx, bet_amount, lines, jackpot)
 
         # Choose what to do after spin
-        choice = get_player_choice(ctx, items, bet_amount)
+        choice = get_player_choice(ctx, window, bet_amount * lines)
         match choice:
             case "quit":
                 return
             case "change_bet":
                 take_new_bet = True
+            case "autoplay":
+                run_autoplay = True
             case "respin":
                 continue
@@ -0,0 +1,70 @@
+"""
+Weighted random draws in constant time.
+
+`AliasTable` uses Vose's alias method. The table is built once from the
+weights in O(n). After that, every draw is one uniform index plus one
+coin flip, however many outcomes there are and however skewed the weights
+are. Draws come one at a time from a `random.Random`, or in NumPy batches
+of any size from a `np.random.Generator`.
+"""
+
+import random
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+class AliasTable:
+    """
+    Draws index `i` with probability `weights[i] / sum(weights)`.
+
+    Each slot `i` keeps outcome `i` with probability `prob[i]` and hands
+    the rest of its share to `alias[i]`.
+    """
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or len(weights) == 0:
+            raise ValueError("Weights must be a non-empty sequence")
+        if (weights < 0).any() or not np.isfinite(weights).all() or weights.sum() <= 0:
+            raise ValueError("Weights must be finite, non-negative and not all zero")
+
+        n = len(weights)
+        scaled = weights * n / weights.sum()
+        prob = np.ones(n)
+        alias = np.arange(n)
+        small = [i for i in range(n) if scaled[i] < 1]
+        large = [i for i in range(n) if scaled[i] >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # Whatever is left over is 1 up to rounding error
+
+        self.weights = weights
+        self.prob = prob
+        self.alias = alias
+        self._prob = prob.tolist()
+        self._alias = alias.tolist()
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    @property
+    def probabilities(self) -> np.ndarray:
+        """Chance of drawing each index."""
+        return self.weights / self.weights.sum()
+
+    def draw(self, rng: Optional[random.Random] = None) -> int:
+        """One draw."""
+        rng = rng or random
+        i = rng.randrange(len(self._prob))
+        return i if rng.random() < self._prob[i] else self._alias[i]
+
+    def sample(self, size: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """`size` independent draws."""
+        rng = rng or np.random.default_rng()
+        i = rng.integers(len(self.prob), size=size)
+        return np.where(rng.random(size) < self.prob[i], i, self.alias[i])
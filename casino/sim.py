@@ -0,0 +1,419 @@
+"""
+Headless simulations for the casino games.
+
+Usage:
+    python -m casino.sim blackjack-sweep --hands 10000000 --decks 1 2 6 8
+    python -m casino.sim poker-bench --hands 200000 --seats 6 --history hands.bin
+    python -m casino.sim poker-history hands.bin
+    python -m casino.sim poker-tournament --tournaments 100 --out results.jsonl
+    python -m casino.sim roulette-bench --bets 100000 --american
+    python -m casino.sim roulette-history roulette_spins.european.bin
+    python -m casino.sim slots-rtp
+    python -m casino.sim slots-autoplay --spins 10000000 --lines 7 --balance 100000000
+    python -m casino.sim slots-jackpot-stress --processes 16 --spins 100000
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Callable
+
+import numpy as np
+
+from .cards import StandardDeck
+from .config import Config
+from .games.blackjack import simulator
+from .games.blackjack.rules import BlackjackRules
+from .games.poker import history
+from .games.poker.deck import PokerDeck
+from .games.poker.evaluator import HandState
+from .games.poker.table import CALL, CHECK, Table
+from .games.poker.tournament import TournamentConfig, run_tournaments
+from .games.roulette import history as roulette_history
+from .games.roulette.bets import AMERICAN_BETS, EUROPEAN_BETS, POCKET_LABELS, BetSlip
+from .games.slots import jackpot
+from .games.slots.autoplay import AutoplayLimits, autoplay
+from .games.slots.machine import SlotMachine, machine_stats
+
+
+def blackjack_variants(args: argparse.Namespace) -> dict[str, BlackjackRules]:
+    """Every combination of the requested payouts and double restrictions."""
+    doubles = {
+        "any": None,
+        "9-11": frozenset({9, 10, 11}),
+        "10-11": frozenset({10, 11}),
+    }
+    variants = {}
+    for payout in args.payouts:
+        for double_name in args.doubles:
+            name = f"{payout:g}:1 double {double_name}"
+            variants[name] = BlackjackRules(
+                double_totals=doubles[double_name],
+                dealer_hits_soft_17=args.h17,
+                blackjack_payout=payout,
+            )
+    return variants
+
+
+def blackjack_sweep(args: argparse.Namespace) -> None:
+    variants = blackjack_variants(args)
+    start = time.perf_counter()
+    results = simulator.sweep(variants, args.decks, args.hands, args.seed)
+    elapsed = time.perf_counter() - start
+
+    for (name, decks), (mean, stderr) in results.items():
+        print(f"{decks} deck(s)  {name:<24} EV {mean * 100:+.3f}%  ± {stderr * 100:.3f}%")
+    hands = args.hands * len(args.decks) * len(variants)
+    print(f"\n{hands:,} hands in {elapsed:.1f}s ({hands / elapsed:,.0f} hands/s)")
+
+
+def add_blackjack_sweep(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "blackjack-sweep", help="estimate blackjack EV across rule variants")
+    parser.add_argument("--hands", type=int, default=1_000_000,
+                        help="hands per variant and deck count")
+    parser.add_argument("--decks", type=int, nargs="+",
+                        default=[Config.default().blackjack_shoe_size])
+    parser.add_argument("--payouts", type=float, nargs="+", default=[1.5, 1.2],
+                        help="blackjack payouts, e.g. 1.5 for 3:2")
+    parser.add_argument("--doubles", nargs="+", default=["any", "9-11"],
+                        choices=["any", "9-11", "10-11"])
+    parser.add_argument("--h17", action="store_true", help="dealer hits soft 17")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.set_defaults(run=blackjack_sweep)
+
+
+def play_headless_hand(deck: PokerDeck) -> int:
+    """
+    Deal and show down one heads-up hold'em hand with no betting.
+
+    Returns 1 if the first player wins, -1 if the second does and 0 on a tie.
+    """
+    deck.shuffle()
+    first = HandState(deck.deal(2))
+    second = HandState(deck.deal(2))
+    for street in (3, 1, 1):
+        deck.burn()
+        for card in deck.deal(street):
+            first.add(card)
+            second.add(card)
+    return (first.strength > second.strength) - (first.strength < second.strength)
+
+
+def play_table_hand(table: Table) -> None:
+    """Play one hand at a `Table` where every seat checks or calls."""
+    table.start_hand()
+    while not table.hand_over:
+        table.act(CALL if table.to_call() else CHECK)
+
+
+def poker_bench(args: argparse.Namespace) -> None:
+    deck = PokerDeck(random.Random(args.seed))
+    play_headless_hand(deck)  # build the evaluator tables before timing
+
+    start = time.perf_counter()
+    for _ in range(args.hands):
+        play_headless_hand(deck)
+    elapsed = time.perf_counter() - start
+    print(f"{args.hands:,} headless hands in {elapsed:.2f}s ({args.hands / elapsed:,.0f} hands/s)")
+
+    # Full hands through the table engine, blinds and betting rounds included
+    table_hands = args.hands // 10
+    rng = random.Random(args.seed)
+    writer = history.HandHistoryWriter(args.history) if args.history else None
+    table = Table([1000] * args.seats, 5, 10, rng=rng, history=writer)
+    start = time.perf_counter()
+    for _ in range(table_hands):
+        if min(seat.stack for seat in table.seats) < 10:
+            table = Table([1000] * args.seats, 5, 10, rng=rng, history=writer)
+        play_table_hand(table)
+    if writer is not None:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"{table_hands:,} {args.seats}-seat table hands in {elapsed:.2f}s "
+          f"({table_hands / elapsed:,.0f} hands/s)")
+
+    # Cost of starting a new hand, against rebuilding a StandardDeck
+    resets = 2_000
+    start = time.perf_counter()
+    for _ in range(resets):
+        deck.shuffle()
+    shuffle_time = (time.perf_counter() - start) / resets
+    standard_deck = StandardDeck()
+    start = time.perf_counter()
+    for _ in range(resets // 20):
+        standard_deck.generate_deck()
+    rebuild_time = (time.perf_counter() - start) / (resets // 20)
+    print(f"PokerDeck.shuffle: {shuffle_time * 1e6:.1f} us   "
+          f"StandardDeck.generate_deck: {rebuild_time * 1e6:.1f} us")
+
+
+def add_poker_bench(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "poker-bench", help="time headless poker hands")
+    parser.add_argument("--hands", type=int, default=100_000)
+    parser.add_argument("--seats", type=int, default=6,
+                        help="seats at the table for the table engine hands")
+    parser.add_argument("--history", default=None,
+                        help="append the table engine hands to this hand log")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.set_defaults(run=poker_bench)
+
+
+def poker_history(args: argparse.Namespace) -> None:
+    start = time.perf_counter()
+    stats = history.position_stats(args.path, num_seats=args.seats)
+    elapsed = time.perf_counter() - start
+
+    print("position  hands       VPIP    PFR     won     bb/100")
+    for position in range(len(stats["hands"])):
+        if stats["hands"][position] == 0:
+            continue
+        print(f"{position:<8}  {stats['hands'][position]:<10,}  "
+              f"{stats['vpip'][position]:<6.1%}  {stats['pfr'][position]:<6.1%}  "
+              f"{stats['won'][position]:<6.1%}  {stats['bb_per_100'][position]:+.1f}")
+    total = stats["hands"].sum()
+    print(f"\n{total:,} seat-hands read in {elapsed:.2f}s")
+
+
+def add_poker_history(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "poker-history", help="VPIP and results by position from a poker hand log")
+    parser.add_argument("path")
+    parser.add_argument("--seats", type=int, default=None,
+                        help="only count hands at tables with this many seats")
+    parser.set_defaults(run=poker_history)
+
+
+def poker_tournament(args: argparse.Namespace) -> None:
+    config = TournamentConfig(
+        players=args.players,
+        seats=args.seats,
+        starting_stack=args.stack,
+        hands_per_level=args.hands_per_level,
+        bot_samples=args.samples,
+    )
+    hands = 0
+    start = time.perf_counter()
+    with open(args.out, "w") as out:
+        results = run_tournaments(config, args.tournaments, args.seed, args.workers)
+        for done, result in enumerate(results, 1):
+            out.write(json.dumps(result.to_dict()) + "\n")
+            out.flush()
+            hands += result.hands
+            elapsed = time.perf_counter() - start
+            print(f"\r{done}/{args.tournaments} tournaments  {hands:,} hands  "
+                  f"{hands / elapsed:,.0f} hands/s", end="", flush=True)
+    print(f"\nResults written to {args.out}")
+
+
+def add_poker_tournament(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "poker-tournament", help="play bot-vs-bot multi-table poker tournaments")
+    parser.add_argument("--tournaments", type=int, default=100)
+    parser.add_argument("--players", type=int, default=TournamentConfig.players)
+    parser.add_argument("--seats", type=int, default=TournamentConfig.seats,
+                        help="seats per table")
+    parser.add_argument("--stack", type=int, default=TournamentConfig.starting_stack,
+                        help="starting chips per player")
+    parser.add_argument("--hands-per-level", type=int, default=TournamentConfig.hands_per_level)
+    parser.add_argument("--samples", type=int, default=TournamentConfig.bot_samples,
+                        help="runouts each bot samples for a postflop decision")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--out", default="poker_tournaments.jsonl")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.set_defaults(run=poker_tournament)
+
+
+def roulette_bench(args: argparse.Namespace) -> None:
+    table = AMERICAN_BETS if args.american else EUROPEAN_BETS
+    rng = np.random.default_rng(args.seed)
+    slip = BetSlip(args.players, capacity=args.bets)
+    for account, bet_id, stake in zip(rng.integers(args.players, size=args.bets).tolist(),
+                                      rng.integers(len(table), size=args.bets).tolist(),
+                                      rng.integers(1, 101, size=args.bets).tolist()):
+        slip.add(account, bet_id, stake)
+    pockets = rng.integers(table.num_pockets, size=args.spins)
+
+    staked = returned = 0
+    start = time.perf_counter()
+    for pocket in pockets:
+        returned += int(slip.resolve(table, pocket).sum())
+        staked += int(slip.totals.sum())
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.spins:,} spins of {args.bets:,} bets by {args.players:,} players on {table.num_pockets} pockets")
+    print(f"returned {returned / staked:.4%} of stakes")
+    print(f"\n{elapsed / args.spins * 1000:.3f} ms per spin "
+          f"({args.bets * args.spins / elapsed:,.0f} bets/s)")
+
+
+def add_roulette_bench(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "roulette-bench", help="time resolving many roulette bets per spin")
+    parser.add_argument("--bets", type=int, default=100_000, help="bets per spin")
+    parser.add_argument("--players", type=int, default=1000, help="players sharing the bets")
+    parser.add_argument("--spins", type=int, default=1000)
+    parser.add_argument("--american", action="store_true", help="double-zero wheel")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.set_defaults(run=roulette_bench)
+
+
+def roulette_history_stats(args: argparse.Namespace) -> None:
+    spins = roulette_history.load_spins(args.path)
+    if not len(spins):
+        print("no spins in the log")
+        return
+    features = np.array(roulette_history.POCKET_FEATURES, dtype=np.int64)[spins]
+
+    print(f"{len(spins):,} spins")
+    for index, feature in enumerate(roulette_history.FEATURES[1:], 1):
+        counts = np.bincount(features[:, index], minlength=roulette_history.FEATURE_SIZES[index])
+        shares = "  ".join(
+            f"{roulette_history.feature_label(feature, value)} {count / len(spins):.2%}"
+            for value, count in enumerate(counts) if count)
+        print(f"{feature:<7} {shares}")
+
+    num_pockets = AMERICAN_BETS.num_pockets if args.american else EUROPEAN_BETS.num_pockets
+    pockets = np.bincount(spins, minlength=num_pockets)
+    order = np.argsort(-pockets, kind="stable")
+    print(f"hot     {'  '.join(f'{POCKET_LABELS[p]}×{pockets[p]}' for p in order[:args.top])}")
+    print(f"cold    {'  '.join(f'{POCKET_LABELS[p]}×{pockets[p]}' for p in order[::-1][:args.top])}")
+
+    print("\nlongest streaks")
+    for feature, (value, length) in roulette_history.longest_streaks(spins).items():
+        print(f"{feature:<7} {roulette_history.feature_label(feature, value)} ×{length}")
+
+
+def add_roulette_history(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "roulette-history", help="counts, hot and cold pockets and streaks from a roulette spin log")
+    parser.add_argument("path")
+    parser.add_argument("--top", type=int, default=5, help="hot and cold pockets to list")
+    parser.add_argument("--american", action="store_true", help="the log is from a double-zero wheel")
+    parser.set_defaults(run=roulette_history_stats)
+
+
+def slots_rtp(args: argparse.Namespace) -> None:
+    machine = SlotMachine()
+    for reel, strip in enumerate(machine.strips, 1):
+        counts = "  ".join(f"{symbol} x{strip.count(symbol)}" for symbol in machine.symbols)
+        print(f"reel {reel}  {len(strip)} stops  {counts}")
+
+    print("\nlines  RTP       hit freq  variance  std dev")
+    start = time.perf_counter()
+    for lines in range(1, len(machine.paylines) + 1):
+        stats = machine_stats(machine, [1] * lines)
+        print(f"{lines:<5}  {stats.rtp:<8.4%}  {stats.hit_frequency:<8.4%}  "
+              f"{stats.variance:<8.4f}  {stats.std_dev:.4f}")
+    elapsed = time.perf_counter() - start
+    print(f"\n{stats.combinations:,} stop combinations per line count, "
+          f"{len(machine.paylines)} line counts in {elapsed:.3f}s")
+
+
+def add_slots_rtp(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "slots-rtp", help="exact RTP, hit frequency and variance of the slot machine")
+    parser.set_defaults(run=slots_rtp)
+
+
+def slots_autoplay(args: argparse.Namespace) -> None:
+    machine = SlotMachine()
+    bets = [args.bet] * args.lines
+    limits = AutoplayLimits(
+        spins=args.spins,
+        loss_limit=args.loss_limit,
+        win_threshold=args.win_threshold,
+        balance_floor=args.floor,
+    )
+    balance = args.balance
+    spins = 0
+    reason = None
+    start = time.perf_counter()
+    for batch in autoplay(machine, bets, balance, limits, np.random.default_rng(args.seed), args.batch_size):
+        balance += batch.net
+        spins += batch.spins
+        reason = batch.stop_reason
+    elapsed = time.perf_counter() - start
+
+    if spins == 0:
+        print("No spins played: the balance is below the floor")
+        return
+    staked = spins * sum(bets)
+    print(f"{spins:,} spins on {args.lines} line(s), stopped: {reason}")
+    print(f"balance {args.balance:,} -> {balance:,}  ({balance - args.balance:+,} chips)")
+    print(f"RTP {1 + (balance - args.balance) / staked:.4%} (exact {machine_stats(machine, bets).rtp:.4%})")
+    print(f"\n{spins / elapsed:,.0f} spins/s")
+
+
+def add_slots_autoplay(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "slots-autoplay", help="headless slots autoplay session")
+    parser.add_argument("--spins", type=int, default=1_000_000)
+    parser.add_argument("--bet", type=int, default=1, help="bet per line")
+    parser.add_argument("--lines", type=int, default=1)
+    parser.add_argument("--balance", type=int, default=1_000_000)
+    parser.add_argument("--loss-limit", type=int, default=None)
+    parser.add_argument("--win-threshold", type=int, default=None)
+    parser.add_argument("--floor", type=int, default=None, help="balance floor")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.set_defaults(run=slots_autoplay)
+
+
+def slots_jackpot_stress(args: argparse.Namespace) -> None:
+    start = time.perf_counter()
+    spins, claims = jackpot.stress(
+        args.path, args.processes, args.spins, odds=args.odds,
+        flush_every=args.flush_every, seed=args.seed,
+    )
+    elapsed = time.perf_counter() - start
+
+    totals = jackpot.ledger(args.path)
+    leaked = totals["seeded"] + totals["contributed"] - totals["pot"] - totals["paid"]
+    print(f"{spins:,} spins over {args.processes} processes, {claims} claims "
+          f"({totals['claims']} in the database)")
+    print(f"pot {totals['pot'] / jackpot.MILLI:,.3f} chips, paid {totals['paid'] // jackpot.MILLI:,} chips")
+    print(f"chips unaccounted for: {leaked / jackpot.MILLI:g}")
+    print(f"\n{spins / elapsed:,.0f} spins/s")
+
+
+def add_slots_jackpot_stress(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "slots-jackpot-stress", help="many processes spinning against one progressive jackpot")
+    parser.add_argument("--path", default="slots_jackpot_stress.db")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--spins", type=int, default=100_000, help="spins per process")
+    parser.add_argument("--odds", type=float, default=1 / 1000, help="jackpot chance per spin")
+    parser.add_argument("--flush-every", type=int, default=jackpot.FLUSH_EVERY)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.set_defaults(run=slots_jackpot_stress)
+
+
+# To add a new simulation, add a function that registers its subcommand
+SUBCOMMANDS: list[Callable] = [
+    add_blackjack_sweep,
+    add_poker_bench,
+    add_poker_tournament,
+    add_poker_history,
+    add_roulette_bench,
+    add_roulette_history,
+    add_slots_rtp,
+    add_slots_autoplay,
+    add_slots_jackpot_stress,
+]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m casino.sim")
+    subparsers = parser.add_subparsers(required=True)
+    for add_subcommand in SUBCOMMANDS:
+        add_subcommand(subparsers)
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
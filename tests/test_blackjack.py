@@ -0,0 +1,389 @@
+"""
+Unit testing for TERMINALCASINO/casino/games/blackjack
+"""
+
+import random
+import unittest
+from dataclasses import replace
+from unittest.mock import patch
+
+import numpy as np
+
+from casino.accounts import Account
+from casino.cards import StandardCard
+from casino.config import Config
+from casino.games.blackjack import blackjack, dealer, rules, simulator, strategy
+from casino.games.blackjack.rules import BlackjackRules, Outcome
+from casino.games.blackjack.hand import Hand
+from casino.types import GameContext
+
+
+def make_hand(*ranks: str) -> Hand:
+    hand = Hand(bet=10)
+    hand.cards = [StandardCard(rank, "spades") for rank in ranks]
+    return hand
+
+
+class TestStrategy(unittest.TestCase):
+    def test_hard_totals(self):
+        self.assertEqual(strategy.decide(16, False, 0, 10, True, False), strategy.HIT)
+        self.assertEqual(strategy.decide(16, False, 0, 6, True, False), strategy.STAND)
+        self.assertEqual(strategy.decide(12, False, 0, 4, True, False), strategy.STAND)
+        self.assertEqual(strategy.decide(5, False, 0, 6, True, False), strategy.HIT)
+        self.assertEqual(strategy.decide(20, False, 0, 1, True, False), strategy.STAND)
+
+    def test_double_falls_back(self):
+        self.assertEqual(strategy.decide(11, False, 0, 6, True, False), strategy.DOUBLE)
+        self.assertEqual(strategy.decide(11, False, 0, 6, False, False), strategy.HIT)
+        # soft 18 against a 4 doubles, otherwise stands
+        self.assertEqual(strategy.decide(18, True, 0, 4, True, False), strategy.DOUBLE)
+        self.assertEqual(strategy.decide(18, True, 0, 4, False, False), strategy.STAND)
+
+    def test_unsplittable_aces_hit(self):
+        for dealer_up in (5, 6):
+            self.assertEqual(strategy.decide(12, True, 0, dealer_up, True, False), strategy.HIT)
+            self.assertEqual(strategy.decide(12, True, 1, dealer_up, True, False), strategy.HIT)
+
+    def test_pairs(self):
+        self.assertEqual(strategy.decide(16, False, 8, 10, True, True), strategy.SPLIT)
+        self.assertEqual(strategy.decide(12, True, 1, 1, True, True), strategy.SPLIT)
+        # tens are never split, fives play as a hard ten
+        self.assertEqual(strategy.decide(20, False, 10, 6, True, True), strategy.STAND)
+        self.assertEqual(strategy.decide(10, False, 5, 6, True, True), strategy.DOUBLE)
+        # nines stand against a seven
+        self.assertEqual(strategy.decide(18, False, 9, 7, True, True), strategy.STAND)
+
+    def test_soft_hand(self):
+        self.assertTrue(make_hand("A", "6").is_soft)
+        self.assertFalse(make_hand("A", "6", "10").is_soft)
+        self.assertFalse(make_hand("10", "6").is_soft)
+
+    def test_count_and_ramp(self):
+        counter = strategy.RunningCount()
+        for rank in ["2", "3", "4", "5", "6", "7", "K", "A"]:
+            counter.observe(rank)
+        self.assertEqual(counter.running, 3)
+        self.assertAlmostEqual(counter.true_count(104), 1.5)
+        self.assertEqual(strategy.ramp_bet(10, 0.4), 10)
+        self.assertEqual(strategy.ramp_bet(10, 2.2), 20)
+        self.assertEqual(strategy.ramp_bet(10, 12), 80)
+
+
+class TestRulesKernel(unittest.TestCase):
+    def test_hand_value(self):
+        self.assertEqual(rules.hand_value([1, 6]), (17, True))
+        self.assertEqual(rules.hand_value([1, 6, 10]), (17, False))
+        self.assertEqual(rules.hand_value([1, 1, 9]), (21, True))
+        self.assertEqual(rules.hand_value([10, 10, 5]), (25, False))
+        self.assertEqual(make_hand("A", "K").total, 21)
+
+    def test_settle(self):
+        self.assertEqual(rules.settle([1, 10], [10, 9]), Outcome.PLAYER_BLACKJACK)
+        self.assertEqual(rules.settle([1, 10], [1, 10]), Outcome.BLACKJACK_PUSH)
+        self.assertEqual(rules.settle([10, 5, 6], [1, 10]), Outcome.DEALER_BLACKJACK)
+        self.assertEqual(rules.settle([1, 10], [10, 9], is_split=True), Outcome.PLAYER_WIN)
+        self.assertEqual(rules.settle([10, 5, 9], [10, 6, 8]), Outcome.PLAYER_BUST)
+        self.assertEqual(rules.settle([10, 8], [10, 6, 8]), Outcome.DEALER_BUST)
+        self.assertEqual(rules.settle([10, 8], [10, 8]), Outcome.PUSH)
+        self.assertEqual(rules.settle([10, 7], [10, 8]), Outcome.DEALER_WIN)
+
+    def test_resolve_round(self):
+        results = rules.resolve_round(
+            [[1, 10], [10, 9], [10, 6]], [10, 10, 10], [10, 7], BlackjackRules.us())
+        self.assertEqual(results, [
+            (Outcome.PLAYER_BLACKJACK, 25),
+            (Outcome.PLAYER_WIN, 20),
+            (Outcome.DEALER_WIN, 0),
+        ])
+        six_to_five = BlackjackRules(blackjack_payout=1.2)
+        self.assertEqual(rules.resolve_round([[1, 10]], [10], [10, 7], six_to_five)[0][1], 22)
+
+    def test_table_rules(self):
+        us, eu = BlackjackRules.us(), BlackjackRules.european()
+        self.assertTrue(rules.can_double([10, 2], us))
+        self.assertFalse(rules.can_double([10, 2], eu))
+        self.assertTrue(rules.can_double([5, 6], eu))
+        self.assertFalse(rules.can_double([1, 8], eu))
+        self.assertFalse(rules.can_double([5, 6], eu, is_split=True))
+        self.assertTrue(rules.can_split([8, 8], 3, us))
+        self.assertFalse(rules.can_split([8, 8], 4, us))
+        self.assertFalse(rules.can_split([8, 8], 1, eu))
+        self.assertFalse(rules.dealer_should_hit([1, 6], us))
+        self.assertTrue(rules.dealer_should_hit([1, 6], BlackjackRules(dealer_hits_soft_17=True)))
+
+
+def random_values(rng: random.Random, count: int) -> list[int]:
+    return [min(rng.randint(1, 13), 10) for _ in range(count)]
+
+
+class TestDealer(unittest.TestCase):
+    RULE_SETS = [BlackjackRules.us(), BlackjackRules(dealer_hits_soft_17=True)]
+
+    def test_table_matches_kernel(self):
+        rng = random.Random(7)
+        for table_rules in self.RULE_SETS:
+            for _ in range(2000):
+                cards = random_values(rng, rng.randint(1, 5))
+                self.assertEqual(
+                    dealer.should_hit(cards, table_rules),
+                    rules.dealer_should_hit(cards, table_rules) and not rules.is_bust(cards),
+                )
+
+    def test_play_out(self):
+        shoe = iter([1, 10, 6])
+        self.assertEqual(dealer.play_out([5], shoe.__next__, BlackjackRules.us()), [5, 1, 10, 6])
+        soft_17 = [1, 6]
+        self.assertEqual(dealer.play_out(soft_17, iter([2]).__next__, BlackjackRules.us()), soft_17)
+        self.assertEqual(
+            dealer.play_out(soft_17, iter([2]).__next__, BlackjackRules(dealer_hits_soft_17=True)),
+            [1, 6, 2],
+        )
+
+    def test_batch_matches_scalar(self):
+        rng = random.Random(11)
+        n = 3000
+        starting = np.array([random_values(rng, 2) for _ in range(n)])
+        shoe = np.array([random_values(rng, 12) for _ in range(n)])
+        for table_rules in self.RULE_SETS:
+            totals, drawn = dealer.play_out_batch(starting, shoe, table_rules)
+            for i in range(n):
+                stream = iter(shoe[i].tolist())
+                cards = dealer.play_out(starting[i].tolist(), stream.__next__, table_rules)
+                self.assertEqual(totals[i], rules.hand_total(cards))
+                self.assertEqual(drawn[i], len(cards) - 2)
+
+
+class TestSimulator(unittest.TestCase):
+    RULE_SETS = [
+        BlackjackRules.us(),
+        BlackjackRules.european(),
+        BlackjackRules(dealer_hits_soft_17=True, double_after_split=False,
+                       max_split_hands=2, blackjack_payout=1.2),
+    ]
+
+    def test_batch_matches_scalar(self):
+        shoes = simulator.make_shoes(3000, 2, np.random.default_rng(3))
+        for table_rules in self.RULE_SETS:
+            batch = simulator.play_batch(shoes, table_rules)
+            for i in range(len(shoes)):
+                self.assertEqual(batch[i], simulator.play_hand(shoes.stream(i), table_rules))
+
+    def test_sweep_is_reproducible(self):
+        variants = {"us": BlackjackRules.us()}
+        first = simulator.sweep(variants, [6], 5000, seed=1)
+        second = simulator.sweep(variants, [6], 5000, seed=1)
+        self.assertEqual(first.keys(), {("us", 6)})
+        self.assertEqual(first, second)
+
+    def test_sweep_error_is_over_shoes(self):
+        table_rules = BlackjackRules.us()
+        rng = np.random.default_rng(4)
+        shoe_nets = []
+        for size in (1500, 1500, 1000):
+            shoes = simulator.make_shoes(size, 1, rng)
+            net = simulator.play_batch(shoes, table_rules)
+            shoe_nets += [net[shoes.shoe_index == shoe] for shoe in np.unique(shoes.shoe_index)]
+
+        mean = np.concatenate(shoe_nets).mean()
+        shoe_totals = np.array([net.sum() - len(net) * mean for net in shoe_nets])
+        error = (np.square(shoe_totals).sum() * len(shoe_nets) / (len(shoe_nets) - 1)) ** 0.5 / 4000
+
+        result = simulator.sweep({"us": table_rules}, [1], 4000, seed=4, batch_size=1500)
+        self.assertAlmostEqual(result[("us", 1)][0], mean)
+        self.assertAlmostEqual(result[("us", 1)][1], error)
+
+
+class TableTestCase(unittest.TestCase):
+    """Drives `StandardBlackjack` with scripted answers and a stacked shoe."""
+
+    def setUp(self):
+        self.answers = []
+        self.cinput = self.start(
+            patch.object(blackjack, "cinput", side_effect=lambda _prompt="": self.answers.pop(0)))
+        self.sleep = self.start(patch.object(blackjack, "sleep"))
+        self.render_table = self.start(patch.object(blackjack.Blackjack, "render_table"))
+        for name in ("clear_screen", "cprint"):
+            self.start(patch.object(blackjack, name))
+        self.start(patch.object(blackjack.Blackjack, "display_blackjack_topbar"))
+
+    def start(self, patcher):
+        mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        return mock
+
+    def make_game(self, *answers: str) -> blackjack.StandardBlackjack:
+        self.answers = list(answers)
+        config = replace(Config.default(), blackjack_shoe_size=1)
+        return blackjack.StandardBlackjack(GameContext(Account.generate("Ann", 1000), config))
+
+    def stack(self, game: blackjack.StandardBlackjack, *ranks: str) -> None:
+        """Make `ranks` the next cards out of the shoe, in order."""
+        filler = [StandardCard("2", "clubs") for _ in range(52)]
+        game.deck.cards = filler + [StandardCard(rank, "spades") for rank in reversed(ranks)]
+
+    def ranks(self, hand: Hand) -> list[str]:
+        return [card.rank for card in hand.cards]
+
+
+class TestStandardBlackjack(TableTestCase):
+
+    def split_round(self) -> blackjack.StandardBlackjack:
+        """
+        One player on two spots of eights, splitting at most once per spot.
+
+        Spot 1 splits into [8, 8] and [8, 5] and cannot split again; spot 2
+        still splits into [8, K] and [8, 3]. Everything stands on a dealer 17.
+        """
+        game = self.make_game("1", "2", "10")
+        game.rules = BlackjackRules(max_split_hands=2)
+        game.bet()
+        self.stack(game, "8", "8", "10", "8", "8", "7", "8", "5", "K", "3")
+        game.deal_cards()
+        self.answers = ["P", "P", "S", "S", "P", "S", "S"]
+        game.player_decision()
+        return game
+
+    def test_bet_withdraws_each_spot_once(self):
+        game = self.make_game("2", "H", "Bob", "3", "10", "2", "20")
+        game.bet()
+        ann, bob = game.players
+        self.assertEqual((ann.account.balance, bob.account.balance), (970, 960))
+        self.assertEqual((ann.balance, bob.balance), (970, 960))
+        self.assertEqual(
+            [(player.name, hand.spot, hand.bet) for player, hand in game.slots],
+            [("Ann", 0, 10), ("Ann", 1, 10), ("Ann", 2, 10), ("Bob", 0, 20), ("Bob", 1, 20)],
+        )
+
+    def test_deals_round_the_slots_then_dealer_twice(self):
+        game = self.make_game("2", "H", "Bob", "2", "10", "1", "10")
+        game.bet()
+        self.stack(game, "2", "3", "4", "5", "6", "7", "8", "9")
+        game.deal_cards()
+        self.assertEqual([self.ranks(hand) for _, hand in game.slots], [["2", "6"], ["3", "7"], ["4", "8"]])
+        self.assertEqual(self.ranks(game.dealer_hand), ["5", "9"])
+        self.assertEqual([card.hidden for card in game.dealer_hand.cards], [False, True])
+
+    def test_split_hand_follows_its_parent(self):
+        game = self.split_round()
+        player = game.players[0]
+        self.assertEqual(
+            [(hand.spot, self.ranks(hand)) for _, hand in game.slots],
+            [(0, ["8", "8"]), (0, ["8", "5"]), (1, ["8", "K"]), (1, ["8", "3"])],
+        )
+        self.assertEqual([hand for _, hand in game.slots], player.hands)
+        self.assertTrue(all(hand.is_split_hand for hand in player.hands))
+        self.assertEqual(player.account.balance, 960)
+
+    def test_split_limit_is_per_spot(self):
+        game = self.split_round()
+        player = game.players[0]
+        self.assertEqual(game.spot_hand_count(player, 0), 2)
+        self.assertEqual(game.spot_hand_count(player, 1), 2)
+        # the second split on spot 1 was refused, then the hand stood
+        self.assertEqual(self.answers, [])
+        self.assertEqual(len(player.hands), 4)
+
+    def test_settles_every_slot_once(self):
+        game = self.split_round()
+        game.dealer_hand.reveal_all()
+        with patch.object(game, "update_hand_results", wraps=game.update_hand_results) as update:
+            game.check_win()
+        self.assertEqual(update.call_count, len(game.slots))
+        self.assertEqual([call.args[0] for call in update.call_args_list], [hand for _, hand in game.slots])
+        self.assertEqual(
+            [hand.result_key for _, hand in game.slots],
+            [Outcome.DEALER_WIN, Outcome.DEALER_WIN, Outcome.PLAYER_WIN, Outcome.DEALER_WIN],
+        )
+        self.assertEqual(game.stats.rounds_played, 4)
+
+        game.payout()
+        self.assertEqual(game.players[0].account.balance, 980)
+
+    def naturals_round(self, table_rules: BlackjackRules) -> blackjack.StandardBlackjack:
+        """Two spots, a blackjack and 18, against a dealer ace and king."""
+        game = self.make_game("1", "2", "10")
+        game.rules = table_rules
+        game.bet()
+        self.stack(game, "A", "9", "A", "K", "9", "K")
+        game.deal_cards()
+        return game
+
+    def test_peek_ends_round_on_dealer_blackjack(self):
+        game = self.naturals_round(BlackjackRules.us())
+        self.assertEqual(self.ranks(game.dealer_hand), ["A", "K"])
+        self.assertTrue(game.blackjack_check())
+        game.check_win()
+        game.payout()
+        self.assertEqual(
+            [hand.result_key for _, hand in game.slots],
+            [Outcome.BLACKJACK_PUSH, Outcome.DEALER_BLACKJACK],
+        )
+        self.assertEqual(game.players[0].account.balance, 990)
+
+    def test_no_peek_deals_no_hole_card(self):
+        game = self.naturals_round(BlackjackRules.european())
+        self.assertEqual(self.ranks(game.dealer_hand), ["A"])
+        self.assertFalse(game.blackjack_check())
+        self.answers = ["S"]
+        game.player_decision()
+        game.dealer_draw()
+        self.assertEqual(self.ranks(game.dealer_hand), ["A", "K"])
+        game.check_win()
+        self.assertEqual(
+            [hand.result_key for _, hand in game.slots],
+            [Outcome.BLACKJACK_PUSH, Outcome.DEALER_BLACKJACK],
+        )
+
+
+class TestBotPlayer(TableTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.bot = blackjack.BotPlayer(Account.generate("Bot 2", 1000))
+        self.counter = blackjack.BotPlayer(Account.generate("Bot 3", 1000), counts_cards=True)
+
+    def action(self, ranks, dealer_up, can_double=True, can_split=False) -> str:
+        hand = make_hand(*ranks)
+        return self.bot.choose_action(hand, StandardCard(dealer_up, "hearts"), can_double, can_split)
+
+    def test_choose_action(self):
+        self.assertEqual(self.action(["10", "6"], "10"), "H")
+        self.assertEqual(self.action(["10", "6"], "6"), "S")
+        self.assertEqual(self.action(["5", "6"], "6"), "D")
+        self.assertEqual(self.action(["8", "8"], "10", can_split=True), "P")
+
+    def test_choose_action_falls_back(self):
+        self.assertEqual(self.action(["5", "6"], "6", can_double=False), "H")
+        self.assertEqual(self.action(["A", "7"], "4", can_double=False), "S")
+        # an unsplittable pair plays as its total
+        self.assertEqual(self.action(["8", "8"], "10"), "H")
+        self.assertEqual(self.action(["5", "5"], "6", can_split=True), "D")
+        self.assertEqual(self.action(["5", "5"], "6", can_double=False, can_split=True), "H")
+        self.assertEqual(self.action(["A", "A"], "6"), "H")
+
+    def test_choose_bet(self):
+        self.assertEqual(self.bot.choose_bet(10, 5.0), 10)
+        self.assertEqual(self.counter.choose_bet(10, 0.5), 10)
+        self.assertEqual(self.counter.choose_bet(10, 2.2), 20)
+        self.assertEqual(self.counter.choose_bet(10, 12), 80)
+        self.counter.balance = 35
+        self.assertEqual(self.counter.choose_bet(10, 12), 35)
+
+    def test_unwatched_bot_turn(self):
+        game = self.make_game("1")
+        self.assertFalse(game.watch_bots)
+        game.players = [self.bot]
+        game.bet()
+        self.assertEqual(self.bot.account.balance, 990)
+        # eights split against a ten; 11 doubles and 14 hits
+        self.stack(game, "8", "10", "8", "7", "3", "6", "9", "5")
+        game.deal_cards()
+        self.assertIsNone(game.player_decision())
+        self.assertEqual(
+            [(self.ranks(hand), hand.bet) for _, hand in game.slots],
+            [(["8", "3", "9"], 20), (["8", "6", "5"], 10)],
+        )
+        self.assertEqual(self.bot.account.balance, 970)
+        self.render_table.assert_not_called()
+        self.sleep.assert_not_called()
+        self.cinput.assert_called_once()
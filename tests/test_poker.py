@@ -0,0 +1,514 @@
+"""
+Unit testing for TERMINALCASINO/casino/games/poker
+"""
+
+import itertools
+import os
+import random
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from casino.cards import StandardCard
+from casino.games.poker import bot, buckets, equity, evaluator, history, poker, preflop, table, tournament
+from casino.games.poker.deck import PokerDeck, card_object
+
+
+def cards(*names: str) -> list[int]:
+    """Card ids from short names like "As", "Td" or "2c"."""
+    suits = {"c": "clubs", "d": "diamonds", "h": "hearts", "s": "spades"}
+    ids = []
+    for name in names:
+        rank = "10" if name[0] == "T" else name[0]
+        ids.append(evaluator.RANK_INDEX[rank] * 4 + evaluator.SUIT_INDEX[suits[name[1]]])
+    return ids
+
+
+def strength(*names: str) -> int:
+    return evaluator.evaluate(cards(*names))
+
+
+class TestEvaluator(unittest.TestCase):
+    def test_categories(self):
+        self.assertEqual(evaluator.category(strength("As", "Ks", "Qs", "Js", "Ts")),
+                         evaluator.STRAIGHT_FLUSH)
+        self.assertEqual(strength("As", "Ks", "Qs", "Js", "Ts"), 7462)
+        self.assertEqual(strength("7c", "5d", "4h", "3s", "2c"), 1)
+        self.assertEqual(evaluator.category(strength("Ah", "2d", "3c", "4s", "5h")),
+                         evaluator.STRAIGHT)
+        self.assertEqual(evaluator.hand_name(strength("9h", "9d", "9c", "4s", "4h")), "Full House")
+
+    def test_kickers(self):
+        # higher kicker wins
+        self.assertGreater(strength("Ah", "Ad", "Kc", "7s", "2h"), strength("As", "Ac", "Qc", "Js", "Th"))
+        # a flush is decided by its highest differing card
+        self.assertGreater(strength("Kh", "Jh", "9h", "6h", "3h"), strength("Kd", "Jd", "9d", "6d", "2d"))
+        # two pair compares the top pair, then the bottom pair, then the kicker
+        self.assertGreater(strength("Kh", "Kd", "3c", "3s", "4h"), strength("Qh", "Qd", "Jc", "Js", "Ah"))
+        self.assertGreater(strength("Kh", "Kd", "3c", "3s", "5h"), strength("Kc", "Ks", "3d", "3h", "4d"))
+        # the wheel is the lowest straight
+        self.assertLess(strength("Ah", "2d", "3c", "4s", "5h"), strength("2h", "3d", "4c", "5s", "6h"))
+        # suits never break ties
+        self.assertEqual(strength("Ah", "Kd", "9c", "7s", "2h"), strength("Ad", "Kc", "9s", "7h", "2d"))
+
+    def test_seven_cards_use_best_five(self):
+        rng = random.Random(3)
+        for _ in range(2000):
+            hand = rng.sample(range(52), 7)
+            best = max(evaluator.evaluate(five) for five in itertools.combinations(hand, 5))
+            self.assertEqual(evaluator.evaluate(hand), best)
+
+    def test_batch_matches_scalar(self):
+        rng = np.random.default_rng(5)
+        for size in (5, 6, 7):
+            hands = np.argsort(rng.random((3000, 52)), axis=1)[:, :size]
+            batch = evaluator.evaluate_batch(hands)
+            self.assertEqual(batch.tolist(), [evaluator.evaluate(hand) for hand in hands.tolist()])
+
+    def test_hand_score(self):
+        hand = [StandardCard("A", "spades"), StandardCard("K", "spades")]
+        board = [StandardCard(rank, "spades") for rank in ["Q", "J", "10"]]
+        self.assertEqual(poker.hand_name(poker.hand_score(hand, board)), "Straight Flush")
+        self.assertEqual(poker.hand_name(poker.hand_score(hand, [])), "High Card")
+
+
+class TestHandState(unittest.TestCase):
+    def test_matches_evaluate_every_street(self):
+        rng = random.Random(9)
+        for _ in range(500):
+            hand = rng.sample(range(52), 7)
+            state = evaluator.HandState()
+            for i, card in enumerate(hand):
+                state.add(card)
+                self.assertEqual(state.strength, evaluator.evaluate(hand[:i + 1]))
+
+    def test_partial_hands(self):
+        self.assertGreater(strength("Ah", "Ad"), strength("Kh", "Kd"))
+        self.assertGreater(strength("2h", "2d"), strength("Ah", "Kd"))
+        self.assertEqual(evaluator.hand_name(strength("Ah", "Ad", "Ac", "2d")), "Three of a Kind")
+        self.assertEqual(evaluator.hand_name(strength("Ah", "Ad", "2c", "2d")), "Two Pair")
+        # a partial hand never outranks a complete hand it can grow into
+        self.assertLessEqual(strength("Ah", "Ad"), strength("Ah", "Ad", "4c", "3s", "2h"))
+
+    def test_draws(self):
+        state = evaluator.HandState(cards("Ah", "Kh", "7h", "2h", "9c"))
+        self.assertTrue(state.flush_draw)
+        self.assertFalse(state.open_ended)
+        self.assertEqual(state.describe(), "High Card, flush draw")
+
+        state = evaluator.HandState(cards("8h", "9d", "Tc", "Js", "2h"))
+        self.assertTrue(state.open_ended)
+        self.assertFalse(state.gutshot)
+        state.add(cards("Qd")[0])
+        self.assertEqual(state.describe(), "Straight")
+
+        state = evaluator.HandState(cards("8h", "9d", "Jc", "Qs", "2h"))
+        self.assertTrue(state.gutshot)
+        # no draws once every card is out
+        state.add(cards("3d")[0])
+        state.add(cards("4c")[0])
+        self.assertFalse(state.gutshot)
+
+
+class TestEquity(unittest.TestCase):
+    def test_exact_on_turn_and_river(self):
+        hole, board = cards("Ah", "Kh"), cards("Qh", "7h", "2c", "9s")
+        result = equity.equity(hole, board)
+        self.assertTrue(result.exact)
+        self.assertEqual(result.samples, equity.num_runouts(hole, board))
+        self.assertAlmostEqual(result.win + result.tie + result.lose, 1.0)
+        # the nut flush on the river can't lose
+        river = equity.equity(hole, board + cards("3h"))
+        self.assertEqual(river.lose, 0.0)
+
+    def test_known_opponent(self):
+        # a flush draw plus two overs against a set on the turn: 9 flush outs
+        # that don't pair the board, out of 44 rivers
+        result = equity.equity(cards("Ah", "Kh"), cards("Qh", "7h", "2c", "9s"), cards("2d", "2s"))
+        self.assertAlmostEqual(result.win, 7 / 44)
+
+    def test_monte_carlo_matches_exact(self):
+        hole, board = cards("Ah", "Kh"), cards("Qh", "7h", "2c")
+        exact = equity.enumerate_equity(hole, board, cards("Qs", "Qd"))
+        sampled = equity.EquityCalculator().monte_carlo(hole, board, cards("Qs", "Qd"), seed=1)
+        self.assertFalse(sampled.exact)
+        self.assertAlmostEqual(sampled.equity, exact.equity, delta=4 * equity.TOLERANCE)
+
+    def test_preflop_is_seeded(self):
+        first = equity.equity(cards("Ah", "Ad"), seed=4)
+        self.assertEqual(first, equity.equity(cards("Ah", "Ad"), seed=4))
+        self.assertAlmostEqual(first.equity, 0.852, delta=0.02)
+
+    def test_process_pool(self):
+        with equity.EquityCalculator(workers=2) as calculator:
+            first = calculator.equity(cards("7c", "2d"), seed=8)
+            second = calculator.equity(cards("7c", "2d"), seed=8)
+        self.assertEqual(first, second)
+        self.assertAlmostEqual(first.equity, 0.346, delta=0.02)
+
+
+class TestPreflopTable(unittest.TestCase):
+    def test_hand_classes(self):
+        self.assertEqual(preflop.class_name(preflop.hand_class(*cards("Ah", "Ad"))), "AA")
+        self.assertEqual(preflop.class_name(preflop.hand_class(*cards("Kh", "Ah"))), "AKs")
+        self.assertEqual(preflop.class_name(preflop.hand_class(*cards("9c", "Td"))), "T9o")
+        self.assertEqual(len({preflop.hand_class(*combo) for combo in itertools.combinations(range(52), 2)}), 169)
+
+    def test_table(self):
+        table = preflop.table()
+        self.assertEqual(table.shape, (169, 169))
+        np.testing.assert_allclose(table + table.T, 1.0, atol=2e-3)
+        self.assertAlmostEqual(preflop.preflop_equity(cards("Ah", "Ad"), cards("Kh", "Kd")), 0.82, delta=0.015)
+        self.assertAlmostEqual(preflop.preflop_equity(cards("Ah", "Ad")), 0.852, delta=0.01)
+        self.assertAlmostEqual(preflop.preflop_equity(cards("7c", "2d")), 0.346, delta=0.01)
+
+
+class TestBuckets(unittest.TestCase):
+    def test_suit_isomorphic_index(self):
+        _, _, canonical, counts = buckets._flop_classes()
+        self.assertEqual(len(canonical), buckets.NUM_FLOPS)
+        self.assertEqual(counts.sum(), 22100)
+
+        rng = random.Random(4)
+        indices = set()
+        for _ in range(200):
+            hole_and_flop = rng.sample(range(52), 5)
+            index = buckets.situation_index(hole_and_flop[:2], hole_and_flop[2:])
+            suits = list(range(4))
+            rng.shuffle(suits)
+            relabelled = [(card >> 2) * 4 + suits[card & 3] for card in hole_and_flop]
+            self.assertEqual(buckets.situation_index(relabelled[1::-1], relabelled[:1:-1]), index)
+            self.assertLess(index, buckets.NUM_FLOPS * buckets.HOLES_PER_FLOP)
+            indices.add(index)
+        # different hands land on different indices
+        self.assertGreater(len(indices), 190)
+
+    def test_exact_strength_is_equity(self):
+        hole, board = cards("Ah", "Kh"), cards("Qh", "7h", "2c", "9s")
+        strength, squares = buckets.hand_strength(hole, board)
+        self.assertAlmostEqual(strength, equity.enumerate_equity(hole, board).equity)
+        self.assertGreater(squares, strength ** 2)
+        river = buckets.hand_strength(hole, board + cards("3d"))
+        self.assertAlmostEqual(river[0], equity.enumerate_equity(hole, board + cards("3d")).equity)
+        self.assertAlmostEqual(river[1], river[0] ** 2)
+
+    def test_flop_generator_matches_exact(self):
+        flop_class = 700
+        mean, squares, turns, rivers = buckets._flop_strengths(flop_class, 20, seed=0)
+        self.assertEqual(len(mean), buckets.HOLES_PER_FLOP)
+        self.assertEqual(turns.shape, (20, 2))
+        flop = buckets._flop_classes()[2][flop_class].tolist()
+        rng = random.Random(5)
+        for _ in range(3):
+            hole = rng.sample([card for card in range(52) if card not in flop], 2)
+            index = buckets.situation_index(hole, flop) - flop_class * buckets.HOLES_PER_FLOP
+            strength, strength_squared = buckets.hand_strength(hole, flop)
+            self.assertAlmostEqual(mean[index], strength)
+            self.assertAlmostEqual(squares[index], strength_squared)
+
+    def test_shipped_tables(self):
+        centroids = buckets.centroids()
+        self.assertEqual(centroids.shape, (3, buckets.NUM_BUCKETS, 2))
+        self.assertTrue((np.diff(centroids[:, :, 0], axis=1) >= 0).all())
+
+        rng = random.Random(6)
+        for _ in range(3):
+            dealt = rng.sample(range(52), 5)
+            point = np.array([buckets.hand_strength(dealt[:2], dealt[2:])])
+            nearest = buckets.assign(point, centroids[buckets.FLOP])[0]
+            self.assertEqual(buckets.bucket(dealt[:2], dealt[2:]), nearest)
+
+        board = cards("Kc", "8d", "3h")
+        self.assertGreater(buckets.bucket(cards("Ah", "Ad"), board), buckets.bucket(cards("7s", "2c"), board))
+        self.assertEqual(buckets.bucket(cards("8h", "8s"), board + cards("Kd", "8c")), buckets.NUM_BUCKETS - 1)
+
+    def test_truncated_flop_table(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "flop_buckets.u8")
+            np.zeros(1000, dtype=np.uint8).tofile(path)
+            with self.assertRaises(ValueError):
+                buckets.flop_table(path)
+
+
+class TestPokerBot(unittest.TestCase):
+    def setUp(self):
+        self.bot = bot.PokerBot(think_ms=50, rng=random.Random(0))
+
+    def test_preflop_ranges(self):
+        raise_range, play_range = bot.opening_ranges()
+        self.assertTrue(raise_range[preflop.hand_class(*cards("Ah", "Ad"))])
+        self.assertFalse(play_range[preflop.hand_class(*cards("7c", "2d"))])
+        self.assertTrue((play_range | ~raise_range).all())
+
+        decision = self.bot.decide(cards("Ah", "Kh"), [], 20, 30, 10, 1000)
+        self.assertEqual(decision, bot.Decision(bot.RAISE, 30))
+        self.assertEqual(self.bot.decide(cards("7c", "2d"), [], 200, 30, 10, 1000).action, bot.FOLD)
+        self.assertEqual(self.bot.decide(cards("7c", "2d"), [], 0, 30, 10, 1000).action, bot.CHECK)
+
+    def test_postflop_pot_odds(self):
+        board = cards("Ac", "Ad", "7h")
+        self.assertEqual(self.bot.decide(cards("Ah", "As"), board, 50, 100, 10, 1000).action, bot.RAISE)
+        # A gutshot to a pot sized bet is a fold, a small bet is a call
+        board = cards("9c", "8d", "2h", "Ks")
+        self.assertEqual(self.bot.decide(cards("Jh", "Tc"), board, 100, 100, 10, 1000).action, bot.FOLD)
+        self.assertEqual(self.bot.decide(cards("Jh", "Tc"), board, 5, 100, 10, 1000).action, bot.CALL)
+
+    def test_bucket_decisions(self):
+        bucket_bot = bot.PokerBot(buckets=True)
+        board = cards("Ac", "Ad", "7h")
+        self.assertEqual(bucket_bot.decide(cards("Ah", "As"), board, 50, 100, 10, 1000).action, bot.RAISE)
+        board = cards("9c", "8d", "2h", "Ks")
+        self.assertEqual(bucket_bot.decide(cards("Jh", "Tc"), board, 100, 100, 10, 1000).action, bot.FOLD)
+        self.assertEqual(bucket_bot.decide(cards("Jh", "Tc"), board, 5, 100, 10, 1000).action, bot.CALL)
+
+    def test_decisions_stay_within_budget(self):
+        hole = cards("Qs", "Jd")
+        for board in ([], cards("Ts", "4c", "2h"), cards("Ts", "4c", "2h", "9d"), cards("Ts", "4c", "2h", "9d", "3s")):
+            start = time.perf_counter()
+            self.bot.decide(hole, board, 20, 100, 10, 1000)
+            self.assertLess(time.perf_counter() - start, 0.2)
+
+    def test_anytime_equity_budget(self):
+        start = time.perf_counter()
+        result = equity.anytime_equity(cards("Qs", "Jd"), cards("Ts", "4c", "2h"), budget_ms=20, seed=1)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertFalse(result.exact)
+        self.assertGreater(result.samples, 0)
+        self.assertAlmostEqual(result.equity, equity.equity(cards("Qs", "Jd"), cards("Ts", "4c", "2h"), seed=1).equity, delta=0.05)
+
+
+class TestPokerDeck(unittest.TestCase):
+    def test_deal_and_reshuffle(self):
+        deck = PokerDeck(random.Random(1))
+        cards_list = deck.cards
+        hand = deck.deal(2)
+        deck.burn()
+        self.assertEqual(len(deck), 49)
+        dealt = hand + [deck.draw() for _ in range(49)]
+        self.assertEqual(sorted(dealt[:2] + [cards_list[2]] + dealt[2:]), list(range(52)))
+        with self.assertRaises(IndexError):
+            deck.draw()
+
+        deck.shuffle()
+        self.assertEqual(len(deck), 52)
+        self.assertIs(deck.cards, cards_list)
+        self.assertEqual(sorted(deck.cards), list(range(52)))
+
+    def test_seeded_deals_repeat(self):
+        first, second = PokerDeck(random.Random(5)), PokerDeck(random.Random(5))
+        self.assertEqual(first.deal(9), second.deal(9))
+
+    def test_card_objects(self):
+        card = card_object(evaluator.card_id(StandardCard("Q", "hearts")))
+        self.assertEqual((card.rank, card.suit), ("Q", "hearts"))
+
+
+class TestTable(unittest.TestCase):
+    def play_out(self, hold_em: table.Table) -> None:
+        while not hold_em.hand_over:
+            hold_em.act(table.CALL if hold_em.to_call() else table.CHECK)
+
+    def test_side_pots(self):
+        # seat 1 is all in for 50, seat 2 for 120, seat 3 folded after 80
+        pots = table.side_pots([200, 50, 120, 80], [True, True, True, False])
+        self.assertEqual(pots, [(200, [0, 1, 2]), (170, [0, 2]), (80, [0])])
+        self.assertEqual(sum(amount for amount, _ in pots), 450)
+
+    def test_blinds_rotate(self):
+        hold_em = table.Table([1000, 1000, 1000], 5, 10, rng=random.Random(1))
+        hold_em.start_hand()
+        self.assertEqual((hold_em.button, hold_em.small_blind_seat, hold_em.big_blind_seat), (0, 1, 2))
+        # under the gun is the button with three seats
+        self.assertEqual(hold_em.to_act, 0)
+        self.assertEqual(hold_em.total_pot, 15)
+        self.play_out(hold_em)
+        hold_em.start_hand()
+        self.assertEqual((hold_em.button, hold_em.small_blind_seat, hold_em.big_blind_seat), (1, 2, 0))
+
+    def test_button_carries_over(self):
+        hold_em = table.Table([1000, 1000, 1000], 5, 10, rng=random.Random(1), button=1)
+        hold_em.start_hand()
+        self.assertEqual((hold_em.button, hold_em.small_blind_seat, hold_em.big_blind_seat), (2, 0, 1))
+
+    def test_heads_up_button_posts_small_blind(self):
+        hold_em = table.Table([1000, 1000], 5, 10, rng=random.Random(2))
+        hold_em.start_hand()
+        self.assertEqual(hold_em.small_blind_seat, hold_em.button)
+        self.assertEqual(hold_em.to_act, hold_em.button)
+        hold_em.act(table.CALL)
+        # the big blind still has the option
+        self.assertEqual(hold_em.to_act, hold_em.big_blind_seat)
+        hold_em.act(table.CHECK)
+        self.assertEqual(hold_em.street, table.FLOP)
+        self.assertEqual(hold_em.to_act, hold_em.big_blind_seat)
+
+    def test_raises(self):
+        hold_em = table.Table([1000, 1000, 1000], 5, 10, rng=random.Random(3))
+        hold_em.start_hand()
+        with self.assertRaises(ValueError):
+            hold_em.act(table.CHECK)
+        with self.assertRaises(ValueError):
+            hold_em.act(table.RAISE, 5)
+        hold_em.act(table.RAISE, 30)
+        self.assertEqual((hold_em.current_bet, hold_em.min_raise), (40, 30))
+        hold_em.act(table.FOLD)
+        hold_em.act(table.CALL)
+        self.assertEqual(hold_em.street, table.FLOP)
+        self.assertEqual(hold_em.pot, 85)
+        self.assertEqual(hold_em.min_raise, 10)
+        self.assertEqual([a.action for a in hold_em.actions], [table.RAISE, table.FOLD, table.CALL])
+
+    def test_fold_ends_hand(self):
+        hold_em = table.Table([1000, 1000, 1000], 5, 10, rng=random.Random(4))
+        hold_em.start_hand()
+        hold_em.act(table.FOLD)
+        hold_em.act(table.FOLD)
+        self.assertTrue(hold_em.hand_over)
+        self.assertFalse(hold_em.showdown)
+        self.assertEqual([seat.stack for seat in hold_em.seats], [1000, 995, 1005])
+        with self.assertRaises(RuntimeError):
+            hold_em.act(table.CHECK)
+
+    def test_all_in_runs_out_the_board(self):
+        hold_em = table.Table([100, 300, 1000], 5, 10, rng=random.Random(5))
+        hold_em.start_hand()
+        hold_em.act(table.RAISE, 1000)  # the button goes all in for 100
+        hold_em.act(table.RAISE, 1000)  # the small blind for 300
+        hold_em.act(table.CALL)
+        self.assertTrue(hold_em.hand_over)
+        self.assertTrue(hold_em.showdown)
+        self.assertEqual(len(hold_em.board), 5)
+        self.assertEqual(sum(seat.stack for seat in hold_em.seats), 1400)
+        self.assertEqual(sum(hold_em.winnings), 700)
+        # the short stack can win at most the main pot
+        self.assertLessEqual(hold_em.winnings[0], 300)
+
+    def test_chips_are_conserved(self):
+        rng = random.Random(6)
+        for seats in range(table.MIN_SEATS, table.MAX_SEATS + 1):
+            stacks = [rng.randint(20, 400) for _ in range(seats)]
+            hold_em = table.Table(stacks, 5, 10, rng=random.Random(seats))
+            for _ in range(20):
+                if sum(seat.stack > 0 for seat in hold_em.seats) < 2:
+                    break
+                hold_em.start_hand()
+                while not hold_em.hand_over:
+                    roll = rng.random()
+                    if roll < 0.1 and hold_em.to_call():
+                        hold_em.act(table.FOLD)
+                    elif roll < 0.3:
+                        hold_em.act(table.RAISE, rng.choice([hold_em.min_raise, 500]))
+                    else:
+                        hold_em.act(table.CALL if hold_em.to_call() else table.CHECK)
+                self.assertEqual(sum(seat.stack for seat in hold_em.seats), sum(stacks))
+
+    def test_seat_limits(self):
+        with self.assertRaises(ValueError):
+            table.Table([1000], 5, 10)
+        with self.assertRaises(ValueError):
+            table.Table([1000] * 10, 5, 10)
+
+
+class TestTournament(unittest.TestCase):
+    config = tournament.TournamentConfig(players=7, seats=3, hands_per_level=3, bot_samples=50)
+
+    def test_plays_to_one_winner(self):
+        result = tournament.play_tournament(self.config, seed=11)
+        self.assertEqual(sorted(result.finish), list(range(1, 8)))
+        self.assertEqual(len(result.chips[0]), 7)
+        for stacks in result.chips:
+            self.assertEqual(sum(stacks), 7 * self.config.starting_stack)
+        winner = result.finish.index(1)
+        self.assertEqual(result.chips[-1][winner], 7 * self.config.starting_stack)
+        self.assertLessEqual(max(result.hands_played), result.hands)
+
+    def test_seeded_runs_repeat(self):
+        first = [r.to_dict() for r in tournament.run_tournaments(self.config, 3, seed=2, workers=1)]
+        second = [r.to_dict() for r in tournament.run_tournaments(self.config, 3, seed=2, workers=1)]
+        self.assertEqual(first, second)
+        self.assertEqual([r["tournament"] for r in first], [0, 1, 2])
+        self.assertEqual(len({r["seed"] for r in first}), 3)
+
+    def test_reseat_keeps_button_order(self):
+        # players 4 and 9 have never had the button; 4 is seated first
+        last_button = [5, 3, 8, 1, -1, 7, 2, 6, 0, -1]
+        self.assertEqual(tournament._first_button([2, 4, 9, 0], last_button), 1)
+        self.assertEqual(tournament._first_button([2, 5, 1], last_button), 2)
+
+    def test_blinds_keep_rising(self):
+        config = tournament.TournamentConfig(blinds=((5, 10), (10, 20)))
+        self.assertEqual(config.level_blinds(1), (10, 20))
+        self.assertEqual(config.level_blinds(3), (40, 80))
+
+
+class TestHandHistory(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "hands.bin")
+
+    def play(self, writer: history.HandHistoryWriter, hands: int, seed: int = 0) -> table.Table:
+        hold_em = table.Table([1000, 1000, 1000], 5, 10, rng=random.Random(seed), history=writer)
+        for _ in range(hands):
+            hold_em.start_hand()
+            hold_em.act(table.RAISE, 20)
+            hold_em.act(table.FOLD)
+            while not hold_em.hand_over:
+                hold_em.act(table.CALL if hold_em.to_call() else table.CHECK)
+        return hold_em
+
+    def test_round_trip(self):
+        with history.HandHistoryWriter(self.path) as writer:
+            hold_em = self.play(writer, 1)
+        hand = history.load_hands(self.path)[0]
+        self.assertEqual(hand["num_seats"], 3)
+        self.assertEqual(hand["button"], hold_em.button)
+        self.assertEqual(hand["board"].tolist(), hold_em.board)
+        self.assertEqual(hand["hole"][:3].tolist(), [seat.hole for seat in hold_em.seats])
+        self.assertTrue((hand["hole"][3:] == history.NO_CARD).all())
+        self.assertEqual(hand["stack"][:3].tolist(), [1000, 1000, 1000])
+        self.assertEqual(hand["won"][:3].tolist(), hold_em.winnings)
+        self.assertEqual(hand["pot"], sum(hold_em.winnings))
+
+        # the button raises, the small blind folds and the big blind calls
+        button, small_blind, big_blind = hold_em.button, hold_em.small_blind_seat, hold_em.big_blind_seat
+        flags = hand["flags"]
+        self.assertEqual(flags[button], history.DEALT | history.VPIP | history.PREFLOP_RAISE)
+        self.assertEqual(flags[small_blind], history.DEALT | history.FOLDED)
+        self.assertEqual(flags[big_blind], history.DEALT | history.VPIP)
+
+        actions = history.hand_actions(self.path, hand)
+        self.assertEqual(len(actions), len(hold_em.actions))
+        self.assertEqual(
+            [(history.STREETS[a["street"]], a["seat"], history.ACTIONS[a["action"]], a["amount"]) for a in actions],
+            [(a.street, a.seat, a.action, a.amount) for a in hold_em.actions],
+        )
+
+    def test_buffered_and_appended(self):
+        writer = history.HandHistoryWriter(self.path, flush_every=10)
+        self.play(writer, 9)
+        self.assertFalse(os.path.exists(self.path))
+        self.play(writer, 1)
+        self.assertEqual(len(history.load_hands(self.path)), 10)
+
+        # a second writer appends after the hands already on disk
+        with history.HandHistoryWriter(self.path) as writer:
+            self.play(writer, 5, seed=1)
+        hands = np.concatenate(list(history.read_hands(self.path, chunk=4)))
+        self.assertEqual(len(hands), 15)
+        actions = np.concatenate(list(history.read_actions(self.path, chunk=7)))
+        self.assertEqual(hands["first_action"][-1] + hands["num_actions"][-1], len(actions))
+
+    def test_position_stats(self):
+        with history.HandHistoryWriter(self.path) as writer:
+            self.play(writer, 30)
+        stats = history.position_stats(self.path, chunk=7)
+        self.assertEqual(stats["hands"][:3].tolist(), [30, 30, 30])
+        self.assertEqual(stats["hands"][3:].sum(), 0)
+        # only the button raises, the small blind always folds
+        self.assertEqual(stats["vpip"][:3].tolist(), [1.0, 0.0, 1.0])
+        self.assertEqual(stats["pfr"][:3].tolist(), [1.0, 0.0, 0.0])
+        self.assertAlmostEqual(stats["bb_per_100"][1], -50.0)
+        self.assertAlmostEqual(stats["bb_per_100"][:3].sum(), 0.0)
@@ -0,0 +1,318 @@
+"""
+Unit testing for TERMINALCASINO/casino/games/roulette
+"""
+
+import io
+import os
+import random
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from casino.accounts import Account
+from casino.games.roulette import bets, history
+from casino.games.roulette.european_roulette import EuropeanRoulette
+from casino.games.roulette.roulette import AmericanRoulette
+from casino.games.roulette.table import Roulette
+from casino.games.roulette.wheels import STANDARD_EUROPEAN_ROULETTE_WHEEL
+
+
+def reference_multiplier(kind: str, value: str, winning: str) -> int:
+    """Chips returned per chip, worked out bet by bet."""
+    if kind.startswith("inside_"):
+        numbers = value.split("-")
+        return 36 // len(numbers) if winning in numbers else 0
+    if kind == "outside_color" and value == "green":
+        greens = {"0", "00"}
+        return 18 if winning in greens else 0
+    if winning in {"0", "00"}:
+        return 0
+    n = int(winning)
+    if kind == "outside_dozen":
+        return 3 if (n - 1) // 12 + 1 == int(value) else 0
+    if kind == "outside_column":
+        return 3 if (n - 1) % 3 + 1 == int(value) else 0
+    wins = {
+        "outside_color": (value == "red") == (n in bets.RED_NUMBERS),
+        "outside_parity": (value == "odd") == (n % 2 == 1),
+        "outside_highlow": (value == "low") == (n <= 18),
+    }
+    return 2 if wins[kind] else 0
+
+
+class TestBetTable(unittest.TestCase):
+
+    def test_matrix_matches_reference(self):
+        for table in (bets.EUROPEAN_BETS, bets.AMERICAN_BETS):
+            for bet_id, bet in enumerate(table.definitions):
+                if bet.kind == "outside_color" and bet.value == "green" and table.num_pockets == 37:
+                    continue
+                for pocket in range(table.num_pockets):
+                    self.assertEqual(
+                        table.multiplier(bet_id, pocket),
+                        reference_multiplier(bet.kind, bet.value, bets.POCKET_LABELS[pocket]),
+                        (bet, pocket),
+                    )
+
+    def test_shape(self):
+        self.assertEqual(bets.EUROPEAN_BETS.by_pocket.shape, (37, len(bets.EUROPEAN_BETS)))
+        self.assertEqual(bets.AMERICAN_BETS.by_pocket.shape, (38, len(bets.AMERICAN_BETS)))
+        self.assertEqual(bets.pocket_index("00"), 37)
+
+    def test_expected_return(self):
+        # Every bet but the basket loses 1/37 (European) or 2/38 (American)
+        for table, edge in ((bets.EUROPEAN_BETS, 1 / 37), (bets.AMERICAN_BETS, 2 / 38)):
+            returns = table.by_pocket.mean(axis=0)
+            for bet, expected in zip(table.definitions, returns):
+                if bet.kind != "inside_basket":
+                    self.assertAlmostEqual(expected, 1 - edge, msg=bet)
+        basket = bets.AMERICAN_BETS.bet_id("inside_basket", "0-00-1-2-3")
+        self.assertAlmostEqual(bets.AMERICAN_BETS.by_pocket[:, basket].mean(), 1 - 3 / 38)
+
+    def test_inside_bet_counts(self):
+        expected = {
+            bets.EUROPEAN_BETS: {"inside_number": 37, "inside_split": 60, "inside_street": 14,
+                                 "inside_corner": 23, "inside_line": 11},
+            bets.AMERICAN_BETS: {"inside_number": 38, "inside_split": 62, "inside_street": 15,
+                                 "inside_corner": 22, "inside_line": 11, "inside_basket": 1},
+        }
+        for table, counts in expected.items():
+            kinds = [bet.kind for bet in table.definitions if bet.kind.startswith("inside_")]
+            self.assertEqual({kind: kinds.count(kind) for kind in kinds}, counts)
+
+    def test_inside_bet_id(self):
+        table = bets.EUROPEAN_BETS
+        cases = {
+            "17": ("inside_number", 36),
+            "20-17": ("inside_split", 18),
+            "13 14 15": ("inside_street", 12),
+            "0-2-3": ("inside_street", 12),
+            "17,18,20,21": ("inside_corner", 9),
+            "0-1-2-3": ("inside_corner", 9),
+            "31-32-33-34-35-36": ("inside_line", 6),
+        }
+        for text, (kind, multiplier) in cases.items():
+            bet = table.definitions[table.inside_bet_id(bets.split_labels(text))]
+            self.assertEqual((bet.kind, bet.multiplier), (kind, multiplier), text)
+
+        for text in ("17-21", "3-4", "36-37", "17-17", "0-00", "0-00-1-2-3", "1-2-3-4", "red"):
+            with self.assertRaises(ValueError, msg=text):
+                table.inside_bet_id(bets.split_labels(text))
+
+        basket = bets.AMERICAN_BETS.inside_bet_id(bets.split_labels("3-2-1-00-0"))
+        self.assertEqual(bets.AMERICAN_BETS.definitions[basket].multiplier, 7)
+
+    def test_resolve(self):
+        table = bets.EUROPEAN_BETS
+        bet_ids = np.array([
+            table.bet_id("inside_number", "17"),
+            table.bet_id("outside_color", "black"),
+            table.bet_id("outside_color", "red"),
+            table.bet_id("outside_dozen", "2"),
+            table.bet_id("outside_column", "2"),
+        ])
+        stakes = np.array([10, 20, 30, 40, 50])
+        np.testing.assert_array_equal(
+            table.resolve(bet_ids, stakes, bets.pocket_index("17")),
+            [360, 40, 0, 120, 150],
+        )
+        np.testing.assert_array_equal(table.resolve(bet_ids, stakes, 0), [0, 0, 0, 0, 0])
+
+    def test_unknown_bet(self):
+        with self.assertRaises(ValueError):
+            bets.EUROPEAN_BETS.bet_id("outside_dozen", "4")
+
+
+class TestBetSlip(unittest.TestCase):
+
+    def test_add_and_totals(self):
+        slip = bets.BetSlip(3, capacity=2)
+        for bet_id, (account, stake) in enumerate([(0, 10), (2, 5), (0, 7), (0, 1), (2, 3)]):
+            slip.add(account, bet_id, stake)
+        self.assertEqual(len(slip), 5)
+        self.assertEqual(slip.bet_ids.tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(slip.totals.tolist(), [18, 0, 8])
+        self.assertEqual(slip.bets_of(2), [(1, 5), (4, 3)])
+
+    def test_fits(self):
+        slip = bets.BetSlip(1)
+        slip.add(0, 0, 60)
+        self.assertTrue(slip.fits(0, 40, 100))
+        self.assertFalse(slip.fits(0, 41, 100))
+        self.assertFalse(slip.fits(0, 0, 100))
+
+    def test_repeat_and_double(self):
+        slip = bets.BetSlip(2)
+        slip.add(0, 3, 10)
+        slip.add(1, 5, 4)
+
+        doubled = slip.doubled()
+        self.assertEqual(doubled.stakes.tolist(), [20, 8])
+        self.assertEqual(doubled.totals.tolist(), [20, 8])
+        self.assertEqual(doubled.over_balance(np.array([20, 7])).tolist(), [False, True])
+
+        # Changing a repeated slip leaves the original alone
+        doubled.add(0, 7, 1)
+        repeated = slip.repeat()
+        repeated.add(1, 9, 2)
+        self.assertEqual(doubled.stakes.tolist(), [20, 8, 1])
+        self.assertEqual(repeated.stakes.tolist(), [10, 4, 2])
+        self.assertEqual(slip.stakes.tolist(), [10, 4])
+        self.assertEqual(slip.totals.tolist(), [10, 4])
+
+    def test_resolve(self):
+        table = bets.EUROPEAN_BETS
+        slip = bets.BetSlip(2)
+        slip.add(0, table.bet_id("inside_number", "17"), 10)
+        slip.add(0, table.bet_id("outside_color", "red"), 5)
+        slip.add(1, table.bet_id("outside_parity", "odd"), 3)
+        slip.add(1, table.bet_id("outside_dozen", "2"), 4)
+        self.assertEqual(slip.resolve(table, bets.pocket_index("17")).tolist(), [360, 18])
+        self.assertEqual(slip.doubled().resolve(table, bets.pocket_index("17")).tolist(), [720, 36])
+
+
+class TestSpinHistory(unittest.TestCase):
+
+    def test_counts_match_recount(self):
+        rng = random.Random(4)
+        spins = [rng.randrange(38) for _ in range(500)]
+        record = history.SpinHistory(38, size=40)
+        for played, pocket in enumerate(spins, 1):
+            record.record(pocket)
+            window = spins[max(0, played - 40):played]
+            self.assertEqual(record.recent(5), window[::-1][:5])
+            for index, feature in enumerate(history.FEATURES):
+                values = [history.POCKET_FEATURES[p][index] for p in window]
+                for value in range(history.FEATURE_SIZES[index]):
+                    self.assertEqual(record.count(feature, value), values.count(value))
+        self.assertEqual((record.spins, len(record)), (500, 40))
+
+    def test_streaks_and_hot_cold(self):
+        record = history.SpinHistory(37, size=10)
+        for pocket in (1, 3, 3, 5, 4):
+            record.record(pocket)
+        self.assertEqual(record.streak("color"), (1, 1))   # black
+        self.assertEqual(record.streak("dozen"), (0, 5))
+        self.assertEqual(record.streak("column"), (0, 1))
+        self.assertEqual(record.streak("pocket"), (4, 1))
+        self.assertEqual(record.hot(1), [3])
+        self.assertEqual(record.cold(2), [0, 2])
+
+    def test_spin_log(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = history.wheel_log_path(os.path.join(directory, "spins.bin"), bets.AMERICAN_POCKETS)
+            self.assertTrue(path.endswith("spins.american.bin"))
+            spins = [37, 0, 12, 12, 12, 5, 7]
+            with history.SpinHistory(38, size=3, path=path, flush_every=4) as record:
+                for pocket in spins:
+                    record.record(pocket)
+            self.assertEqual(history.load_spins(path).tolist(), spins)
+            longest = history.longest_streaks(history.load_spins(path))
+            self.assertEqual(longest["pocket"], (12, 3))
+            self.assertEqual(longest["color"], (0, 5))  # 12, 12, 12, 5, 7 are red
+        self.assertEqual(history.wheel_log_path("", bets.EUROPEAN_POCKETS), "")
+
+
+class TestPayout(unittest.TestCase):
+
+    def test_european_payout(self):
+        accounts = [Account.generate("a", 0), Account.generate("b", 0), Account.generate("c", 0)]
+        roulette = EuropeanRoulette(accounts)
+        roulette._save_bet(0, "inside_number", "5", 10)
+        roulette._save_bet(2, "outside_parity", "odd", 7)
+        roulette._save_bet(2, "outside_dozen", "3", 7)
+        roulette._save_bet(1, "inside_corner", "1-2-4-5", 10)
+        roulette.winning_value = ("5", "red", 0, 0)
+        with redirect_stdout(io.StringIO()):
+            roulette.payout()
+        self.assertEqual([a.balance for a in accounts], [360, 90, 14])
+
+    def test_american_payout(self):
+        accounts = [Account.generate("a", 0), Account.generate("b", 0)]
+        roulette = AmericanRoulette(accounts)
+        roulette.slip.add(0, roulette.bet_table.bet_id("inside_number", "00"), 10)
+        roulette.slip.add(1, roulette.bet_table.bet_id("outside_color", "green"), 10)
+        roulette.winning_value = ("00", "green", 0, 0)
+        with redirect_stdout(io.StringIO()):
+            roulette.payout()
+        self.assertEqual([a.balance for a in accounts], [360, 180])
+
+    def test_repeat_bets(self):
+        accounts = [Account.generate("a", 100)]
+        roulette = EuropeanRoulette(accounts)
+        self.assertIsNotNone(roulette.repeat_bets())
+
+        roulette._save_bet(0, "outside_color", "red", 30)
+        roulette._save_bet(0, "inside_number", "0", 10)
+        roulette.collect_stakes()
+        self.assertEqual(accounts[0].balance, 60)
+        roulette.reset_round()
+
+        # Doubling needs 80 chips but only 60 are left
+        self.assertIsNotNone(roulette.repeat_bets(double=True))
+        self.assertEqual(len(roulette.slip), 0)
+        self.assertIsNone(roulette.repeat_bets())
+        roulette.collect_stakes()
+        self.assertEqual(accounts[0].balance, 20)
+
+        roulette.winning_value = ("0", "green", 0, 0)
+        with redirect_stdout(io.StringIO()):
+            roulette.payout()
+        self.assertEqual(accounts[0].balance, 380)
+
+
+def play_seeded_table(table_class, seed: int, spins: int = 200) -> tuple[list[str], list[int]]:
+    """Winning numbers and the balance after each spin at a seeded table."""
+    account = Account.generate("a", 10_000)
+    roulette = table_class([account], rng=random.Random(seed))
+    numbers, balances = [], []
+    for _ in range(spins):
+        roulette.reset_round()
+        roulette._save_bet(0, "outside_color", "red", 10)
+        roulette._save_bet(0, "inside_split", "17-20", 5)
+        roulette.collect_stakes()
+        roulette.spin()
+        number = roulette.winning_value[0]
+        roulette.wheel_frame(number)
+        account.deposit(int(roulette.slip.resolve(roulette.bet_table, bets.pocket_index(number))[0]))
+        numbers.append(number)
+        balances.append(account.balance)
+    return numbers, balances
+
+
+class TestTables(unittest.TestCase):
+
+    def test_tables_are_independent(self):
+        first = EuropeanRoulette([], rng=random.Random(7))
+        second = EuropeanRoulette([], rng=random.Random(7))
+        american = AmericanRoulette([], rng=random.Random(7))
+        for _ in range(50):
+            first.spin()
+            american.spin()
+            first.spin()
+            second.spin()
+            second.spin()
+        self.assertEqual(first.history.recent(100), second.history.recent(100))
+        self.assertEqual(american.history.spins, 50)
+        self.assertEqual(american.bet_table.num_pockets, 38)
+        self.assertIsNot(first.wheel_frame("0"), second.wheel_frame("0"))
+        self.assertEqual(first.wheel_frame("0"), second.wheel_frame("0"))
+
+        # A table is set up by its wheel alone
+        plain = Roulette([], STANDARD_EUROPEAN_ROULETTE_WHEEL)
+        self.assertIs(plain.bet_table, bets.EUROPEAN_BETS)
+        self.assertEqual(plain.layout, first.layout)
+
+    def test_concurrent_tables(self):
+        jobs = [(table_class, seed) for seed in range(8) for table_class in (EuropeanRoulette, AmericanRoulette)]
+        alone = [play_seeded_table(table_class, seed) for table_class, seed in jobs]
+        with ThreadPoolExecutor(8) as pool:
+            together = list(pool.map(lambda job: play_seeded_table(*job), jobs))
+        self.assertEqual(together, alone)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Unit testing for TERMINALCASINO/casino/sampling.py
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from casino.sampling import AliasTable
+
+
+def table_probabilities(table: AliasTable) -> np.ndarray:
+    """Chance of each index implied by the prob and alias columns."""
+    n = len(table)
+    chances = table.prob / n
+    np.add.at(chances, table.alias, (1 - table.prob) / n)
+    return chances
+
+
+class TestAliasTable(unittest.TestCase):
+
+    def test_table_matches_weights(self):
+        rng = random.Random(3)
+        for weights in ([1], [1, 1, 1], [1, 2, 3, 0, 94], [rng.random() for _ in range(50)], [0, 0, 5]):
+            table = AliasTable(weights)
+            expected = np.array(weights) / sum(weights)
+            np.testing.assert_allclose(table_probabilities(table), expected, atol=1e-12)
+            np.testing.assert_allclose(table.probabilities, expected)
+
+    def test_zero_weights_never_drawn(self):
+        table = AliasTable([0, 3, 0, 1])
+        samples = table.sample(100_000, np.random.default_rng(1))
+        self.assertFalse(np.isin(samples, [0, 2]).any())
+        rng = random.Random(1)
+        self.assertTrue(all(table.draw(rng) in (1, 3) for _ in range(10_000)))
+
+    def test_sample_frequencies(self):
+        weights = [5, 1, 10, 4]
+        table = AliasTable(weights)
+        samples = table.sample(1_000_000, np.random.default_rng(7))
+        frequencies = np.bincount(samples, minlength=4) / len(samples)
+        np.testing.assert_allclose(frequencies, np.array(weights) / 20, atol=0.002)
+
+        rng = random.Random(7)
+        draws = np.bincount([table.draw(rng) for _ in range(200_000)], minlength=4) / 200_000
+        np.testing.assert_allclose(draws, np.array(weights) / 20, atol=0.005)
+
+    def test_invalid_weights(self):
+        for weights in ([], [0, 0], [1, -1], [1, float("inf")]):
+            with self.assertRaises(ValueError):
+                AliasTable(weights)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,332 @@
+"""
+Unit testing for TERMINALCASINO/casino/games/slots
+"""
+
+import itertools
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from casino.games.slots import autoplay, jackpot, machine, slots
+
+
+def all_stops(slot_machine: machine.SlotMachine):
+    return itertools.product(*(range(len(strip)) for strip in slot_machine.strips))
+
+
+def brute_force_stats(slot_machine: machine.SlotMachine, bets: list[int]) -> tuple[float, float, float]:
+    """RTP, hit frequency and variance by looping over every stop combination."""
+    weights = slot_machine.stop_weights or tuple((1,) * len(strip) for strip in slot_machine.strips)
+    total = rtp = hits = squares = 0
+    for stops in all_stops(slot_machine):
+        chance = 1
+        for reel, stop in enumerate(stops):
+            chance *= weights[reel][stop]
+        returned = 0
+        for line, bet in enumerate(bets):
+            pay = slot_machine.pay(slot_machine.line(stops, line))
+            returned += bet * (1 + pay) if pay else 0
+        returned /= sum(bets)
+        total += chance
+        rtp += chance * returned
+        squares += chance * returned ** 2
+        hits += chance if returned else 0
+    rtp /= total
+    return rtp, hits / total, squares / total - rtp ** 2
+
+
+class TestSlotMachine(unittest.TestCase):
+
+    def test_paytable_from_items(self):
+        paytable = machine.build_paytable()
+        for item in machine.LOW_ITEMS:
+            self.assertEqual(paytable[item], machine.LOW_PAY)
+        for item in machine.HIGH_ITEMS:
+            self.assertEqual(paytable[item], machine.HIGH_PAY)
+
+    def test_line_and_pay(self):
+        slot_machine = machine.SlotMachine(
+            strips=(("A", "D"), ("A", "D", "B"), ("D", "A")),
+        )
+        self.assertEqual(slot_machine.line((0, 0, 1)), ("A", "A", "A"))
+        self.assertEqual(slot_machine.pay(("A", "A", "A")), machine.LOW_PAY)
+        self.assertEqual(slot_machine.line((1, 1, 0)), ("D", "D", "D"))
+        self.assertEqual(slot_machine.pay(("D", "D", "D")), machine.HIGH_PAY)
+        self.assertEqual(slot_machine.pay(("A", "D", "A")), 0)
+        # Stops wrap around the strip
+        self.assertEqual(slot_machine.line((-1, 4, 3)), ("D", "D", "A"))
+
+    def test_spin_stops_on_strip(self):
+        rng = random.Random(1)
+        slot_machine = machine.SlotMachine()
+        for _ in range(1000):
+            stops = slot_machine.spin(rng)
+            self.assertEqual(len(stops), len(slot_machine.strips))
+            for stop, strip in zip(stops, slot_machine.strips):
+                self.assertTrue(0 <= stop < len(strip))
+
+    def test_window_and_paylines(self):
+        slot_machine = machine.SlotMachine(
+            strips=(("A", "B", "C"), ("B", "C", "D"), ("C", "D", "A")),
+        )
+        self.assertEqual(slot_machine.window((1, 1, 1)), (
+            ("A", "B", "C"),
+            ("B", "C", "D"),
+            ("C", "D", "A"),
+        ))
+        self.assertEqual(slot_machine.line((1, 1, 1), 0), ("B", "C", "D"))
+        diagonal = slot_machine.paylines.index((0, 1, 2))
+        self.assertEqual(slot_machine.line((1, 1, 1), diagonal), ("A", "C", "A"))
+
+    def test_standard_paylines(self):
+        self.assertEqual(machine.standard_paylines(3)[:5], (
+            (1, 1, 1), (0, 0, 0), (2, 2, 2), (0, 1, 2), (2, 1, 0),
+        ))
+        lines = machine.standard_paylines(5)
+        self.assertIn((0, 1, 2, 1, 0), lines)
+        self.assertIn((2, 1, 0, 1, 2), lines)
+        self.assertIn((0, 1, 0, 1, 0), lines)
+        self.assertEqual(len(set(lines)), len(lines))
+
+    def test_invalid_payline(self):
+        with self.assertRaises(ValueError):
+            machine.SlotMachine(paylines=((1, 1),))
+        with self.assertRaises(ValueError):
+            machine.SlotMachine(paylines=((0, 3, 0),))
+
+    def test_line_wins_match_each_line(self):
+        slot_machine = machine.SlotMachine(strips=machine.REEL_STRIPS + machine.REEL_STRIPS[:2])
+        rng = random.Random(7)
+        for _ in range(2000):
+            stops = slot_machine.spin(rng)
+            expected = []
+            for line in range(len(slot_machine.paylines)):
+                symbols = slot_machine.line(stops, line)
+                if slot_machine.pay(symbols):
+                    expected.append(machine.LineWin(line, symbols[0], slot_machine.pay(symbols)))
+            self.assertEqual(slot_machine.line_wins(stops), expected)
+            self.assertEqual(slot_machine.line_wins(stops, 2), [w for w in expected if w.line < 2])
+
+    def test_net_win(self):
+        slot_machine = machine.SlotMachine()
+        wins = [machine.LineWin(1, "A", 10), machine.LineWin(3, "D", 60)]
+        self.assertEqual(slot_machine.net_win(wins, [2, 3, 4, 5]), -2 + 30 - 4 + 300)
+        self.assertEqual(slot_machine.net_win([], [5]), -5)
+
+    def test_line_pays_match_line_wins(self):
+        slot_machine = machine.SlotMachine()
+        stops = np.array(list(all_stops(slot_machine)))
+        pays = machine.line_pays(slot_machine, stops)
+        for row, spin in zip(pays, stops):
+            expected = np.zeros(len(slot_machine.paylines))
+            for win in slot_machine.line_wins(tuple(spin)):
+                expected[win.line] = win.pay
+            np.testing.assert_array_equal(row, expected)
+
+    def test_stats_match_brute_force(self):
+        slot_machine = machine.SlotMachine(
+            strips=(("A", "B", "D", "C"), ("B", "A", "A", "D", "E"), ("D", "A", "B")),
+        )
+        for bets in ([1], [1, 1, 1], [3, 0, 1, 2, 5]):
+            stats = machine.machine_stats(slot_machine, bets)
+            rtp, hits, variance = brute_force_stats(slot_machine, bets)
+            self.assertEqual(stats.combinations, 4 * 5 * 3)
+            self.assertAlmostEqual(stats.rtp, rtp)
+            self.assertAlmostEqual(stats.hit_frequency, hits)
+            self.assertAlmostEqual(stats.variance, variance)
+
+    def test_weighted_stops(self):
+        strips = (("A", "B", "D"), ("B", "A", "D", "A"), ("D", "A", "B"))
+        weights = ((3, 1, 1), (1, 2, 1, 4), (1, 5, 2))
+        slot_machine = machine.SlotMachine(strips=strips, stop_weights=weights)
+        for bets in ([1], [1, 2, 1, 1, 1]):
+            stats = machine.machine_stats(slot_machine, bets)
+            rtp, hits, variance = brute_force_stats(slot_machine, bets)
+            self.assertAlmostEqual(stats.rtp, rtp)
+            self.assertAlmostEqual(stats.hit_frequency, hits)
+            self.assertAlmostEqual(stats.variance, variance)
+
+        rng = random.Random(2)
+        first_reel = [slot_machine.spin(rng)[0] for _ in range(20_000)]
+        self.assertAlmostEqual(first_reel.count(0) / len(first_reel), 0.6, delta=0.02)
+
+    def test_invalid_stop_weights(self):
+        with self.assertRaises(ValueError):
+            machine.SlotMachine(stop_weights=((1, 2),))
+
+    def test_stats_in_chunks(self):
+        slot_machine = machine.SlotMachine()
+        whole = machine.machine_stats(slot_machine)
+        chunk = machine.ENUMERATION_CHUNK
+        try:
+            machine.ENUMERATION_CHUNK = 7
+            chunked = machine.machine_stats(slot_machine)
+        finally:
+            machine.ENUMERATION_CHUNK = chunk
+        self.assertEqual(whole.combinations, chunked.combinations)
+        self.assertAlmostEqual(whole.rtp, chunked.rtp)
+        self.assertAlmostEqual(whole.variance, chunked.variance)
+
+    def test_default_machine(self):
+        slot_machine = machine.SlotMachine()
+        for lines in (1, len(slot_machine.paylines)):
+            stats = machine.machine_stats(slot_machine, [1] * lines)
+            rtp, hits, variance = brute_force_stats(slot_machine, [1] * lines)
+            self.assertAlmostEqual(stats.rtp, rtp)
+            self.assertAlmostEqual(stats.hit_frequency, hits)
+            self.assertAlmostEqual(stats.variance, variance)
+            self.assertTrue(0.9 < stats.rtp < 1)
+
+    def test_legend_from_paytable(self):
+        legend = slots.generate_payout_legend({"A": 10, "B": 10, "D": 60})
+        self.assertEqual(legend.splitlines(), [
+            "Matching A | B  | x10",
+            "Matching D      | x60",
+        ])
+
+
+class TestAutoplay(unittest.TestCase):
+
+    def setUp(self):
+        self.machine = machine.SlotMachine()
+
+    def run_autoplay(self, limits, balance=10_000, bets=(2, 2, 2), seed=1, batch_size=50):
+        rng = np.random.default_rng(seed)
+        return list(autoplay.autoplay(self.machine, list(bets), balance, limits, rng, batch_size))
+
+    def test_spin_batch_matches_line_wins(self):
+        bets = [1, 2, 3, 4]
+        batch = autoplay.spin_batch(self.machine, bets, 500, np.random.default_rng(5))
+        for stops, won, net in zip(batch.stops, batch.won, batch.net):
+            wins = self.machine.line_wins(tuple(stops), len(bets))
+            self.assertEqual(won, sum(bets[win.line] * win.pay for win in wins))
+            self.assertEqual(net, self.machine.net_win(wins, bets))
+
+    def test_plays_requested_spins(self):
+        batches = self.run_autoplay(autoplay.AutoplayLimits(spins=120), balance=10**6)
+        self.assertEqual(sum(batch.spins for batch in batches), 120)
+        self.assertEqual([batch.spins for batch in batches], [50, 50, 20])
+        self.assertEqual(batches[-1].stop_reason, autoplay.SPINS_DONE)
+        self.assertTrue(all(batch.stop_reason is None for batch in batches[:-1]))
+
+    def test_batches_replay_spin_by_spin(self):
+        limits = autoplay.AutoplayLimits(spins=10_000, loss_limit=200, win_threshold=100)
+        batches = self.run_autoplay(limits, batch_size=64)
+        # Replay the same draws one spin at a time
+        rng = np.random.default_rng(1)
+        spins, net, stopped = 0, 0, None
+        while stopped is None:
+            batch = autoplay.spin_batch(self.machine, [2, 2, 2], min(64, 10_000 - spins), rng)
+            for won, spin_net in zip(batch.won, batch.net):
+                spins += 1
+                net += int(spin_net)
+                if net <= -200:
+                    stopped = autoplay.LOSS_LIMIT
+                elif won >= 100:
+                    stopped = autoplay.BIG_WIN
+                if stopped:
+                    break
+        self.assertEqual(sum(batch.spins for batch in batches), spins)
+        self.assertEqual(sum(batch.net for batch in batches), net)
+        self.assertEqual(batches[-1].stop_reason, stopped)
+
+    def test_jackpot_stops_on_winning_spin(self):
+        limits = autoplay.AutoplayLimits(spins=10_000)
+        batches = list(autoplay.autoplay(
+            self.machine, [2, 2, 2], 10**6, limits, np.random.default_rng(3), 64, jackpot_odds=1 / 500))
+        self.assertEqual(batches[-1].stop_reason, autoplay.JACKPOT)
+
+        # Replay the same draws: the first hit is the last spin played
+        rng = np.random.default_rng(3)
+        spins = 0
+        while True:
+            batch = autoplay.spin_batch(self.machine, [2, 2, 2], 64, rng)
+            hits = np.flatnonzero(rng.random(len(batch)) < 1 / 500)
+            if len(hits):
+                spins += int(hits[0]) + 1
+                break
+            spins += len(batch)
+        self.assertEqual(sum(batch.spins for batch in batches), spins)
+
+        batches = list(autoplay.autoplay(
+            self.machine, [2, 2, 2], 10**6, limits, np.random.default_rng(3), 64, jackpot_odds=1.0))
+        self.assertEqual([(batch.spins, batch.stop_reason) for batch in batches], [(1, autoplay.JACKPOT)])
+
+    def test_balance_floor(self):
+        limits = autoplay.AutoplayLimits(spins=100_000, balance_floor=100)
+        batches = self.run_autoplay(limits, balance=400)
+        balance = 400 + sum(batch.net for batch in batches)
+        self.assertEqual(batches[-1].stop_reason, autoplay.BALANCE_LOW)
+        self.assertLess(balance - 6, 100)
+        # Never started below the floor
+        self.assertEqual(self.run_autoplay(limits, balance=105), [])
+
+    def test_never_bets_more_than_balance(self):
+        limits = autoplay.AutoplayLimits(spins=100_000)
+        for seed in range(20):
+            batches = self.run_autoplay(limits, balance=30, seed=seed, batch_size=7)
+            balance = 30
+            for batch in batches:
+                balance += batch.net
+                self.assertGreaterEqual(balance, 0)
+
+
+class TestJackpot(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "jackpot.db")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_contributions_flush_in_batches(self):
+        with jackpot.JackpotStore(self.path, seed_chips=100, flush_every=10, flush_ms=60_000) as store, \
+                jackpot.JackpotStore(self.path, seed_chips=100) as other:
+            for _ in range(9):
+                store.contribute(100)
+            # Pending in the first process only
+            self.assertEqual(store.pot, 109)
+            self.assertEqual(other.pot, 100)
+            store.contribute(100)
+            self.assertEqual(other.pot, 110)
+
+    def test_close_flushes(self):
+        store = jackpot.JackpotStore(self.path, seed_chips=100, flush_every=1000, flush_ms=60_000)
+        store.contribute(250)
+        store.close()
+        self.assertEqual(jackpot.ledger(self.path)["pot"], 102_500)
+
+    def test_claim_pays_once_and_reseeds(self):
+        with jackpot.JackpotStore(self.path, seed_chips=100, flush_every=1000) as store, \
+                jackpot.JackpotStore(self.path, seed_chips=100) as other:
+            store.contribute(1550)
+            self.assertEqual(store.claim("first"), 115)
+            # The fractional chip stays in the pot
+            self.assertEqual(other.claim("second"), 100)
+            totals = jackpot.ledger(self.path)
+            self.assertEqual(totals["claims"], 2)
+            self.assertEqual(totals["pot"], 100_500)
+            self.assertEqual(totals["seeded"] + totals["contributed"], totals["pot"] + totals["paid"])
+
+    def test_jackpot_hit(self):
+        rng = random.Random(4)
+        hits = sum(jackpot.jackpot_hit(rng=rng, odds=0.01) for _ in range(100_000))
+        self.assertAlmostEqual(hits / 100_000, 0.01, delta=0.002)
+        hits = sum(jackpot.jackpot_hit(100, rng, odds=0.01) for _ in range(10_000))
+        self.assertAlmostEqual(hits / 10_000, 1 - 0.99 ** 100, delta=0.02)
+
+    def test_concurrent_processes(self):
+        spins, claims = jackpot.stress(self.path, processes=4, spins=2000, odds=1 / 200, flush_every=7, seed=2)
+        totals = jackpot.ledger(self.path)
+        self.assertEqual(spins, 8000)
+        self.assertEqual(totals["claims"], claims)
+        self.assertEqual(totals["contributed"], 8000 * 10 * jackpot.MILLI // 100)
+        self.assertEqual(totals["seeded"] + totals["contributed"], totals["pot"] + totals["paid"])
+
+
+if __name__ == "__main__":
+    unittest.main()